@@ -2,15 +2,26 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 
-from modules.instruction_parser import InstructionParser
-import plotly.express as px
-import plotly.graph_objects as go
 from modules.data_profiling import DataProfiler
 from modules.ai_suggestions import AISuggestionEngine
 from modules.data_cleaning import DataCleaner
 from modules.report_generator import ReportGenerator
-from utils.helpers import format_number, get_data_quality_score
+from modules.data_preview import DataWindow
+from modules.data_ingest import CSVSniffer, ExcelIngestor, file_fingerprint
+from modules.cleaning_recipe import CleaningRecipe
+from modules.versioned_dataset import VersionedDataset
+from modules.rule_validation import RuleValidator
+from modules.datetime_parsing import DateTimeParser
+from modules.pattern_profiling import PatternProfiler
+from modules.warm_worker import WarmWorker, prewarm_imports
+from modules.cost_model import CostModel
+from modules.shared_cache import shared_cache
+from utils.helpers import format_number, get_data_quality_score, downsample_for_plot
+from utils.memory_accounting import memory_accountant
+from utils.serialization import to_json, to_msgpack
 import io
+import os
+import json
 import base64
 # Page configuration
 st.set_page_config(
@@ -59,6 +70,8 @@ def main():
         st.session_state.suggestions = None
     if 'cleaning_report' not in st.session_state:
         st.session_state.cleaning_report = None
+    if 'summary_report' not in st.session_state:
+        st.session_state.summary_report = None
 
     # Sidebar
     st.sidebar.title("📊 Navigation")
@@ -75,9 +88,45 @@ def main():
         try:
             # Load data
             if uploaded_file.name.endswith('.csv'):
-                st.session_state.data = pd.read_csv(uploaded_file)
+                upload_key = (uploaded_file.name, uploaded_file.size)
+                if st.session_state.get('upload_key') != upload_key:
+                    # Sniff encoding/dialect from samples, then parse once per
+                    # file content across all sessions
+                    fingerprint = file_fingerprint(uploaded_file.getvalue())
+                    csv_settings = CSVSniffer().sniff(uploaded_file)
+
+                    def parse_csv():
+                        uploaded_file.seek(0)
+                        return pd.read_csv(uploaded_file, **csv_settings)
+
+                    data = shared_cache.get_or_compute("frames", (fingerprint, "csv"), parse_csv)
+                    load_dataset(data, upload_key, fingerprint)
+                    st.session_state.csv_settings = csv_settings
+                csv_settings = st.session_state.csv_settings
+                st.sidebar.caption(
+                    f"Detected: {csv_settings.get('encoding')}, "
+                    f"delimiter {csv_settings.get('sep', ',')!r}, "
+                    f"decimal {csv_settings.get('decimal', '.')!r}"
+                )
             else:
-                st.session_state.data = pd.read_excel(uploaded_file)
+                # Parsed sheets are cached by file hash; reopening is a cache read.
+                # The workbook is hashed once per upload, not on every rerun.
+                ingestor = ExcelIngestor()
+                file_bytes = uploaded_file.getvalue()
+                workbook_key = (uploaded_file.name, uploaded_file.size)
+                if st.session_state.get('workbook_key') != workbook_key:
+                    st.session_state.workbook_fingerprint = file_fingerprint(file_bytes)
+                    st.session_state.workbook_key = workbook_key
+                fingerprint = st.session_state.workbook_fingerprint
+                sheets = ingestor.sheet_names(file_bytes, fingerprint)
+                sheet_name = st.sidebar.selectbox("Sheet", sheets) if len(sheets) > 1 else sheets[0]
+                upload_key = (uploaded_file.name, uploaded_file.size, sheet_name)
+                if st.session_state.get('upload_key') != upload_key:
+                    data = shared_cache.get_or_compute(
+                        "frames", (fingerprint, sheet_name),
+                        lambda: ingestor.load(file_bytes, sheet_name, fingerprint)
+                    )
+                    load_dataset(data, upload_key, (fingerprint, sheet_name))
             
             st.sidebar.success(f"✅ File uploaded successfully!")
             st.sidebar.info(f"📏 Shape: {st.session_state.data.shape}")
@@ -86,6 +135,11 @@ def main():
             st.sidebar.error(f"❌ Error loading file: {str(e)}")
             return
 
+    st.sidebar.markdown("---")
+    if st.sidebar.checkbox("🛠️ Cache admin", value=False):
+        display_cache_admin()
+        return
+
     # Main content
     if st.session_state.data is not None:
         # Tabs for different modules
@@ -124,6 +178,90 @@ def main():
         - Any encoding (UTF-8 recommended)
         """)
 
+    # Everything above is on screen; load chart/model dependencies in the background.
+    # The worker is started first so it never sees the prewarm thread mid-import.
+    get_warm_worker()
+    prewarm_imports()
+
+@st.cache_resource
+def get_warm_worker():
+    """
+    Process-wide warm worker keeping the Whisper model loaded.
+    Opt in with DATA_CLEANING_WARM_WORKER=1.
+    """
+    if os.getenv("DATA_CLEANING_WARM_WORKER") != "1":
+        return None
+    return WarmWorker().start()
+
+
+@st.cache_resource
+def get_cost_model():
+    """Cost model calibrated once per process on this machine"""
+    return CostModel().calibrate()
+
+
+def load_dataset(data, upload_key, fingerprint):
+    """
+    Start a fresh version history for a newly uploaded dataset. `data` may
+    be shared with other sessions through the shared cache and is never
+    modified; `fingerprint` keys the cached profile and suggestions.
+    """
+    st.session_state.upload_key = upload_key
+    st.session_state.dataset_fingerprint = fingerprint
+    st.session_state.data = data
+    st.session_state.dataset = VersionedDataset(data)
+    st.session_state.cleaned_data = None
+    st.session_state.profiling_results = None
+    st.session_state.suggestions = None
+    st.session_state.cleaning_report = None
+    st.session_state.summary_report = None
+
+
+def sync_cleaned_data():
+    """Point cleaned_data and the cleaning report at the current dataset version"""
+    dataset = st.session_state.dataset
+    if dataset.version == 0:
+        st.session_state.cleaned_data = None
+        st.session_state.cleaning_report = None
+    else:
+        st.session_state.cleaned_data = dataset.frame()
+        st.session_state.cleaning_report = dataset.metadata().get("report")
+    st.session_state.summary_report = None
+
+
+def display_cache_admin():
+    """Hit rates and memory use of the cache shared by all sessions"""
+    st.header("🛠️ Shared Cache")
+
+    stats = shared_cache.stats()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Memory Used", f"{stats['memory_bytes'] / 1024**2:.1f} MB")
+    with col2:
+        st.metric("Memory Budget", f"{stats['memory_budget'] / 1024**2:.1f} MB")
+    with col3:
+        st.metric("Spilled to Disk", f"{stats['disk_bytes'] / 1024**2:.1f} MB")
+    st.progress(min(stats['memory_bytes'] / stats['memory_budget'], 1.0) if stats['memory_budget'] else 0.0)
+
+    rows = []
+    for namespace, counters in stats['namespaces'].items():
+        rows.append({
+            'Namespace': namespace,
+            'Hit Rate': f"{counters['hit_rate']:.1%}",
+            'Memory Hits': counters['hits'],
+            'Disk Hits': counters['disk_hits'],
+            'Misses': counters['misses'],
+            'Evictions': counters['evictions'],
+            'In Memory': counters['memory_entries'],
+            'On Disk': counters['disk_entries']
+        })
+    st.dataframe(pd.DataFrame(rows), use_container_width=True)
+
+    if st.button("🗑️ Clear cache"):
+        shared_cache.invalidate()
+        st.success("✅ Shared cache cleared")
+
+
 def display_data_overview():
     """Display basic data overview"""
     st.header("📋 Dataset Overview")
@@ -138,24 +276,14 @@ def display_data_overview():
     with col2:
         st.metric("📊 Total Columns", data.shape[1])
     with col3:
-        st.metric("💾 Memory Usage", f"{data.memory_usage(deep=True).sum() / 1024**2:.1f} MB")
+        st.metric("💾 Memory Usage", f"{memory_accountant.total_bytes(data) / 1024**2:.1f} MB")
     with col4:
         quality_score = get_data_quality_score(data)
         st.metric("✨ Data Quality", f"{quality_score:.1f}%")
     
     # Data preview
     st.subheader("🔍 Data Preview")
-    # Add row selector
-    # Add row selector
-    num_rows = st.slider(
-    "Select number of rows to preview",
-    min_value=5,
-    max_value=len(data),
-    value=10,
-    key="cleaned_preview_slider"
-)
-
-    st.dataframe(data.head(num_rows), use_container_width=True)
+    display_data_window(data, key="overview_window")
 
 
     
@@ -170,17 +298,67 @@ def display_data_overview():
     })
     st.dataframe(col_info, use_container_width=True)
 
+def display_data_window(data, key, profile=None):
+    """Paged preview that only ships the visible rows to the browser"""
+    window = st.session_state.get(key)
+    if window is None or window.data is not data:
+        window = DataWindow(data)
+        st.session_state[key] = window
+
+    col1, col2, col3, col4 = st.columns([2, 1, 2, 2])
+    with col1:
+        sort_by = st.selectbox("Sort by", [None] + list(data.columns), key=f"{key}_sort",
+                               format_func=lambda c: "(original order)" if c is None else str(c))
+    with col2:
+        ascending = st.checkbox("Ascending", value=True, key=f"{key}_ascending")
+    with col3:
+        filter_column = st.selectbox("Filter column", list(data.columns), key=f"{key}_filter_col")
+    with col4:
+        filter_text = st.text_input("Contains", key=f"{key}_filter_text")
+
+    row_set = None
+    if profile is not None:
+        if st.checkbox("Show only flagged rows (duplicates/outliers)", key=f"{key}_flagged"):
+            row_set, stale = window.flagged_rows(profile)
+            if stale:
+                st.warning(
+                    "Some duplicate/outlier flags come from an earlier version of the data and "
+                    "could not be matched to the current rows. Re-run profiling to refresh them."
+                )
+
+    view = {
+        'sort_by': sort_by,
+        'ascending': ascending,
+        'filter_column': filter_column,
+        'filter_text': filter_text,
+        'row_set': row_set
+    }
+    positions = window.view_positions(**view)
+    page = st.number_input(
+        "Page", min_value=1, max_value=window.page_count(positions), value=1, key=f"{key}_page"
+    )
+    page_data, total_rows = window.get_page(int(page), **view)
+    st.caption(f"Showing {len(page_data)} of {format_number(total_rows)} rows")
+    st.dataframe(page_data, use_container_width=True)
+
 def display_data_profiling():
     """Display comprehensive data profiling"""
+    # plotly is imported on first use, keeping it off the cold-start path
+    import plotly.express as px
+    import plotly.graph_objects as go
+
     st.header("🔍 Data Profiling Analysis")
     
     data = st.session_state.data
-    profiler = DataProfiler()
+    rules = edit_validation_rules()
+    profiler = DataProfiler(validation_rules=rules)
     
     # Generate profiling results
     if st.session_state.profiling_results is None:
         with st.spinner("🔄 Analyzing your data..."):
-            st.session_state.profiling_results = profiler.generate_profile(data)
+            st.session_state.profiling_results = shared_cache.get_or_compute(
+                "profiles", analysis_key(), lambda: profiler.generate_profile(data)
+            )
     
     results = st.session_state.profiling_results
     
@@ -217,7 +395,8 @@ def display_data_profiling():
     
     # Outliers analysis
     st.subheader("📈 Outliers Analysis")
-    numeric_columns = data.select_dtypes(include=[np.number]).columns
+    # Includes text columns the profiler inferred as numeric
+    numeric_columns = list(results['distributions'])
     
     if len(numeric_columns) > 0:
         outlier_summary = []
@@ -231,16 +410,53 @@ def display_data_profiling():
         
         if outlier_summary:
             outlier_df = pd.DataFrame(outlier_summary)
-            st.dataframe(data, use_container_width=True)
+            st.dataframe(outlier_df, use_container_width=True)
 
             
             # Outlier visualization
             selected_col = st.selectbox("Select column for outlier visualization:", numeric_columns)
             if selected_col in results['outliers']:
+                # Charts are drawn from precomputed summaries, never from the raw column
+                stats = results['distributions'][selected_col]
                 fig = go.Figure()
-                fig.add_trace(go.Box(y=data[selected_col], name=selected_col))
+                fig.add_trace(go.Box(
+                    x=[selected_col],
+                    q1=[stats['q1']],
+                    median=[stats['median']],
+                    q3=[stats['q3']],
+                    lowerfence=[stats['lower_fence']],
+                    upperfence=[stats['upper_fence']],
+                    mean=[stats['mean']],
+                    name=selected_col
+                ))
+                fig.add_trace(go.Scatter(
+                    x=[selected_col] * len(stats['outlier_sample']),
+                    y=stats['outlier_sample'],
+                    mode='markers',
+                    name='Outliers (sample)'
+                ))
                 fig.update_layout(title=f"Box Plot for {selected_col} (Outliers Detection)")
                 st.plotly_chart(fig, use_container_width=True)
+                
+                edges = stats['histogram']['edges']
+                hist_fig = go.Figure(go.Bar(
+                    x=[(left + right) / 2 for left, right in zip(edges[:-1], edges[1:])],
+                    y=stats['histogram']['counts'],
+                    width=[right - left for left, right in zip(edges[:-1], edges[1:])]
+                ))
+                hist_fig.update_layout(title=f"Distribution of {selected_col}")
+                st.plotly_chart(hist_fig, use_container_width=True)
+                
+                if pd.api.types.is_numeric_dtype(data[selected_col]) and \
+                        st.checkbox("Show values by row", key="outlier_values_by_row"):
+                    sampled = downsample_for_plot(data[selected_col])
+                    scatter_fig = px.scatter(
+                        x=sampled.index,
+                        y=sampled.to_numpy(),
+                        title=f"{selected_col} by row (downsampled to {len(sampled)} points)",
+                        labels={'x': 'Row', 'y': selected_col}
+                    )
+                    st.plotly_chart(scatter_fig, use_container_width=True)
     
     # Categorical inconsistencies
     st.subheader("🔤 Categorical Inconsistencies")
@@ -252,6 +468,129 @@ def display_data_profiling():
                 if issues['case_issues']:
                     st.warning(f"Potential case inconsistencies detected: {issues['case_issues']}")
 
+    # Shapes of text values ("AA-9999 92%, 9999-AA 8%") and known formats
+    if results.get('patterns'):
+        st.subheader("🔣 Value Patterns")
+        st.dataframe(pd.DataFrame([
+            {
+                'Column': col,
+                'Patterns': PatternProfiler.summary(info),
+                'Distinct patterns': info['distinct_patterns'],
+                'Format': info['dominant_format'],
+                'Format match %': round(info['formats'][info['dominant_format']]['percentage'], 2)
+                    if info['dominant_format'] else None
+            }
+            for col, info in results['patterns'].items()
+        ]), use_container_width=True)
+        pattern_col = st.selectbox("Pattern details for", list(results['patterns']), key="pattern_column")
+        if pattern_col:
+            st.dataframe(pd.DataFrame([
+                {
+                    'Pattern': pattern['pattern'],
+                    'Rows': pattern['count'],
+                    'Percentage': round(pattern['percentage'], 2),
+                    'Examples': ', '.join(pattern['examples'])
+                }
+                for pattern in results['patterns'][pattern_col]['patterns']
+            ]), use_container_width=True)
+
+    # Date columns: range, gaps, future values and timezone mix
+    if results.get('datetimes'):
+        st.subheader("📅 Date Columns")
+        st.dataframe(pd.DataFrame([
+            {
+                'Column': col,
+                'Format': info['format'] or 'datetime',
+                'Unparseable': info['failed_count'],
+                'Min': info['min'],
+                'Max': info['max'],
+                'Future': info['future_count'],
+                'Median gap': str(info['median_gap']) if info['median_gap'] is not None else None,
+                'Largest gap': str(info['max_gap']) if info['max_gap'] is not None else None,
+                'Large gaps': info['large_gap_count'],
+                'Timezones': ', '.join(f"{tz} ({count})" for tz, count in info['timezones'].items())
+            }
+            for col, info in results['datetimes'].items()
+        ]).astype({'Min': str, 'Max': str}), use_container_width=True)
+        for col, info in results['datetimes'].items():
+            if info['mixed_timezones']:
+                st.warning(f"'{col}' mixes UTC offsets: {', '.join(info['timezones'])}")
+
+    # Domain rule violations
+    if results.get('validation'):
+        st.subheader("📏 Validation Rules")
+        validation = results['validation']
+        st.dataframe(pd.DataFrame([
+            {'Rule': name, 'Violations': result['violations'], 'Percentage': round(result['percentage'], 2)}
+            for name, result in validation['rules'].items()
+        ]), use_container_width=True)
+        st.write(f"Rows breaking at least one rule: {format_number(validation['invalid_row_count'])}")
+        if validation['skipped']:
+            st.warning(f"Skipped rules on missing columns: {', '.join(validation['skipped'])}")
+
+    # Export the profile for reloading or sharing with other workers
+    st.subheader("💾 Export Profile")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            label="📥 Download Profile (JSON)",
+            data=profile_export(results, "json"),
+            file_name="data_profile.json",
+            mime="application/json"
+        )
+    with col2:
+        try:
+            packed = profile_export(results, "msgpack")
+        except ImportError:
+            st.caption("Install msgpack for a compact binary export")
+        else:
+            st.download_button(
+                label="📥 Download Profile (msgpack)",
+                data=packed,
+                file_name="data_profile.msgpack",
+                mime="application/octet-stream"
+            )
+
+def edit_validation_rules():
+    """
+    JSON editor for RuleValidator rules. Changing the rules invalidates the
+    profile and suggestions of this session; returns the parsed rules.
+    """
+    with st.expander("📏 Validation Rules", expanded=False):
+        st.caption(
+            'JSON list, e.g. [{"type": "range", "column": "age", "min": 0, "max": 120}, '
+            '{"type": "compare", "left": "end_date", "op": ">=", "right": "start_date"}, '
+            '{"type": "in_set", "column": "country", "values": ["US", "FR"]}, '
+            '{"type": "regex", "column": "email", "pattern": "[^@]+@[^@]+"}]'
+        )
+        text = st.text_area("Rules", st.session_state.get('validation_rules_text', "[]"), height=120)
+        if text != st.session_state.get('validation_rules_text', "[]"):
+            try:
+                rules = json.loads(text or "[]")
+                RuleValidator(rules)
+            except (ValueError, KeyError, TypeError) as e:
+                st.error(f"❌ Invalid rules: {e}")
+            else:
+                st.session_state.validation_rules_text = text
+                st.session_state.validation_rules = rules
+                st.session_state.profiling_results = None
+                st.session_state.suggestions = None
+    return st.session_state.get('validation_rules') or None
+
+
+def analysis_key():
+    """Shared-cache key of the profile and suggestions: dataset plus active rules"""
+    return (st.session_state.dataset_fingerprint, st.session_state.get('validation_rules_text', "[]"))
+
+
+def profile_export(results, fmt):
+    """Serialized profile ('json' or 'msgpack'), computed once per analysis key instead of every rerun"""
+    serialize = to_json if fmt == "json" else to_msgpack
+    return shared_cache.get_or_compute(
+        "profiles", (*analysis_key(), "export", fmt), lambda: serialize(results, "profile")
+    )
+
+
 def display_ai_suggestions():
     """Display AI-generated suggestions"""
     st.header("🤖 AI Cleaning Suggestions")
@@ -261,11 +600,15 @@ def display_ai_suggestions():
         return
     
     # Generate suggestions
+    suggestion_engine = AISuggestionEngine(cost_model=get_cost_model())
     if st.session_state.suggestions is None:
-        suggestion_engine = AISuggestionEngine()
-        st.session_state.suggestions = suggestion_engine.generate_suggestions(
-            st.session_state.data, 
-            st.session_state.profiling_results
+        st.session_state.suggestions = shared_cache.get_or_compute(
+            "suggestions",
+            analysis_key(),
+            lambda: suggestion_engine.generate_suggestions(
+                st.session_state.data,
+                st.session_state.profiling_results
+            )
         )
     
     suggestions = st.session_state.suggestions
@@ -273,6 +616,29 @@ def display_ai_suggestions():
     if not suggestions:
         st.success("🎉 Your data looks clean! No major issues detected.")
     else:
+        # Cheap wins: auto-applicable fixes applied together in one cleaning pass
+        cheap_wins = suggestion_engine.cheap_wins(suggestions)
+        if cheap_wins:
+            st.markdown("### ⚡ Cheap Wins")
+            total_seconds = sum(s['estimated_seconds'] for s in cheap_wins)
+            total_saved = sum(s['estimated_bytes_saved'] for s in cheap_wins)
+            st.write(
+                f"{len(cheap_wins)} fixes, estimated {total_seconds:.2f}s, "
+                f"~{total_saved / 1024**2:.1f} MB saved: {', '.join(s['title'] for s in cheap_wins)}"
+            )
+            if st.button("⚡ Apply all cheap wins"):
+                config = suggestion_engine.build_cleaning_config(cheap_wins, st.session_state.profiling_results)
+                dataset = st.session_state.dataset
+                result = DataCleaner().clean_data(dataset.frame(), config)
+                dataset.apply(
+                    result["cleaned_data"],
+                    "Apply cheap wins",
+                    changed_columns=result["report"]["changed_columns"],
+                    metadata={"report": result["report"]}
+                )
+                sync_cleaned_data()
+                st.success(f"✅ Applied {len(cheap_wins)} fixes in one pass")
+
         st.markdown("### 💡 Recommended Actions")
         
         for suggestion in suggestions:
@@ -280,6 +646,11 @@ def display_ai_suggestions():
                 st.markdown(f"**Priority:** {suggestion['priority']}")
                 st.markdown(f"**Issue:** {suggestion['description']}")
                 st.markdown(f"**Recommendation:** {suggestion['recommendation']}")
+                st.caption(
+                    f"Rows affected: {format_number(suggestion['rows_affected'])} · "
+                    f"Memory saved: ~{suggestion['estimated_bytes_saved'] / 1024**2:.1f} MB · "
+                    f"Estimated time: {suggestion['estimated_seconds']:.2f}s"
+                )
                 
                 if suggestion['type'] == 'missing_values':
                     st.info(f"📊 Affected columns: {', '.join(suggestion['affected_columns'])}")
@@ -287,6 +658,10 @@ def display_ai_suggestions():
                     st.info(f"🔄 {suggestion['count']} duplicate rows found")
                 elif suggestion['type'] == 'outliers':
                     st.info(f"📈 Outliers detected in: {', '.join(suggestion['affected_columns'])}")
+                elif suggestion['type'] == 'validation':
+                    st.dataframe(pd.DataFrame(
+                        list(suggestion['rule_violations'].items()), columns=['Rule', 'Violations']
+                    ), use_container_width=True)
 
     # ---------------------------------------------------
     # 🎤 Voice-Based Data Instructions (INSIDE FUNCTION)
@@ -306,7 +681,7 @@ def display_ai_suggestions():
         from modules.voice_service import VoiceService
         from modules.instruction_parser import InstructionParser
 
-        voice_service = VoiceService()
+        voice_service = VoiceService(worker=get_warm_worker())
 
         with st.spinner("🔄 Transcribing audio..."):
             instruction_text = voice_service.transcribe(audio_file)
@@ -320,38 +695,155 @@ def display_data_cleaning():
         st.warning("⚠️ Please upload data first.")
         return
 
-    st.write("Data Preview:")
-    st.dataframe(st.session_state.data)
+    st.write("Data Preview (current version):")
+    display_data_window(
+        st.session_state.dataset.frame(),
+        key="cleaning_window",
+        profile=st.session_state.profiling_results
+    )
 
-    if st.button("Run Cleaning"):
-        # Example dummy cleaning logic
-        cleaned_data = st.session_state.data.drop_duplicates()
-        cleaning_report = {
-            "rows_removed": len(st.session_state.data) - len(cleaned_data)
+    dataset = st.session_state.dataset
+
+    config = {"remove_duplicates": True}
+    description = "Remove duplicates"
+    profile = st.session_state.profiling_results
+    treatment = st.selectbox(
+        "Outlier treatment",
+        [None, "clip", "winsorize", "log", "yeo_johnson", "drop_rows"],
+        format_func=lambda m: "None" if m is None else m.replace("_", " ").capitalize()
+    )
+    if treatment:
+        # Bounds from the profile are reused instead of recomputing quantiles
+        config["handle_outliers"] = {
+            "method": treatment,
+            "outliers": profile['outliers'] if profile else None
         }
+        description += f", {treatment.replace('_', ' ')} outliers"
+    date_columns = list(profile.get('datetimes') or {}) if profile else []
+    if date_columns:
+        iso_columns = st.multiselect("Standardize dates to ISO 8601", date_columns)
+        if iso_columns:
+            config["standardize_dates"] = iso_columns
+            description += ", standardize dates"
+        part_columns = st.multiselect("Extract date parts from", date_columns)
+        if part_columns:
+            parts = st.multiselect("Date parts", list(DateTimeParser.PARTS), default=["year", "month", "day"])
+            if parts:
+                config["extract_date_parts"] = {col: parts for col in part_columns}
+                description += ", extract date parts"
+    rules = st.session_state.get('validation_rules')
+    if rules and st.checkbox("Enforce validation rules"):
+        action = st.radio("Rows breaking a rule", ["drop_rows", "set_missing"], horizontal=True,
+                          format_func=lambda a: "Drop rows" if a == "drop_rows" else "Set values to missing")
+        config["validation_rules"] = {"rules": rules, "action": action}
+        description += ", enforce validation rules"
 
-        st.session_state.cleaned_data = cleaned_data
-        st.session_state.cleaning_report = cleaning_report
+    if st.button("Run Cleaning"):
+        cleaner = DataCleaner()
+        # Each run cleans the current version and is recorded as a new one
+        result = cleaner.clean_data(
+            dataset.frame(),
+            config
+        )
+        dataset.apply(
+            result["cleaned_data"],
+            description,
+            changed_columns=result["report"]["changed_columns"],
+            metadata={"report": result["report"]}
+        )
+        sync_cleaned_data()
 
         st.success("✅ Cleaning completed!")
 
+    # Version history: undo/redo replay the column log instead of re-uploading
+    st.subheader("🕘 Version History")
+    col1, col2, col3 = st.columns([1, 1, 3])
+    with col1:
+        if st.button("↩️ Undo", disabled=not dataset.can_undo()):
+            dataset.undo()
+            sync_cleaned_data()
+            st.rerun()
+    with col2:
+        if st.button("↪️ Redo", disabled=not dataset.can_redo()):
+            dataset.redo()
+            sync_cleaned_data()
+            st.rerun()
+    with col3:
+        st.caption(
+            f"Version {dataset.version} · log holds {dataset.nbytes() / 1024**2:.1f} MB of changed columns"
+        )
+
+    st.dataframe(pd.DataFrame(dataset.history()), use_container_width=True)
+
+    if dataset.version > 0:
+        compare_to = st.selectbox(
+            "Compare current version with",
+            list(range(dataset.version)),
+            format_func=lambda version: f"Version {version}"
+        )
+        comparison = dataset.compare(compare_to)
+        st.write(
+            f"Rows only in version {compare_to}: {comparison['rows_only_in_version']} · "
+            f"columns added: {comparison['columns_added'] or 'none'} · "
+            f"columns removed: {comparison['columns_removed'] or 'none'}"
+        )
+        if comparison["cells_changed"]:
+            st.dataframe(
+                pd.DataFrame(
+                    list(comparison["cells_changed"].items()),
+                    columns=["Column", "Cells Changed"]
+                ),
+                use_container_width=True
+            )
+
+    with st.expander("📜 Cleaning recipe for recurring feeds"):
+        st.caption(
+            "Fit a recipe once on this dataset and replay it on new batches with "
+            "`python -m modules.cleaning_recipe recipe.json feed.csv --output-dir cleaned/`."
+        )
+        if st.button("Fit Recipe"):
+            recipe = CleaningRecipe({
+                "convert_types": True,
+                "handle_missing": True,
+                "clip_outliers": True,
+                "remove_duplicates": True
+            }).fit(st.session_state.data)
+            st.download_button(
+                label="Download recipe.json",
+                data=json.dumps(recipe.to_dict(), indent=2),
+                file_name="recipe.json",
+                mime="application/json"
+            )
+
 
 def display_summary_report():
 
 
     """Display comprehensive summary report"""
+    import plotly.graph_objects as go
+
     st.header("📊 Data Cleaning Summary Report")
     
     if st.session_state.cleaning_report is None:
         st.info("🔄 No cleaning operations performed yet. Please clean your data first.")
         return
     
-    report_generator = ReportGenerator()
-    report = report_generator.generate_report(
-        st.session_state.data,
-        st.session_state.cleaned_data,
-        st.session_state.cleaning_report
-    )
+    # The report is built once per cleaning run and reused on every rerun
+    run_id = st.session_state.cleaning_report.get("run_id")
+    cached = st.session_state.summary_report
+    if cached is None or cached["run_id"] != run_id:
+        report_generator = ReportGenerator()
+        cached = {
+            "run_id": run_id,
+            "report": report_generator.generate_report(
+                st.session_state.data,
+                st.session_state.cleaned_data,
+                st.session_state.cleaning_report,
+                original_profile=st.session_state.profiling_results
+            )
+        }
+        st.session_state.summary_report = cached
+    report = cached["report"]
     
     # Display metrics
     st.subheader("📈 Key Metrics")
@@ -421,9 +913,9 @@ def display_summary_report():
     
     st.download_button(
     label="📥 Download Summary Report",
-    data=str(report),
-    file_name="data_cleaning_report.txt",
-    mime="text/plain"
+    data=to_json(report, "report", indent=2),
+    file_name="data_cleaning_report.json",
+    mime="application/json"
 )
 
 if __name__ == "__main__":
@@ -31,16 +31,45 @@ class AISuggestionEngine:
 import pandas as pd
 import numpy as np
 
+from modules.cost_model import cost_model as default_cost_model
+from utils.memory_accounting import memory_accountant
+
 class AISuggestionEngine:
     """AI-powered suggestion engine for data cleaning"""
     
-    def __init__(self):
+    PRIORITY_WEIGHTS = {'High': 3, 'Medium': 2, 'Low': 1}
+    
+    # action -> cost model operation
+    ACTION_OPERATIONS = {
+        'remove_columns': 'remove_columns',
+        'impute_numeric': 'impute',
+        'impute_categorical': 'impute',
+        'careful_imputation': 'impute',
+        'remove_duplicates': 'remove_duplicates',
+        'keep_best_per_cluster': 'keep_best_per_cluster',
+        'handle_outliers': 'handle_outliers',
+        'review_outliers': 'handle_outliers',
+        'optimize_types': 'optimize_types',
+        'convert_types': 'convert_types',
+        'standardize_case': 'standardize_text',
+        'strip_whitespace': 'standardize_text',
+        'merge_values': 'merge_values',
+        'enforce_validation_rules': 'enforce_validation_rules'
+    }
+    
+    # Lossless actions DataCleaner can apply without a user decision; fixes
+    # that rewrite cell values are left to the per-suggestion buttons
+    AUTO_ACTIONS = ('remove_duplicates', 'optimize_types')
+    
+    def __init__(self, cost_model=None):
         self.suggestion_rules = {
             'missing_threshold_low': 0.10,
             'missing_threshold_high': 0.40,
             'outlier_threshold': 0.05,
-            'duplicate_threshold': 0.01
+            'duplicate_threshold': 0.01,
+            'cheap_seconds': 1.0  # Estimated runtime below which a fix counts as a cheap win
         }
+        self.cost_model = cost_model or default_cost_model
     
     def generate_suggestions(self, data, profiling_results):
         """Generate AI-powered cleaning suggestions"""
@@ -61,12 +90,134 @@ class AISuggestionEngine:
         # Categorical cleaning suggestions
         suggestions.extend(self._suggest_categorical_cleaning(data, profiling_results))
         
-        # Sort suggestions by priority
-        priority_order = {'High': 3, 'Medium': 2, 'Low': 1}
-        suggestions.sort(key=lambda x: priority_order.get(x['priority'], 0), reverse=True)
+        # Near-duplicate label merging suggestions
+        suggestions.extend(self._suggest_value_merging(data, profiling_results))
+        
+        # Domain rule violation suggestions
+        suggestions.extend(self._suggest_rule_violations(data, profiling_results))
+        
+        # Rank by estimated benefit per second of work
+        for suggestion in suggestions:
+            self._estimate_impact(suggestion, data, profiling_results)
+        suggestions.sort(key=lambda x: x['score'], reverse=True)
         
         return suggestions
     
+    def _estimate_impact(self, suggestion, data, profiling_results):
+        """
+        Add rows_affected, estimated_bytes_saved and estimated_seconds from
+        profile statistics and the cost model, then score the suggestion as
+        benefit (priority weight x share of rows fixed or memory saved)
+        per estimated second.
+        """
+        row_count = len(data)
+        column_bytes = memory_accountant.summary(data)['by_column']
+        total_bytes = sum(column_bytes.values()) or 1
+        columns = [col for col in suggestion.get('affected_columns', []) if col in data.columns]
+        action = suggestion.get('action')
+        rows_affected = 0
+        bytes_saved = 0
+        
+        if action == 'remove_columns':
+            rows_affected = row_count
+            bytes_saved = sum(column_bytes[col] for col in columns)
+        elif action in ('impute_numeric', 'impute_categorical', 'careful_imputation'):
+            by_column = profiling_results['missing_values']['by_column']
+            rows_affected = min(row_count, sum(int(by_column[col]['count']) for col in columns))
+        elif action in ('remove_duplicates', 'keep_best_per_cluster', 'enforce_validation_rules'):
+            rows_affected = int(len(suggestion['rows']) if 'rows' in suggestion else suggestion['count'])
+            bytes_saved = int(total_bytes * rows_affected / row_count) if row_count else 0
+        elif action in ('handle_outliers', 'review_outliers'):
+            outliers = profiling_results['outliers']
+            rows_affected = min(row_count, sum(outliers[col]['count'] for col in columns if col in outliers))
+        elif action == 'optimize_types':
+            type_info = profiling_results['data_types']
+            bytes_saved = sum(
+                max(column_bytes[col] - self._optimized_bytes(type_info[col], row_count, column_bytes[col]), 0)
+                for col in columns
+            )
+        elif action == 'convert_types':
+            inference = profiling_results['type_inference']
+            for col in columns:
+                width = 1 if inference[col]['inferred_type'] == 'boolean' else 8
+                rows_affected += int(data[col].notna().sum())
+                bytes_saved += max(column_bytes[col] - width * row_count, 0)
+            rows_affected = min(rows_affected, row_count)
+        elif action == 'merge_values':
+            rows_affected = suggestion.get('rows_affected', 0)
+        elif action in ('standardize_case', 'strip_whitespace'):
+            rows_affected = min(row_count, sum(int(data[col].notna().sum()) for col in columns))
+        
+        operation = self.ACTION_OPERATIONS.get(action)
+        read_columns = data.shape[1] if operation in self.cost_model.ROW_OPERATIONS else len(columns)
+        seconds = self.cost_model.estimate(operation, row_count, read_columns)
+        
+        share = (rows_affected / row_count if row_count else 0.0) + bytes_saved / total_bytes
+        benefit = self.PRIORITY_WEIGHTS.get(suggestion['priority'], 1) * max(share, 0.001)
+        suggestion.update({
+            'rows_affected': int(rows_affected),
+            'estimated_bytes_saved': int(bytes_saved),
+            'estimated_seconds': float(seconds),
+            'benefit': float(benefit),
+            'score': float(benefit / seconds)
+        })
+        return suggestion
+    
+    @staticmethod
+    def _optimized_bytes(type_info, row_count, current_bytes):
+        """Bytes a column takes after its first suggested dtype"""
+        target = type_info['suggestions'][0]
+        if target == 'category':
+            unique_values = type_info['unique_values']
+            code_width = 1 if unique_values < 128 else 2 if unique_values < 32768 else 4
+            # Codes per row plus one copy of every distinct value
+            return code_width * row_count + current_bytes * unique_values / max(row_count, 1)
+        return np.dtype(target).itemsize * row_count
+    
+    def cheap_wins(self, suggestions, max_seconds=None):
+        """Lossless suggestions estimated to run within max_seconds each"""
+        max_seconds = self.suggestion_rules['cheap_seconds'] if max_seconds is None else max_seconds
+        return [
+            suggestion for suggestion in suggestions
+            if suggestion.get('action') in self.AUTO_ACTIONS
+            and suggestion['estimated_seconds'] <= max_seconds
+        ]
+    
+    def build_cleaning_config(self, suggestions, profiling_results):
+        """
+        One DataCleaner config applying every given suggestion, so a batch
+        of fixes runs as a single cleaning pass over one copy of the data.
+        """
+        config = {}
+        impute_columns = []
+        for suggestion in suggestions:
+            action = suggestion.get('action')
+            columns = suggestion.get('affected_columns', [])
+            if action in ('impute_numeric', 'impute_categorical'):
+                impute_columns.extend(columns)
+            elif action == 'remove_duplicates':
+                config['remove_duplicates'] = True
+            elif action == 'handle_outliers':
+                config['handle_outliers'] = {
+                    'method': suggestion.get('treatment', 'clip'),
+                    'outliers': profiling_results['outliers'],
+                    'columns': columns
+                }
+            elif action == 'optimize_types':
+                type_info = profiling_results['data_types']
+                config['optimize_types'] = {col: type_info[col]['suggestions'][0] for col in columns}
+            elif action == 'convert_types':
+                config['convert_types'] = columns
+            elif action in ('standardize_case', 'strip_whitespace'):
+                config['standardize_text'] = True
+            elif action == 'merge_values':
+                config['value_mappings'] = suggestion['mappings']
+        
+        if impute_columns:
+            config['handle_missing'] = True
+            config['imputation'] = {'columns': impute_columns}
+        return config
+    
     def _suggest_missing_values_handling(self, data, profiling_results):
         """Suggest handling for missing values"""
         suggestions = []
@@ -164,6 +315,20 @@ class AISuggestionEngine:
                 'action': 'remove_duplicates'
             })
         
+        near_duplicates = duplicate_info.get('near_duplicates')
+        if near_duplicates and near_duplicates['count'] > 0:
+            suggestions.append({
+                'type': 'duplicates',
+                'priority': 'Medium',
+                'title': f'Merge near-duplicate records',
+                'description': f'Found {near_duplicates["cluster_count"]} clusters of near-duplicate rows '
+                               f'on {near_duplicates["key_columns"]}',
+                'recommendation': 'Keep the most complete record per cluster',
+                'count': near_duplicates['count'],
+                'affected_columns': near_duplicates['key_columns'],
+                'action': 'keep_best_per_cluster'
+            })
+        
         return suggestions
     
     def _suggest_outlier_handling(self, data, profiling_results):
@@ -193,7 +358,8 @@ class AISuggestionEngine:
                 'description': f'Columns {high_outlier_cols} have >5% outliers',
                 'recommendation': 'Consider capping, transformation, or removal based on domain knowledge',
                 'affected_columns': high_outlier_cols,
-                'action': 'handle_outliers'
+                'action': 'handle_outliers',
+                'treatment': 'clip'
             })
         
         if moderate_outlier_cols:
@@ -230,6 +396,22 @@ class AISuggestionEngine:
                 'action': 'optimize_types'
             })
         
+        # Text columns that actually hold numbers, dates or booleans
+        mistyped_cols = [
+            col for col, info in profiling_results.get('type_inference', {}).items()
+            if info['inferred_type'] in ('integer', 'float', 'datetime', 'boolean')
+        ]
+        if mistyped_cols:
+            suggestions.append({
+                'type': 'data_types',
+                'priority': 'Medium',
+                'title': f'Convert text columns to their detected types',
+                'description': f'Columns {mistyped_cols} are stored as text but hold numbers, dates or booleans',
+                'recommendation': 'Convert them so numeric and date checks apply and memory usage drops',
+                'affected_columns': mistyped_cols,
+                'action': 'convert_types'
+            })
+        
         return suggestions
     
     def _suggest_categorical_cleaning(self, data, profiling_results):
@@ -272,3 +454,65 @@ class AISuggestionEngine:
             })
         
         return suggestions
+    
+    def _suggest_value_merging(self, data, profiling_results):
+        """Suggest merging near-duplicate categorical labels"""
+        suggestions = []
+        categorical_issues = profiling_results['categorical_issues']
+        
+        mappings = {}
+        rows_affected = 0
+        for col, issues in categorical_issues.items():
+            clusters = issues.get('value_clusters', [])
+            if clusters:
+                mappings[col] = {
+                    value: cluster['canonical']
+                    for cluster in clusters
+                    for value in cluster['values']
+                    if value != cluster['canonical']
+                }
+                rows_affected += sum(cluster['rows_affected'] for cluster in clusters)
+        
+        if mappings:
+            suggestions.append({
+                'type': 'categorical_cleaning',
+                'priority': 'Medium',
+                'title': f'Merge near-duplicate labels',
+                'description': f'Columns {list(mappings)} contain variants of the same label '
+                               f'({rows_affected} rows affected)',
+                'recommendation': 'Map each variant to its most frequent spelling',
+                'affected_columns': list(mappings),
+                'mappings': mappings,
+                'rows_affected': rows_affected,
+                'action': 'merge_values'
+            })
+        
+        return suggestions
+    
+    def _suggest_rule_violations(self, data, profiling_results):
+        """Suggest fixing rows that break declared validation rules"""
+        suggestions = []
+        validation = profiling_results.get('validation')
+        
+        if not validation or validation['invalid_row_count'] == 0:
+            return suggestions
+        
+        violated = {name: result for name, result in validation['rules'].items() if result['violations']}
+        percentage = validation['invalid_row_count'] / len(data) * 100 if len(data) else 0.0
+        priority = 'High' if percentage > 5 else 'Medium' if percentage > 1 else 'Low'
+        affected_columns = list(dict.fromkeys(col for result in violated.values() for col in result['columns']))
+        
+        suggestions.append({
+            'type': 'validation',
+            'priority': priority,
+            'title': f'Fix validation rule violations',
+            'description': f'{validation["invalid_row_count"]} rows ({percentage:.2f}%) break '
+                           f'{len(violated)} validation rules',
+            'recommendation': 'Drop the invalid rows or set the offending values to missing',
+            'affected_columns': affected_columns,
+            'rule_violations': {name: result['violations'] for name, result in violated.items()},
+            'rows': validation['invalid_rows'],
+            'action': 'enforce_validation_rules'
+        })
+        
+        return suggestions
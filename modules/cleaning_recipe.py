@@ -0,0 +1,257 @@
+import argparse
+import json
+import os
+
+import pandas as pd
+import numpy as np
+
+from modules.data_cleaning import DataCleaner
+from modules.data_ingest import CSVSniffer
+from modules.outlier_detection import OutlierDetector
+from modules.type_inference import TypeInferencer
+from modules.value_clustering import ValueClusterer
+from utils.streaming_stats import DedupeIndex, row_hashes
+
+
+class CleaningRecipe:
+    """
+    Fit/transform cleaning for recurring feeds.
+
+    fit() learns everything that depends on the data (dtype plan, value
+    mappings, fill values, outlier bounds) from a reference dataset once.
+    transform() replays it on new batches without re-profiling, and
+    transform_file() streams a CSV through it chunk by chunk.
+
+    Supported config keys (same spirit as DataCleaner.clean_data):
+        convert_types, standardize_text, text_case, value_mappings, merge_values,
+        handle_missing, clip_outliers, outlier_method, remove_duplicates
+    """
+
+    VERSION = 1
+
+    def __init__(self, config=None):
+        self.config = dict(config or {})
+        self.dtype_plan = {}  # {column: {'inferred_type', 'format'}}
+        self.value_mappings = {}  # {column: {old: new}}
+        self.fill_values = {}  # {column: value}
+        self.outlier_bounds = {}  # {column: [lower, upper]}
+        self.columns = []
+        self.fitted = False
+
+    # ------------------------------------------------------------------
+    # Fitting
+    # ------------------------------------------------------------------
+    def fit(self, data):
+        """Learn the recipe parameters from a reference dataset"""
+        self.columns = list(data.columns)
+        working = self._fit_text_rules(self._fit_dtype_plan(data.copy()))
+
+        if self.config.get("handle_missing", False):
+            medians, modes = {}, {}
+            for col in working.columns:
+                series = working[col]
+                if self._is_numeric(series):
+                    medians[col] = series.median()
+                else:
+                    mode = series.mode()
+                    modes[col] = mode.iloc[0] if len(mode) else None
+            self._set_fill_values(medians, modes)
+            working = self._apply_fill_values(working)
+
+        if self.config.get("clip_outliers", False):
+            self._fit_outlier_bounds(working.select_dtypes(include=[np.number]))
+
+        self.fitted = True
+        return self
+
+    def _fit_dtype_plan(self, data):
+        """Infer the dtype plan (when convert_types is set) and apply it"""
+        if self.config.get("convert_types", False):
+            inferencer = TypeInferencer()
+            for col, inference in inferencer.infer(data).items():
+                if inference["inferred_type"] in ("integer", "float", "boolean", "datetime"):
+                    self.dtype_plan[col] = {
+                        "inferred_type": inference["inferred_type"],
+                        "format": inference["format"]
+                    }
+        return self._apply_dtype_plan(data)
+
+    def _fit_text_rules(self, data):
+        """Standardize text and learn value mappings (when merge_values is set)"""
+        if self.config.get("standardize_text", False):
+            data, _ = DataCleaner()._standardize_text(data, case_type=self.config.get("text_case", "lower"))
+
+        self.value_mappings = dict(self.config.get("value_mappings", {}))
+        if self.config.get("merge_values", False):
+            clusterer = ValueClusterer()
+            for col in data.select_dtypes(include=["object", "string", "category"]).columns:
+                mapping = clusterer.build_mapping(clusterer.cluster_column(data[col]))
+                if mapping:
+                    self.value_mappings.setdefault(col, {}).update(mapping)
+        if self.value_mappings:
+            data, _ = DataCleaner()._apply_value_mappings(data, self.value_mappings)
+        return data
+
+    def _set_fill_values(self, medians, modes):
+        """Fill values from per-column medians (numeric) and modes (everything else)"""
+        for col, value in {**medians, **modes}.items():
+            if value is not None and not pd.isna(value):
+                self.fill_values[col] = value
+
+    def _fit_outlier_bounds(self, numeric):
+        """
+        Clip bounds for every numeric column, not only those with outliers in
+        the reference data, so later batches are clipped consistently.
+        """
+        detector = OutlierDetector(default_method=self.config.get("outlier_method", "iqr"))
+        numeric = numeric.loc[:, numeric.notna().any()]
+        if numeric.shape[1]:
+            lower, upper = detector.bounds(numeric)
+            self.outlier_bounds = {
+                col: [float(lower[col]), float(upper[col])] for col in numeric.columns
+            }
+
+    @staticmethod
+    def _is_numeric(series):
+        return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+    # ------------------------------------------------------------------
+    # Transforming
+    # ------------------------------------------------------------------
+    def transform(self, data, dedupe_index=None):
+        """
+        Apply the fitted recipe to a batch.
+        dedupe_index: optional DedupeIndex shared across chunks so duplicates
+        spanning chunk boundaries are also removed.
+        """
+        if not self.fitted:
+            raise ValueError("Recipe must be fitted before transform")
+
+        cleaned = data.copy()
+        cleaned = self._apply_dtype_plan(cleaned)
+        cleaned = self._apply_text_rules(cleaned)
+        cleaned = self._apply_fill_values(cleaned)
+
+        bounds = {col: b for col, b in self.outlier_bounds.items() if col in cleaned.columns}
+        if bounds:
+            cols = list(bounds)
+            lower = pd.Series({col: b[0] for col, b in bounds.items()})
+            upper = pd.Series({col: b[1] for col, b in bounds.items()})
+            cleaned[cols] = cleaned[cols].clip(lower=lower, upper=upper, axis=1)
+
+        if self.config.get("remove_duplicates", False):
+            if dedupe_index is None:
+                cleaned = cleaned[~cleaned.duplicated()]
+            else:
+                cleaned = cleaned[dedupe_index.add_new(row_hashes(cleaned))]
+
+        return cleaned
+
+    def transform_file(self, input_path, output_path, chunksize=100000):
+        """Stream a CSV through the recipe, appending each cleaned chunk to output_path"""
+        with open(input_path, "rb") as f:
+            csv_settings = CSVSniffer().sniff(f)
+
+        rows_in = rows_out = 0
+        with DedupeIndex() as dedupe_index:
+            for position, chunk in enumerate(pd.read_csv(input_path, chunksize=chunksize, **csv_settings)):
+                cleaned = self.transform(chunk, dedupe_index=dedupe_index)
+                cleaned.to_csv(output_path, mode="w" if position == 0 else "a",
+                               header=(position == 0), index=False)
+                rows_in += len(chunk)
+                rows_out += len(cleaned)
+
+        return {"rows_in": rows_in, "rows_out": rows_out}
+
+    def _apply_dtype_plan(self, data):
+        inferencer = TypeInferencer()
+        for col, plan in self.dtype_plan.items():
+            if col in data.columns:
+                data[col] = inferencer.convert(data[col], plan)
+        return data
+
+    def _apply_text_rules(self, data):
+        cleaner = DataCleaner()
+        if self.config.get("standardize_text", False):
+            data, _ = cleaner._standardize_text(data, case_type=self.config.get("text_case", "lower"))
+        if self.value_mappings:
+            data, _ = cleaner._apply_value_mappings(data, self.value_mappings)
+        return data
+
+    def _apply_fill_values(self, data):
+        fill_values = {col: value for col, value in self.fill_values.items() if col in data.columns}
+        if fill_values:
+            data = data.fillna(fill_values)
+        return data
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def to_dict(self):
+        return {
+            "version": self.VERSION,
+            "config": self.config,
+            "columns": self.columns,
+            "dtype_plan": self.dtype_plan,
+            "value_mappings": self.value_mappings,
+            "fill_values": {col: self._to_json_value(value) for col, value in self.fill_values.items()},
+            "outlier_bounds": self.outlier_bounds
+        }
+
+    @classmethod
+    def from_dict(cls, payload):
+        if payload.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported recipe version: {payload.get('version')}")
+        recipe = cls(payload["config"])
+        recipe.columns = payload["columns"]
+        recipe.dtype_plan = payload["dtype_plan"]
+        recipe.value_mappings = payload["value_mappings"]
+        recipe.fill_values = {
+            col: cls._from_json_value(value) for col, value in payload["fill_values"].items()
+        }
+        recipe.outlier_bounds = payload["outlier_bounds"]
+        recipe.fitted = True
+        return recipe
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    @staticmethod
+    def _to_json_value(value):
+        if isinstance(value, pd.Timestamp):
+            return {"__timestamp__": value.isoformat()}
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+
+    @staticmethod
+    def _from_json_value(value):
+        if isinstance(value, dict) and "__timestamp__" in value:
+            return pd.Timestamp(value["__timestamp__"])
+        return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply a saved cleaning recipe to CSV files")
+    parser.add_argument("recipe", help="Path to a recipe JSON file")
+    parser.add_argument("inputs", nargs="+", help="CSV files to clean")
+    parser.add_argument("--output-dir", required=True, help="Directory for cleaned files")
+    parser.add_argument("--chunksize", type=int, default=100000)
+    args = parser.parse_args()
+
+    recipe = CleaningRecipe.load(args.recipe)
+    os.makedirs(args.output_dir, exist_ok=True)
+    for input_path in args.inputs:
+        output_path = os.path.join(args.output_dir, os.path.basename(input_path))
+        stats = recipe.transform_file(input_path, output_path, chunksize=args.chunksize)
+        print(f"{input_path}: {stats['rows_in']} rows in, {stats['rows_out']} rows out")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+
+class CostModel:
+    """
+    Execution-time model of the cleaning operations.
+
+    Each operation costs `overhead + seconds_per_cell * cells`, where cells
+    is rows x the columns the operation reads (all columns for row-level
+    operations such as duplicate removal). The default coefficients are
+    conservative reference timings; calibrate() replaces them with timings
+    of the real DataCleaner steps on a synthetic frame on this machine.
+    """
+
+    # operation -> (overhead seconds, seconds per cell)
+    DEFAULT_COEFFICIENTS = {
+        'remove_duplicates': (0.005, 2e-8),
+        'keep_best_per_cluster': (0.05, 2e-6),
+        'convert_types': (0.005, 2e-7),
+        'optimize_types': (0.001, 5e-9),
+        'impute': (0.005, 3e-8),
+        'remove_columns': (0.001, 0.0),
+        'standardize_text': (0.005, 1e-6),
+        'merge_values': (0.005, 5e-8),
+        'handle_outliers': (0.005, 2e-8),
+        'enforce_validation_rules': (0.005, 5e-8),
+    }
+
+    # Operations that read every column of every row
+    ROW_OPERATIONS = ('remove_duplicates',)
+
+    def __init__(self, coefficients=None):
+        self.coefficients = dict(self.DEFAULT_COEFFICIENTS)
+        self.coefficients.update(coefficients or {})
+        self.calibrated = False
+
+    def estimate(self, operation, rows, columns=1):
+        """Estimated seconds for running `operation` over rows x columns cells"""
+        overhead, per_cell = self.coefficients.get(operation, (0.01, 1e-7))
+        return overhead + per_cell * rows * max(columns, 1)
+
+    def calibrate(self, rows=50000, random_state=42):
+        """
+        Time every calibratable DataCleaner step on a synthetic frame of
+        `rows` rows and refit its per-cell coefficient. Returns self.
+        """
+        from modules.data_cleaning import DataCleaner
+
+        data = self._synthetic_frame(rows, random_state)
+        for operation, (step, columns) in self._calibration_steps(DataCleaner()).items():
+            cells = rows * (data.shape[1] if operation in self.ROW_OPERATIONS else len(columns))
+            # The whole timing is charged per cell, which keeps small
+            # operations from fitting a zero coefficient
+            overhead = self.coefficients[operation][0]
+            self.coefficients[operation] = (overhead, self._time(step, data) / cells)
+        self.calibrated = True
+        return self
+
+    @staticmethod
+    def _time(step, data, repeat=2):
+        """Best wall time of step(copy of data); the copy is not timed"""
+        best = None
+        for _ in range(repeat):
+            working = data.copy()
+            start = time.perf_counter()
+            step(working)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    @staticmethod
+    def _synthetic_frame(rows, random_state):
+        rng = np.random.default_rng(random_state)
+        numbers = rng.normal(100, 15, rows)
+        numbers[rng.random(rows) < 0.05] = np.nan
+        numbers[rng.random(rows) < 0.01] *= 20
+        labels = rng.choice(['alpha', 'Alpha', ' beta', 'gamma '], rows)
+        return pd.DataFrame({
+            'number': numbers,
+            'count': rng.integers(0, 100, rows),
+            'label': pd.Series(labels, dtype=object).where(rng.random(rows) > 0.05),
+            'number_text': pd.Series(rng.integers(0, 1000, rows).astype(str), dtype=object)
+        })
+
+    @staticmethod
+    def _calibration_steps(cleaner):
+        """operation -> (step taking a frame, columns it reads)"""
+        return {
+            'remove_duplicates': (lambda data: data.drop_duplicates(), None),  # Reads every column
+            'convert_types': (lambda data: cleaner._convert_types(data, ['number_text']), ['number_text']),
+            'optimize_types': (lambda data: cleaner._optimize_types(data, {'count': 'int8'}), ['count']),
+            'impute': (lambda data: cleaner._handle_missing(data), ['number', 'label']),
+            'standardize_text': (lambda data: cleaner._standardize_text(data), ['label', 'number_text']),
+            'merge_values': (
+                lambda data: cleaner._apply_value_mappings(data, {'label': {'Alpha': 'alpha'}}), ['label']
+            ),
+            'handle_outliers': (lambda data: cleaner._treat_outliers(data, 'clip'), ['number', 'count']),
+            'enforce_validation_rules': (
+                lambda data: cleaner._enforce_rules(data, [{'type': 'range', 'column': 'number', 'min': 0}]),
+                ['number']
+            ),
+        }
+
+cost_model = CostModel()
@@ -1,12 +1,24 @@
 
+import uuid
+
 import pandas as pd
 import numpy as np
 
+from modules.datetime_parsing import DateTimeParser
+from modules.fuzzy_dedup import FuzzyDeduplicator
+from modules.imputation import Imputer
+from modules.outlier_detection import OutlierDetector
+from modules.rule_validation import RuleValidator
+from modules.type_inference import TypeInferencer
+
+from utils.memory_accounting import memory_accountant
+
 
 class DataCleaner:
 
     def __init__(self):
-        pass
+        # Keeps the date format detected per column across cleaning steps
+        self.datetime_parser = DateTimeParser()
 
     def clean_data(self, data, config):
         """
@@ -14,15 +26,65 @@ class DataCleaner:
         """
         cleaned_data = data.copy()
         full_report = {
-            "operations": []
+            "run_id": uuid.uuid4().hex,
+            "operations": [],
+            "missing_values_handled": 0,
+            "duplicates_removed": 0,
+            "outliers_handled": 0,
+            "validation_violations": 0
         }
+        changed_columns = set()
+        # True while the rows are known to be distinct (after drop_duplicates,
+        # until a later step rewrites values and may make two rows equal)
+        rows_unique = False
+
+        # -------------------------------
+        # 0️⃣ Convert Inferred Types
+        # -------------------------------
+        if config.get("convert_types", False):
+            columns = config["convert_types"]
+            cleaned_data, type_report = self._convert_types(
+                cleaned_data,
+                columns=None if columns is True else columns
+            )
+            full_report["operations"].extend(type_report["operations"])
+            changed_columns.update(type_report["columns"])
+
+        # -------------------------------
+        # 0️⃣b Downcast Data Types
+        # -------------------------------
+        if config.get("optimize_types"):
+            cleaned_data, optimize_report = self._optimize_types(
+                cleaned_data,
+                config["optimize_types"]
+            )
+            full_report["operations"].extend(optimize_report["operations"])
+            changed_columns.update(optimize_report["columns"])
 
         # -------------------------------
         # 1️⃣ Handle Missing Values
         # -------------------------------
         if config.get("handle_missing", False):
-            cleaned_data, missing_report = self._handle_missing(cleaned_data)
+            cleaned_data, missing_report = self._handle_missing(
+                cleaned_data,
+                **config.get("imputation", {})
+            )
             full_report["operations"].extend(missing_report["operations"])
+            full_report["missing_values_handled"] += missing_report["missing_values_handled"]
+            changed_columns.update(missing_report["columns"])
+
+        # -------------------------------
+        # 1️⃣b Treat Outliers
+        # -------------------------------
+        if config.get("handle_outliers"):
+            cleaned_data, outlier_report = self._treat_outliers(
+                cleaned_data,
+                **config["handle_outliers"]
+            )
+            full_report["operations"].extend(outlier_report["operations"])
+            full_report["outliers_handled"] += outlier_report["outliers_handled"]
+            full_report["outliers_by_column"] = outlier_report["by_column"]
+            changed_columns.update(outlier_report["columns"])
 
         # -------------------------------
         # 2️⃣ Remove Duplicates
@@ -32,11 +94,25 @@ class DataCleaner:
             cleaned_data = cleaned_data.drop_duplicates()
             after = len(cleaned_data)
 
+            full_report["duplicates_removed"] += before - after
+            rows_unique = True
             if before != after:
                 full_report["operations"].append(
                     f"Removed {before - after} duplicate rows"
                 )
 
+        # -------------------------------
+        # 2️⃣b Merge Near-Duplicate Rows
+        # -------------------------------
+        if config.get("near_duplicates"):
+            before = len(cleaned_data)
+            cleaned_data, near_report = self._keep_best_per_cluster(
+                cleaned_data,
+                **config["near_duplicates"]
+            )
+            full_report["duplicates_removed"] += before - len(cleaned_data)
+            full_report["operations"].extend(near_report["operations"])
+
         # -------------------------------
         # 3️⃣ Standardize Text Columns
         # -------------------------------
@@ -47,41 +123,437 @@ class DataCleaner:
                 case_type=case_type
             )
             full_report["operations"].extend(text_report["operations"])
+            changed_columns.update(text_report["columns"])
+            rows_unique = rows_unique and not text_report["columns"]
+
+        # -------------------------------
+        # 3️⃣b Standardize Dates to ISO 8601
+        # -------------------------------
+        if config.get("standardize_dates", False):
+            columns = config["standardize_dates"]
+            cleaned_data, dates_report = self._standardize_dates(
+                cleaned_data,
+                columns=None if columns is True else columns
+            )
+            full_report["operations"].extend(dates_report["operations"])
+            changed_columns.update(dates_report["columns"])
+            rows_unique = rows_unique and not dates_report["columns"]
+
+        # -------------------------------
+        # 3️⃣c Extract Date Components
+        # -------------------------------
+        if config.get("extract_date_parts"):
+            cleaned_data, parts_report = self._extract_date_parts(
+                cleaned_data,
+                config["extract_date_parts"]
+            )
+            full_report["operations"].extend(parts_report["operations"])
+            changed_columns.update(parts_report["columns"])
+
+        # -------------------------------
+        # 4️⃣ Merge Near-Duplicate Labels
+        # -------------------------------
+        if config.get("value_mappings"):
+            cleaned_data, mapping_report = self._apply_value_mappings(
+                cleaned_data,
+                config["value_mappings"]
+            )
+            full_report["operations"].extend(mapping_report["operations"])
+            changed_columns.update(mapping_report["columns"])
+            rows_unique = rows_unique and not mapping_report["columns"]
+
+        # -------------------------------
+        # 5️⃣ Enforce Validation Rules
+        # -------------------------------
+        if config.get("validation_rules"):
+            cleaned_data, rules_report = self._enforce_rules(
+                cleaned_data,
+                **config["validation_rules"]
+            )
+            full_report["operations"].extend(rules_report["operations"])
+            full_report["validation_violations"] += rules_report["violations"]
+            changed_columns.update(rules_report["columns"])
+            rows_unique = rows_unique and not rules_report["columns"]
+
+        # Statistics of the result are computed once per run so reports can
+        # be rendered from the operation log without rescanning the frame
+        memory_accountant.derive(data, cleaned_data, changed_columns)
+        full_report["changed_columns"] = sorted(changed_columns, key=str)
+        full_report["final_stats"] = self._dataset_stats(cleaned_data, rows_unique=rows_unique)
 
         return {
     "cleaned_data": cleaned_data,
     "report": full_report
 }
 
+    def _dataset_stats(self, data, rows_unique=False):
+        """
+        Summary statistics used by ReportGenerator.
+        rows_unique: skip the duplicate scan when no step after
+        drop_duplicates rewrote values
+        """
+        return {
+            "shape": data.shape,
+            "missing_cells": int(data.isnull().sum().sum()),
+            "duplicate_rows": 0 if rows_unique else int(data.duplicated().sum()),
+            "memory_bytes": memory_accountant.total_bytes(data)
+        }
+
 
     # ==========================================================
     # 🔹 Handle Missing Values
     # ==========================================================
-    def _handle_missing(self, data):
-        report = {"operations": []}
+    def _handle_missing(self, data, strategy="global", group_by=None, columns=None, **options):
+        """
+        strategy: 'global' (median/mode), 'group' (per group_by) or 'knn'
+        columns: restrict imputation to these columns (default: all)
+        """
+        imputer = Imputer(strategy=strategy, group_by=group_by, **options)
+        return imputer.impute(data, columns=columns)
+
+    # ==========================================================
+    # 🔹 Treat Outliers
+    # ==========================================================
+    OUTLIER_TREATMENTS = ("clip", "winsorize", "log", "yeo_johnson", "drop_rows")
+
+    def _treat_outliers(self, data, method="clip", outliers=None, columns=None,
+                        winsorize_limits=(0.05, 0.95), sample_size=100000):
+        """
+        method: 'clip' (to the outlier bounds), 'winsorize' (to the
+        winsorize_limits quantiles), 'log' (signed log1p), 'yeo_johnson'
+        or 'drop_rows' (rows flagged in any column).
+        outliers: the profile's 'outliers' section; its bounds are reused so
+        no quantiles are recomputed. Without it bounds are computed here.
+        Winsorizing needs percentiles the profile does not store, so they
+        are computed from the block of treated columns in one pass.
+        Every method runs as one broadcast operation over the numeric block.
+        Integer columns keep their dtype under clip/winsorize (bounds are
+        rounded inwards); log and Yeo-Johnson make them float.
+        """
+        if method not in self.OUTLIER_TREATMENTS:
+            raise ValueError(f"Unknown outlier treatment: {method}")
+        report = {"operations": [], "columns": [], "outliers_handled": 0, "by_column": {}}
+
+        if outliers is None:
+            numeric = data.select_dtypes(include=[np.number])
+            outliers = OutlierDetector().detect(numeric.loc[:, numeric.notna().any()])[0]
+        cols = [
+            col for col in (columns or outliers)
+            if col in outliers and col in data.columns
+            and pd.api.types.is_numeric_dtype(data[col]) and not pd.api.types.is_bool_dtype(data[col])
+        ]
+        if not cols:
+            return data, report
+
+        lower = np.array([outliers[col]["lower_bound"] for col in cols], dtype=np.float64)
+        upper = np.array([outliers[col]["upper_bound"] for col in cols], dtype=np.float64)
+        block = data[cols].to_numpy(dtype=np.float64)
+        # Bound vectors broadcast across the block; NaN never flags
+        flagged = (block < lower) | (block > upper)
+        counts = flagged.sum(axis=0)
+        report["by_column"] = {col: int(count) for col, count in zip(cols, counts) if count}
+        report["outliers_handled"] = int(counts.sum())
+        if report["outliers_handled"] == 0:
+            return data, report
+
+        if method == "drop_rows":
+            keep = ~flagged.any(axis=1)
+            data = data[keep]
+            report["operations"].append(
+                f"Removed {int((~keep).sum())} rows with outliers in {list(report['by_column'])}"
+            )
+            return data, report
+
+        # Only columns that actually have outliers are rewritten
+        treated = counts > 0
+        cols = [col for col, has_outliers in zip(cols, treated) if has_outliers]
+        block, lower, upper = block[:, treated], lower[treated], upper[treated]
+
+        integer = np.array([pd.api.types.is_integer_dtype(data[col]) for col in cols])
+        if method in ("clip", "winsorize"):
+            if method == "winsorize":
+                lower, upper = np.nanquantile(block, list(winsorize_limits), axis=0)
+            # Integer columns are capped at whole numbers inside the bounds
+            lower = np.where(integer, np.ceil(lower), lower)
+            upper = np.where(integer, np.floor(upper), upper)
+            values = np.clip(block, lower, upper)
+            label = "Capped" if method == "clip" else "Winsorized"
+        elif method == "log":
+            values = np.sign(block) * np.log1p(np.abs(block))
+            label = "Log-transformed"
+        else:
+            values = self._yeo_johnson(block, sample_size)
+            label = "Yeo-Johnson transformed"
+
+        transformed = pd.DataFrame(values, index=data.index, columns=cols)
+        for col, is_integer in zip(cols, integer):
+            original_dtype = data[col].dtype
+            if is_integer and method in ("clip", "winsorize"):
+                data[col] = transformed[col].astype(original_dtype)
+            elif is_integer and pd.api.types.is_extension_array_dtype(original_dtype):
+                data[col] = transformed[col].astype("Float64")  # Keeps missing values as <NA>
+            else:
+                data[col] = transformed[col]
+            report["columns"].append(col)
+            report["operations"].append(
+                f"{label} '{col}' ({report['by_column'][col]} outliers)"
+            )
 
-        for col in data.columns:
-            missing_count = data[col].isna().sum()
+        return data, report
 
-            if missing_count > 0:
+    @staticmethod
+    def _yeo_johnson(block, sample_size=100000, random_state=42):
+        """
+        Yeo-Johnson transform of every column, with lambda fitted per column
+        by maximum likelihood (on a row sample for long columns) and then
+        broadcast as one vector over the block.
+        """
+        from scipy import stats
+
+        rng = np.random.default_rng(random_state)
+        lambdas = np.empty(block.shape[1])
+        for position in range(block.shape[1]):
+            column = block[:, position]
+            column = column[~np.isnan(column)]
+            if len(column) > sample_size:
+                column = rng.choice(column, sample_size, replace=False)
+            lambdas[position] = stats.yeojohnson_normmax(column)
+
+        positive = block >= 0
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            pos_values = np.where(
+                lambdas == 0, np.log1p(np.abs(block)), (np.power(np.abs(block) + 1, lambdas) - 1) / lambdas
+            )
+            neg_values = np.where(
+                lambdas == 2, -np.log1p(np.abs(block)),
+                -(np.power(np.abs(block) + 1, 2 - lambdas) - 1) / (2 - lambdas)
+            )
+        return np.where(positive, pos_values, np.where(np.isnan(block), np.nan, neg_values))
+
+    # ==========================================================
+    # 🔹 Convert Inferred Types
+    # ==========================================================
+    def _convert_types(self, data, columns=None):
+        """
+        Convert text columns to their inferred semantic type.
+        columns: restrict to these columns (default: every text column)
+        """
+        report = {"operations": [], "columns": []}
+        inferencer = TypeInferencer(datetime_parser=self.datetime_parser)
+        convertible = ("integer", "float", "boolean", "datetime", "categorical")
+
+        candidates = columns or data.select_dtypes(include=["object", "string"]).columns
+        for col in candidates:
+            inference = inferencer.infer_column(data[col])
+            if inference["inferred_type"] not in convertible:
+                continue
+            if inference["confidence"] < inferencer.confidence_threshold:
+                continue
+
+            data[col] = inferencer.convert(data[col], inference)
+            report["columns"].append(col)
+            message = f"Converted '{col}' to {inference['inferred_type']}"
+            if inference["failed_count"]:
+                message += f" ({inference['failed_count']} unparseable values set to missing)"
+            report["operations"].append(message)
 
-                # Numeric column → fill with median
-                if pd.api.types.is_numeric_dtype(data[col]):
-                    median_value = data[col].median()
-                    data[col].fillna(median_value, inplace=True)
+        return data, report
 
-                    report["operations"].append(
-                        f"Filled {missing_count} missing values in '{col}' with median"
-                    )
+    # ==========================================================
+    # 🔹 Standardize Dates
+    # ==========================================================
+    def _standardize_dates(self, data, columns=None):
+        """
+        Rewrite date columns as ISO 8601 text.
+        columns: restrict to these columns (default: every text column holding dates)
+        Values that cannot be parsed are kept as they are.
+        """
+        report = {"operations": [], "columns": []}
+        parser = self.datetime_parser
+
+        if columns is None:
+            columns = [
+                col for col in data.columns
+                if parser._is_text(data[col]) and parser.format_for(data[col]) is not None
+            ]
+        for col in columns:
+            if col not in data.columns:
+                continue
+            original = data[col]
+            iso = parser.to_iso(original)
+            unparsed = (iso.isna() & original.notna()).to_numpy()
+            standardized = iso.astype(object).where(~unparsed, original.astype(object))
+            changed = int((standardized != original.astype(object)).to_numpy()[original.notna().to_numpy()].sum())
+            if changed == 0:
+                continue
+
+            data[col] = standardized
+            report["columns"].append(col)
+            message = f"Standardized {changed} dates in '{col}' to ISO 8601"
+            if unparsed.any():
+                message += f" ({int(unparsed.sum())} unparseable values kept)"
+            report["operations"].append(message)
 
-                # Categorical column → fill with mode
-                else:
-                    mode_value = data[col].mode()[0]
-                    data[col].fillna(mode_value, inplace=True)
+        return data, report
 
-                    report["operations"].append(
-                        f"Filled {missing_count} missing values in '{col}' with mode"
-                    )
+    # ==========================================================
+    # 🔹 Extract Date Components
+    # ==========================================================
+    def _extract_date_parts(self, data, parts_by_column):
+        """
+        parts_by_column: {column: [part, ...]} with parts from
+        DateTimeParser.PARTS; adds one '{column}_{part}' column per part.
+        """
+        report = {"operations": [], "columns": []}
+
+        for col, parts in parts_by_column.items():
+            if col not in data.columns or not parts:
+                continue
+            extracted = self.datetime_parser.extract_parts(data[col], parts)
+            for part_col in extracted.columns:
+                data[part_col] = extracted[part_col]
+            report["columns"].extend(extracted.columns)
+            report["operations"].append(
+                f"Extracted {', '.join(parts)} from '{col}'"
+            )
+
+        return data, report
+
+    # ==========================================================
+    # 🔹 Downcast Data Types
+    # ==========================================================
+    def _optimize_types(self, data, dtypes):
+        """
+        dtypes: {column: target dtype}, e.g. the profile's data type
+        suggestions. Columns whose values do not fit the target are skipped.
+        """
+        report = {"operations": [], "columns": []}
+
+        for col, dtype in dtypes.items():
+            if col not in data.columns or str(data[col].dtype) == str(dtype):
+                continue
+            try:
+                converted = data[col].astype(dtype)
+            except (TypeError, ValueError):
+                continue
+            # Integer targets must not truncate, wrap or drop values
+            if pd.api.types.is_integer_dtype(converted) and not (converted == data[col]).all():
+                continue
+
+            before = int(data[col].memory_usage(index=False, deep=True))
+            after = int(converted.memory_usage(index=False, deep=True))
+            data[col] = converted
+            report["columns"].append(col)
+            report["operations"].append(
+                f"Converted '{col}' to {dtype} ({(before - after) / 1024 ** 2:.2f} MB saved)"
+            )
+
+        return data, report
+
+    # ==========================================================
+    # 🔹 Near-Duplicate Rows
+    # ==========================================================
+    def _keep_best_per_cluster(self, data, key_columns=None, similarity_threshold=0.8):
+        """
+        Keep one record per near-duplicate cluster: the row with the most
+        non-null values, ties going to the earliest row.
+        """
+        report = {"operations": []}
+        clusters = FuzzyDeduplicator(
+            key_columns=key_columns,
+            similarity_threshold=similarity_threshold
+        ).find_clusters(data)
+
+        cluster_ids = clusters["cluster_ids"]
+        clustered = cluster_ids >= 0
+        if not clustered.any():
+            return data, report
+
+        ranking = pd.DataFrame({
+            "cluster": cluster_ids[clustered],
+            "completeness": data.notna().sum(axis=1).to_numpy()[clustered],
+            "position": np.flatnonzero(clustered)
+        }).sort_values(["cluster", "completeness", "position"], ascending=[True, False, True])
+        best_positions = ranking.drop_duplicates("cluster")["position"].to_numpy()
+
+        keep = ~clustered
+        keep[best_positions] = True
+        removed = int((~keep).sum())
+
+        report["operations"].append(
+            f"Merged {clusters['cluster_count']} near-duplicate clusters, removed {removed} rows"
+        )
+        return data[keep], report
+
+    # ==========================================================
+    # 🔹 Enforce Validation Rules
+    # ==========================================================
+    def _enforce_rules(self, data, rules, action="drop_rows"):
+        """
+        action: 'drop_rows' removes every row breaking any rule,
+        'set_missing' blanks the offending values (the left column of a
+        comparison) and keeps the rows.
+        """
+        report = {"operations": [], "columns": [], "violations": 0}
+        validation = RuleValidator(rules).validate(data)
+        report["violations"] = validation["total_violations"]
+        if validation["invalid_row_count"] == 0:
+            return data, report
+
+        if action == "drop_rows":
+            data = data[~validation["invalid_rows"].to_mask()]
+            report["operations"].append(
+                f"Removed {validation['invalid_row_count']} rows breaking validation rules"
+            )
+        elif action == "set_missing":
+            for name, result in validation["rules"].items():
+                if result["violations"] == 0:
+                    continue
+                col = result["columns"][0]
+                data[col] = data[col].mask(result["rows"].to_mask())
+                report["columns"].append(col)
+                report["operations"].append(
+                    f"Set {result['violations']} values in '{col}' to missing (rule '{name}')"
+                )
+        else:
+            raise ValueError(f"Unknown validation action: {action}")
+
+        return data, report
+
+    # ==========================================================
+    # 🔹 Apply Value Mappings
+    # ==========================================================
+    def _apply_value_mappings(self, data, mappings):
+        """
+        mappings: {column: {old_value: new_value}}
+        The mapping is applied to the distinct values only and broadcast
+        back through the factorized codes.
+        """
+        report = {"operations": [], "columns": []}
+
+        for col, mapping in mappings.items():
+            if col not in data.columns or not mapping:
+                continue
+
+            codes, uniques = pd.factorize(data[col])
+            unique_values = pd.Series(uniques, dtype=object)
+            mapped_uniques = unique_values.map(lambda value: mapping.get(value, value))
+            changed = (codes >= 0) & (mapped_uniques != unique_values).to_numpy()[codes]
+            changes_count = int(changed.sum())
+            if changes_count == 0:
+                continue
+
+            values = mapped_uniques.to_numpy(dtype=object)[codes]
+            values[codes < 0] = np.nan
+            mapped = pd.Series(values, index=data.index)
+            if isinstance(data[col].dtype, pd.CategoricalDtype):
+                mapped = mapped.astype("category")
+            data[col] = mapped
+
+            report["columns"].append(col)
+            report["operations"].append(
+                f"Merged {changes_count} values in '{col}' into {len(set(mapping.values()))} canonical labels"
+            )
 
         return data, report
 
@@ -92,7 +564,7 @@ class DataCleaner:
         """
         case_type: 'lower' or 'title'
         """
-        report = {"operations": []}
+        report = {"operations": [], "columns": []}
         categorical_cols = data.select_dtypes(include=["object"]).columns
 
         for col in categorical_cols:
@@ -120,6 +592,7 @@ class DataCleaner:
             changes_count = (original_values != data[col]).sum()
 
             if changes_count > 0:
+                report["columns"].append(col)
                 report["operations"].append(
                     f"Standardized {changes_count} values in '{col}' (whitespace cleaned + {case_type} case)"
                 )
@@ -0,0 +1,284 @@
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import tempfile
+from collections import Counter
+
+import pandas as pd
+
+from utils.helpers import detect_encoding_from_samples, read_file_samples
+
+
+def default_cache_dir():
+    """Cache location, overridable with DATA_CLEANING_CACHE_DIR"""
+    return os.environ.get(
+        "DATA_CLEANING_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "ai_data_cleaning")
+    )
+
+
+def file_fingerprint(file_bytes):
+    """Content hash used as the cache key for an uploaded file"""
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+class ExcelIngestor:
+    """
+    Excel loading with a one-time conversion to a columnar cache.
+
+    The first open parses every sheet in a single read of the workbook
+    (with the calamine engine when python-calamine is installed) and stores
+    each sheet as Parquet (pickle when pyarrow is unavailable) under the
+    file's content hash. Later opens of the same workbook read straight from
+    the cache. Callers that already hashed the upload pass the fingerprint
+    so the workbook is not hashed again.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = os.path.join(cache_dir or default_cache_dir(), "excel")
+
+    @staticmethod
+    def engine():
+        """Fastest available reader engine (None lets pandas pick openpyxl/xlrd)"""
+        try:
+            import python_calamine  # noqa: F401
+            return "calamine"
+        except ImportError:
+            return None
+
+    def sheet_names(self, file_bytes, fingerprint=None):
+        """Sheet names of the workbook, cached alongside the parsed sheets"""
+        fingerprint = fingerprint or file_fingerprint(file_bytes)
+        manifest_path = os.path.join(self._workbook_dir(fingerprint), "manifest.json")
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                return json.load(f)["sheets"]
+
+        with pd.ExcelFile(io.BytesIO(file_bytes), engine=self.engine()) as workbook:
+            sheets = list(workbook.sheet_names)
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        self._atomic_write(manifest_path, lambda path: self._write_json(path, {"sheets": sheets}))
+        return sheets
+
+    def load(self, file_bytes, sheet_name=None, fingerprint=None):
+        """
+        Load one sheet (the first when sheet_name is None). On a cache miss
+        all sheets of the workbook are parsed and cached in one go.
+        """
+        fingerprint = fingerprint or file_fingerprint(file_bytes)
+        sheets = self.sheet_names(file_bytes, fingerprint)
+        sheet_name = sheet_name if sheet_name is not None else sheets[0]
+        if sheet_name not in sheets:
+            raise ValueError(f"Sheet '{sheet_name}' not found in workbook")
+
+        cached = self._read_cached(fingerprint, sheet_name)
+        if cached is not None:
+            return cached
+        return self.load_all(file_bytes, fingerprint)[sheet_name]
+
+    def load_all(self, file_bytes, fingerprint=None):
+        """
+        Load every sheet. Uncached sheets are parsed in one read_excel call,
+        which opens the workbook once; per-sheet threads re-open it for every
+        sheet and are serialized by the GIL, so they are no faster.
+        """
+        fingerprint = fingerprint or file_fingerprint(file_bytes)
+        sheets = self.sheet_names(file_bytes, fingerprint)
+        frames = {}
+        missing = []
+        for sheet in sheets:
+            cached = self._read_cached(fingerprint, sheet)
+            if cached is None:
+                missing.append(sheet)
+            else:
+                frames[sheet] = cached
+
+        if missing:
+            parsed = pd.read_excel(io.BytesIO(file_bytes), sheet_name=missing, engine=self.engine())
+            for sheet in missing:
+                frames[sheet] = parsed[sheet]
+                self._write_cached(fingerprint, sheet, parsed[sheet])
+
+        return {sheet: frames[sheet] for sheet in sheets}
+
+    def _workbook_dir(self, fingerprint):
+        return os.path.join(self.cache_dir, fingerprint)
+
+    def _sheet_path(self, fingerprint, sheet_name, extension):
+        safe_name = hashlib.md5(str(sheet_name).encode("utf-8")).hexdigest()
+        return os.path.join(self._workbook_dir(fingerprint), f"{safe_name}.{extension}")
+
+    def _read_cached(self, fingerprint, sheet_name):
+        parquet_path = self._sheet_path(fingerprint, sheet_name, "parquet")
+        if os.path.exists(parquet_path):
+            return pd.read_parquet(parquet_path)
+        pickle_path = self._sheet_path(fingerprint, sheet_name, "pkl")
+        if os.path.exists(pickle_path):
+            return pd.read_pickle(pickle_path)
+        return None
+
+    def _write_cached(self, fingerprint, sheet_name, frame):
+        os.makedirs(self._workbook_dir(fingerprint), exist_ok=True)
+        try:
+            self._atomic_write(
+                self._sheet_path(fingerprint, sheet_name, "parquet"),
+                lambda path: frame.to_parquet(path, index=False)
+            )
+        except Exception:
+            # No pyarrow, or mixed-type object columns Parquet cannot encode
+            self._atomic_write(
+                self._sheet_path(fingerprint, sheet_name, "pkl"),
+                frame.to_pickle
+            )
+
+    @staticmethod
+    def _write_json(path, payload):
+        with open(path, "w") as f:
+            json.dump(payload, f)
+
+    @staticmethod
+    def _atomic_write(path, writer):
+        """Write to a temporary file and rename, so readers never see partial files"""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        os.close(fd)
+        try:
+            writer(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+class CSVSniffer:
+    """
+    Detect CSV parse settings from bounded samples of the file.
+
+    Only sample_size bytes from the head, middle and tail are read. The
+    result is a dict of pd.read_csv keyword arguments (encoding, sep,
+    quotechar, header, decimal, thousands) for a single parse.
+    """
+
+    DELIMITERS = ',;\t|'
+    COMMA_DECIMAL = re.compile(r'^-?\d{1,3}(\.\d{3})*,\d+$|^-?\d+,\d+$')
+    DOT_DECIMAL = re.compile(r'^-?\d{1,3}(,\d{3})*\.\d+$|^-?\d+\.\d+$')
+    DOT_THOUSANDS = re.compile(r'^-?\d{1,3}(\.\d{3})+(,\d+)?$')
+
+    def __init__(self, sample_size=65536, max_lines=200):
+        self.sample_size = sample_size
+        self.max_lines = max_lines  # Lines per sample used for dialect detection
+
+    def sniff(self, file_obj):
+        samples = read_file_samples(file_obj, self.sample_size)
+        encoding = detect_encoding_from_samples(samples)
+        sample_lines = [
+            self._complete_lines(sample, encoding, is_head=(position == 0))
+            for position, sample in enumerate(samples)
+        ]
+        head_lines = sample_lines[0]
+        if not head_lines:
+            return {'encoding': encoding}
+
+        delimiter, quotechar = self._detect_dialect(head_lines)
+        has_header = self._has_header(head_lines, delimiter, quotechar)
+
+        settings = {
+            'encoding': encoding,
+            'sep': delimiter,
+            'quotechar': quotechar,
+            'header': 0 if has_header else None,
+        }
+        settings.update(self._detect_number_format(sample_lines, delimiter, quotechar, has_header))
+        return settings
+
+    def _complete_lines(self, sample, encoding, is_head):
+        """Decode a sample and drop lines cut at the sample boundaries"""
+        text = sample.decode(encoding, errors='replace')
+        if encoding == 'utf-8-sig':
+            text = text.lstrip('\ufeff')
+        lines = text.splitlines()
+        if not is_head and lines:
+            lines = lines[1:]
+        if len(sample) >= self.sample_size and lines:
+            lines = lines[:-1]
+        return [line for line in lines if line.strip()][:self.max_lines]
+
+    def _detect_dialect(self, lines):
+        try:
+            dialect = csv.Sniffer().sniff('\n'.join(lines), delimiters=self.DELIMITERS)
+            return dialect.delimiter, dialect.quotechar or '"'
+        except csv.Error:
+            pass
+
+        # Fall back to the delimiter whose per-line count is most consistent
+        best, best_score = ',', -1
+        for delimiter in self.DELIMITERS:
+            counts = Counter(line.count(delimiter) for line in lines)
+            count, frequency = counts.most_common(1)[0]
+            score = frequency if count > 0 else 0
+            if score > best_score:
+                best, best_score = delimiter, score
+        return best, '"'
+
+    def _has_header(self, lines, delimiter, quotechar):
+        """
+        Whether the first line is a header. The first line is a header
+        unless there is strong evidence otherwise: every field has the
+        type (number / text) of its column in the following lines, and at
+        least one column is numeric. An all-text file keeps its header.
+        """
+        rows = list(csv.reader(lines, delimiter=delimiter, quotechar=quotechar))
+        if len(rows) < 2:
+            return True
+
+        first, data_rows = rows[0], rows[1:]
+        numeric_column = False
+        for position, field in enumerate(first):
+            kinds = Counter(
+                self._field_kind(row[position]) for row in data_rows if position < len(row)
+            )
+            kinds.pop('empty', None)
+            if not kinds:
+                continue
+            column_kind = kinds.most_common(1)[0][0]
+            numeric_column |= column_kind == 'number'
+            field_kind = self._field_kind(field)
+            if field_kind != 'empty' and field_kind != column_kind:
+                return True
+        return not numeric_column
+
+    def _field_kind(self, field):
+        field = field.strip()
+        if not field:
+            return 'empty'
+        if self.DOT_DECIMAL.match(field) or self.COMMA_DECIMAL.match(field) or \
+                re.match(r'^[-+]?\d+([.,]\d{3})*$', field):
+            return 'number'
+        return 'text'
+
+    def _detect_number_format(self, sample_lines, delimiter, quotechar, has_header):
+        """Decimal/thousands separators from the numeric-looking fields"""
+        comma_decimals = dot_decimals = dot_thousands = 0
+        for position, lines in enumerate(sample_lines):
+            if position == 0 and has_header:
+                lines = lines[1:]
+            for row in csv.reader(lines, delimiter=delimiter, quotechar=quotechar):
+                for field in row:
+                    field = field.strip()
+                    if self.DOT_DECIMAL.match(field):
+                        dot_decimals += 1
+                    elif self.COMMA_DECIMAL.match(field):
+                        comma_decimals += 1
+                        if self.DOT_THOUSANDS.match(field):
+                            dot_thousands += 1
+
+        # A comma cannot be the decimal mark of a comma-delimited file
+        if delimiter != ',' and comma_decimals > dot_decimals:
+            settings = {'decimal': ','}
+            if dot_thousands:
+                settings['thousands'] = '.'
+            return settings
+        return {'decimal': '.'}
@@ -0,0 +1,128 @@
+from collections import OrderedDict
+
+import pandas as pd
+import numpy as np
+
+from utils.row_sets import RowSet
+
+
+class DataWindow:
+    """
+    Server-side paging over a DataFrame.
+
+    Only the rows of the requested page are ever sliced out of the frame.
+    Sort orders, filter masks and the resulting row order are cached per
+    view state, so paging through an unchanged view costs O(page_size).
+    Each cached sort order or filter mask is a full-length array, so only
+    the max_cached most recently used of each are kept.
+    """
+
+    def __init__(self, data, page_size=50, max_cached=8):
+        self.data = data
+        self.page_size = page_size
+        self.max_cached = max_cached
+        self._sort_orders = OrderedDict()  # (column, ascending) -> positions, oldest first
+        self._filter_masks = OrderedDict()  # (column, text) -> boolean mask, oldest first
+        self._view_key = None
+        self._view_positions = None
+        self._alignments = {}  # id(row set) -> (row set, row set mapped onto self.data)
+
+    def flagged_rows(self, profile):
+        """
+        Rows flagged as duplicates or outliers in any column, as
+        (row_set, stale). Flags profiled on an earlier version of the data
+        (e.g. before a cleaning step removed rows) are mapped onto the
+        current rows by index label; stale counts the flag sets that could
+        not be mapped and were left out.
+        """
+        if not profile:
+            return RowSet.empty(len(self.data), self.data.index), 0
+        row_sets = []
+        duplicates = profile.get('duplicates', {}).get('duplicate_indices')
+        if isinstance(duplicates, RowSet):
+            row_sets.append(duplicates)
+        any_outlier = profile.get('outlier_flags', {}).get('any_outlier')
+        if isinstance(any_outlier, RowSet):
+            row_sets.append(any_outlier)
+        aligned = [self._aligned(row_set) for row_set in row_sets]
+        stale = sum(row_set is None for row_set in aligned)
+        aligned = [row_set for row_set in aligned if row_set is not None]
+        return RowSet.union_all(aligned, size=len(self.data), index=self.data.index), stale
+
+    def _aligned(self, row_set):
+        """row_set mapped onto the current rows, or None when its labels cannot be matched"""
+        cached = self._alignments.get(id(row_set))
+        if cached is not None and cached[0] is row_set:
+            return cached[1]
+
+        index = self.data.index
+        if row_set.size == len(index) and (row_set.index is None or row_set.index.equals(index)):
+            aligned = row_set
+        elif row_set.index is None or not (index.is_unique and row_set.index.is_unique):
+            aligned = None
+        else:
+            aligned = RowSet.from_mask(index.isin(row_set.labels()), index)
+        self._alignments[id(row_set)] = (row_set, aligned)
+        return aligned
+
+    def view_positions(self, sort_by=None, ascending=True, filter_column=None,
+                       filter_text='', row_set=None):
+        """Row positions of the current view, recomputed only when the view changes"""
+        view_key = (sort_by, ascending, filter_column, filter_text,
+                    None if row_set is None else row_set.bits.tobytes())
+        if view_key == self._view_key:
+            return self._view_positions
+
+        if sort_by is not None:
+            positions = self._sort_order(sort_by, ascending)
+        else:
+            positions = np.arange(len(self.data))
+
+        mask = None
+        if filter_column is not None and filter_text:
+            mask = self._filter_mask(filter_column, filter_text)
+        if row_set is not None:
+            flagged = row_set.to_mask()
+            mask = flagged if mask is None else mask & flagged
+        if mask is not None:
+            positions = positions[mask[positions]]
+
+        self._view_key = view_key
+        self._view_positions = positions
+        return positions
+
+    def page_count(self, positions):
+        return max(1, -(-len(positions) // self.page_size))
+
+    def get_page(self, page, **view):
+        """Return (page_frame, total_rows_in_view) for a 1-based page number"""
+        positions = self.view_positions(**view)
+        start = (page - 1) * self.page_size
+        page_positions = positions[start:start + self.page_size]
+        return self.data.iloc[page_positions], len(positions)
+
+    def _sort_order(self, column, ascending):
+        def compute():
+            values = self.data[column].reset_index(drop=True)
+            ordered = values.sort_values(ascending=ascending, kind='stable', na_position='last')
+            return ordered.index.to_numpy()
+        return self._cached(self._sort_orders, (column, ascending), compute)
+
+    def _filter_mask(self, column, text):
+        def compute():
+            values = self.data[column]
+            if not (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+                values = values.astype(str)
+            mask = values.str.contains(text, case=False, regex=False, na=False)
+            return mask.to_numpy(dtype=bool)
+        return self._cached(self._filter_masks, (column, text), compute)
+
+    def _cached(self, cache, key, compute):
+        """LRU lookup: compute on a miss and evict the least recently used entries"""
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        cache[key] = value = compute()
+        while len(cache) > self.max_cached:
+            cache.popitem(last=False)
+        return value
@@ -23,45 +23,146 @@ class DataProfiler:
         }
 import pandas as pd
 import numpy as np
-from scipy import stats
 from collections import Counter
 import re
 
+from modules.datetime_parsing import DateTimeParser
+from modules.fuzzy_dedup import FuzzyDeduplicator
+from modules.outlier_detection import OutlierDetector
+from modules.pattern_profiling import PatternProfiler
+from modules.profiling_backends import PandasBackend, make_backend
+from modules.rule_validation import RuleValidator
+from modules.type_inference import TypeInferencer
+from modules.value_clustering import ValueClusterer
+from utils.memory_accounting import memory_accountant
+from utils.row_sets import RowSet
+
 class DataProfiler:
     """Comprehensive data profiling and analysis"""
     
-    def __init__(self):
+    def __init__(self, correlation_method='pearson', correlation_threshold=0.9,
+                 correlation_block_size=500, correlation_sample_rows=100000,
+                 outlier_method='iqr', outlier_column_methods=None,
+                 histogram_bins=30, outlier_sample_size=500,
+                 near_duplicate_columns=None, backend='pandas', backend_options=None,
+                 sample_rows=100000, max_frequency_values=None, validation_rules=None):
         self.numeric_threshold = 0.8  # Threshold for considering a column numeric
+        self.correlation_method = correlation_method  # 'pearson' or 'spearman'
+        self.correlation_threshold = correlation_threshold
+        self.correlation_block_size = correlation_block_size  # Columns per block in wide mode
+        self.correlation_sample_rows = correlation_sample_rows  # Row sample used in wide mode
+        self.histogram_bins = histogram_bins
+        self.outlier_sample_size = outlier_sample_size  # Max outlier points kept for charts
+        self.backend = backend  # 'pandas' (in memory) or 'duckdb' (CSV/Parquet queried in place)
+        self.backend_options = backend_options or {}
+        self.sample_rows = sample_rows  # Row sample for row-level checks on out-of-core backends
+        self.max_frequency_values = max_frequency_values  # Distinct values fetched per text column
+        self.value_clusterer = ValueClusterer()
+        self.pattern_profiler = PatternProfiler()
+        # Shared so formats detected during type inference are reused for date profiling
+        self.datetime_parser = DateTimeParser(confidence_threshold=self.numeric_threshold)
+        self.type_inferencer = TypeInferencer(
+            confidence_threshold=self.numeric_threshold, datetime_parser=self.datetime_parser
+        )
+        # Key columns for MinHash near-duplicate detection; None disables it
+        self.near_duplicate_columns = near_duplicate_columns
+        self.outlier_detector = OutlierDetector(
+            default_method=outlier_method,
+            column_methods=outlier_column_methods
+        )
+        # Declarative domain rules (see RuleValidator); None skips validation
+        self.rule_validator = RuleValidator(validation_rules) if validation_rules else None
     
     def generate_profile(self, data):
-        """Generate comprehensive data profile"""
+        """
+        Generate comprehensive data profile.
+
+        data: a DataFrame, or a CSV/Parquet path when the profiler runs on
+        the 'duckdb' backend. Row-level results (RowSets, packed outlier
+        flags, near-duplicates, rule violations) need the rows in memory and are None for
+        out-of-core backends; type inference, missing-value patterns and
+        date profiles then use a row sample.
+        """
+        backend = make_backend(data, self.backend, **self.backend_options)
+        frame = backend.frame()
+        rows = frame if frame is not None else backend.sample(self.sample_rows)
+        type_inference = self.type_inferencer.infer(rows)
+        # Value frequency tables are shared by the categorical and pattern checks
+        frequencies = {
+            col: backend.value_frequencies(col, limit=self.max_frequency_values)
+            for col in backend.text_columns()
+        }
+
+        if frame is not None:
+            # Numbers stored as text ("1,234") join the numeric checks
+            numeric_view = self._with_inferred_numeric(frame, type_inference)
+            numeric_backend = backend if numeric_view is frame else PandasBackend(numeric_view)
+            outliers, outlier_flags = self.outlier_detector.detect(numeric_view)
+        else:
+            numeric_backend = backend
+            outliers, outlier_flags = self._detect_outliers_out_of_core(backend, rows)
+
         profile = {
-            'basic_info': self._get_basic_info(data),
-            'missing_values': self._analyze_missing_values(data),
-            'duplicates': self._analyze_duplicates(data),
-            'data_types': self._analyze_data_types(data),
-            'outliers': self._detect_outliers(data),
-            'categorical_issues': self._detect_categorical_issues(data),
-            'correlation_issues': self._detect_correlation_issues(data)
+            'basic_info': self._get_basic_info(backend),
+            'missing_values': self._analyze_missing_values(backend, rows),
+            'duplicates': self._analyze_duplicates(backend),
+            'data_types': self._analyze_data_types(backend),
+            'type_inference': type_inference,
+            'outliers': outliers,
+            'outlier_flags': outlier_flags,
+            'distributions': self._summarize_distributions(numeric_backend),
+            'categorical_issues': self._detect_categorical_issues(backend, frequencies),
+            'patterns': self._profile_patterns(frequencies),
+            'correlation_issues': self._detect_correlation_issues(numeric_backend),
+            'datetimes': self._profile_datetimes(rows, type_inference),
+            'validation': self._validate_rules(frame)
         }
         return profile
     
-    def _get_basic_info(self, data):
+    def _profile_datetimes(self, rows, type_inference):
+        """Date profiles of datetime columns and of text columns inferred as dates"""
+        columns = [
+            col for col in rows.columns
+            if pd.api.types.is_datetime64_any_dtype(rows[col])
+            or type_inference.get(col, {}).get('inferred_type') == 'datetime'
+        ]
+        return self.datetime_parser.profile_frame(rows, columns)
+    
+    def _validate_rules(self, frame):
+        """Rule violations with row bitmaps; needs the rows in memory"""
+        if self.rule_validator is None or frame is None:
+            return None
+        return self.rule_validator.validate(frame)
+    
+    def _with_inferred_numeric(self, data, type_inference):
+        """Frame whose text columns inferred as numbers are converted for analysis"""
+        converted = {
+            col: self.type_inferencer.convert(data[col], info).astype('float64')
+            for col, info in type_inference.items()
+            if info['inferred_type'] in ('integer', 'float')
+        }
+        if not converted:
+            return data
+        return data.assign(**converted)
+    
+    def _get_basic_info(self, backend):
         """Get basic dataset information"""
+        row_count = backend.row_count()
+        column_count = len(backend.columns())
         return {
-            'shape': data.shape,
-            'memory_usage': data.memory_usage(deep=True).sum(),
-            'column_count': len(data.columns),
-            'row_count': len(data)
+            'shape': (row_count, column_count),
+            'memory_usage': backend.memory_bytes(),
+            'column_count': column_count,
+            'row_count': row_count
         }
     
-    def _analyze_missing_values(self, data):
+    def _analyze_missing_values(self, backend, rows):
         """Analyze missing values patterns"""
-        missing_count = data.isnull().sum()
-        missing_percentage = (missing_count / len(data)) * 100
+        missing_count = backend.null_counts()
+        missing_percentage = (missing_count / backend.row_count()) * 100
         
         by_column = {}
-        for col in data.columns:
+        for col in missing_count.index:
             if missing_count[col] > 0:
                 by_column[col] = {
                     'count': int(missing_count[col]),
@@ -72,7 +173,7 @@ class DataProfiler:
             'total_missing': int(missing_count.sum()),
             'columns_with_missing': int((missing_count > 0).sum()),
             'by_column': by_column,
-            'missing_patterns': self._find_missing_patterns(data)
+            'missing_patterns': self._find_missing_patterns(rows)
         }
     
     def _find_missing_patterns(self, data):
@@ -92,41 +193,68 @@ class DataProfiler:
         
         return patterns
     
-    def _analyze_duplicates(self, data):
+    def _analyze_duplicates(self, backend):
         """Analyze duplicate rows"""
-        duplicate_count = data.duplicated().sum()
-        duplicate_percentage = (duplicate_count / len(data)) * 100
+        duplicate_mask = backend.duplicate_mask()
+        if duplicate_mask is None:
+            duplicate_count = backend.duplicate_count()
+            duplicate_indices = None
+        else:
+            duplicate_count = duplicate_mask.sum()
+            duplicate_indices = RowSet.from_mask(duplicate_mask.to_numpy(), duplicate_mask.index)
+        duplicate_percentage = (duplicate_count / backend.row_count()) * 100
         
-        return {
+        duplicates = {
             'count': int(duplicate_count),
             'percentage': float(duplicate_percentage),
-            'duplicate_indices': data[data.duplicated()].index.tolist()
+            'duplicate_indices': duplicate_indices
         }
+        
+        if self.near_duplicate_columns and backend.frame() is not None:
+            near_duplicates = FuzzyDeduplicator(
+                key_columns=self.near_duplicate_columns
+            ).find_clusters(backend.frame())
+            duplicates['near_duplicates'] = {
+                'key_columns': list(self.near_duplicate_columns),
+                'cluster_count': near_duplicates['cluster_count'],
+                'rows_in_clusters': near_duplicates['rows_in_clusters'],
+                'count': near_duplicates['duplicate_rows'],
+                'duplicate_indices': near_duplicates['redundant_rows']
+            }
+        
+        return duplicates
     
-    def _analyze_data_types(self, data):
+    def _analyze_data_types(self, backend):
         """Analyze data types and suggest optimizations"""
         type_analysis = {}
+        dtypes = backend.dtypes()
+        unique_counts = backend.distinct_counts()
+        row_count = backend.row_count()
+        numeric_cols = [
+            col for col, col_type in dtypes.items()
+            if col_type.startswith('int') or col_type.startswith('float')
+        ]
+        summary = backend.numeric_summary(numeric_cols) if numeric_cols else None
         
-        for col in data.columns:
-            col_type = str(data[col].dtype)
-            unique_count = data[col].nunique()
+        for col, col_type in dtypes.items():
+            unique_count = unique_counts[col]
             
             suggestions = []
             
             # Integer optimization
-            if col_type.startswith('int') or col_type.startswith('float'):
-                min_val = data[col].min()
-                max_val = data[col].max()
+            if col in numeric_cols:
+                min_val = summary.at['min', col]
+                max_val = summary.at['max', col]
                 
                 if col_type.startswith('int64') and min_val >= -128 and max_val <= 127:
                     suggestions.append('int8')
                 elif col_type.startswith('int64') and min_val >= -32768 and max_val <= 32767:
                     suggestions.append('int16')
-                elif col_type.startswith('float64') and data[col].apply(float.is_integer).all():
+                elif col_type.startswith('float64') and summary.at['integral', col]:
                     suggestions.append('int32')
             
             # Categorical optimization
-            if col_type == 'object' and unique_count < len(data) * 0.5:
+            if col_type == 'object' and unique_count < row_count * 0.5:
                 suggestions.append('category')
             
             type_analysis[col] = {
@@ -138,89 +266,202 @@ class DataProfiler:
         return type_analysis
     
     def _detect_outliers(self, data):
-        """Detect outliers using IQR method"""
+        """Detect outliers with the configured per-column methods"""
+        outliers, _ = self.outlier_detector.detect(data)
+        return outliers
+    
+    def _detect_outliers_out_of_core(self, backend, rows):
+        """Bounds from a row sample, exact outlier counts from the backend"""
+        columns = [col for col in backend.numeric_columns() if rows[col].notna().any()]
+        flags = {'columns': columns, 'row_count': backend.row_count(), 'packed': None, 'any_outlier': None}
+        if not columns:
+            return {}, flags
+        
+        lower_bound, upper_bound = self.outlier_detector.bounds(rows[columns])
+        counts = backend.count_outside(lower_bound, upper_bound)
+        methods = self.outlier_detector._methods(columns)
+        row_count = backend.row_count()
         outliers = {}
-        numeric_cols = data.select_dtypes(include=[np.number]).columns
+        for col in columns:
+            if counts[col] > 0:
+                outliers[col] = {
+                    'count': int(counts[col]),
+                    'percentage': float((counts[col] / row_count) * 100),
+                    'method': methods[col],
+                    'lower_bound': float(lower_bound[col]),
+                    'upper_bound': float(upper_bound[col]),
+                    'outlier_indices': None
+                }
+        return outliers, flags
+    
+    def _summarize_distributions(self, backend):
+        """Precompute box-plot statistics and histograms so charts never need raw values"""
+        columns = backend.numeric_columns()
+        if not columns:
+            return {}
         
-        for col in numeric_cols:
-            if data[col].notna().sum() > 0:  # Skip if all NaN
-                Q1 = data[col].quantile(0.25)
-                Q3 = data[col].quantile(0.75)
-                IQR = Q3 - Q1
-                
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                
-                outlier_mask = (data[col] < lower_bound) | (data[col] > upper_bound)
-                outlier_count = outlier_mask.sum()
-                
-                if outlier_count > 0:
-                    outliers[col] = {
-                        'count': int(outlier_count),
-                        'percentage': float((outlier_count / len(data)) * 100),
-                        'lower_bound': float(lower_bound),
-                        'upper_bound': float(upper_bound),
-                        'outlier_indices': data[outlier_mask].index.tolist()
-                    }
+        quantiles = backend.quantiles(columns, [0.25, 0.5, 0.75])
+        q1, median, q3 = quantiles.iloc[0], quantiles.iloc[1], quantiles.iloc[2]
+        iqr = q3 - q1
+        # Whiskers end at the most extreme values inside the 1.5 * IQR fences
+        lower_fence, upper_fence = backend.range_within(q1 - 1.5 * iqr, q3 + 1.5 * iqr)
+        summary = backend.numeric_summary(columns)
+        outlier_samples = backend.outlier_samples(lower_fence, upper_fence, self.outlier_sample_size)
+        # Histograms cover finite values; infinities are counted separately
+        histograms = backend.histograms(columns, self.histogram_bins)
+        infinite = backend.infinite_counts(columns)
         
-        return outliers
+        distributions = {}
+        for col in columns:
+            counts, edges = histograms[col]
+            distributions[col] = {
+                'min': float(summary.at['min', col]),
+                'max': float(summary.at['max', col]),
+                'mean': float(summary.at['mean', col]),
+                'q1': float(q1[col]),
+                'median': float(median[col]),
+                'q3': float(q3[col]),
+                'lower_fence': float(lower_fence[col]),
+                'upper_fence': float(upper_fence[col]),
+                'outlier_sample': outlier_samples[col].tolist(),
+                'infinite_count': {
+                    'positive': int(infinite.at['positive', col]),
+                    'negative': int(infinite.at['negative', col])
+                },
+                'histogram': {
+                    'counts': counts.tolist(),
+                    'edges': edges.tolist()
+                }
+            }
+        
+        return distributions
     
-    def _detect_categorical_issues(self, data):
-        """Detect issues in categorical columns"""
+    def _detect_categorical_issues(self, backend, frequencies):
+        """Detect issues in categorical columns from their value frequency tables"""
         issues = {}
-        categorical_cols = data.select_dtypes(include=['object']).columns
+        unique_counts = backend.distinct_counts()
         
-        for col in categorical_cols:
+        for col, col_frequencies in frequencies.items():
             col_issues = {
-                'unique_values': int(data[col].nunique()),
+                'unique_values': int(unique_counts[col]),
                 'case_issues': [],
                 'whitespace_issues': [],
-                'encoding_issues': []
+                'encoding_issues': [],
+                'value_clusters': []
             }
+            values = col_frequencies.index.to_series(index=np.arange(len(col_frequencies))).astype(str)
             
-            # Check for case inconsistencies
-            if data[col].dtype == 'object':
-                values = data[col].dropna().astype(str)
-                lower_values = values.str.lower()
-                
-                # Find potential case issues
-                value_counts = lower_values.value_counts()
-                for lower_val in value_counts.index:
-                    original_variations = values[lower_values == lower_val].unique()
-                    if len(original_variations) > 1:
-                        col_issues['case_issues'].extend(original_variations.tolist())
+            # Check for case inconsistencies: distinct spellings sharing a lowercase form
+            lower_values = values.str.lower()
+            variation_counts = lower_values.map(lower_values.value_counts())
+            if (variation_counts > 1).any():
+                group_totals = pd.Series(col_frequencies.to_numpy()).groupby(lower_values).transform('sum')
+                inconsistent = pd.DataFrame({
+                    'value': values, 'lower': lower_values, 'total': group_totals
+                })[variation_counts > 1]
+                # Most frequent groups first; spellings stay in frequency order within a group
+                inconsistent = inconsistent.sort_values(['total', 'lower'], ascending=[False, True], kind='stable')
+                col_issues['case_issues'] = inconsistent['value'].tolist()
             
             # Check for whitespace issues
-            if data[col].dtype == 'object':
-                has_leading_space = data[col].astype(str).str.startswith(' ').any()
-                has_trailing_space = data[col].astype(str).str.endswith(' ').any()
-                
-                if has_leading_space or has_trailing_space:
-                    col_issues['whitespace_issues'].append('whitespace_found')
+            if values.str.startswith(' ').any() or values.str.endswith(' ').any():
+                col_issues['whitespace_issues'].append('whitespace_found')
+            
+            # Near-duplicate labels ("New York" / "new-york" / "New Yrok")
+            col_issues['value_clusters'] = self.value_clusterer.cluster_counts(col_frequencies)
             
             if any(col_issues.values()):
                 issues[col] = col_issues
         
         return issues
     
-    def _detect_correlation_issues(self, data):
+    def _profile_patterns(self, frequencies):
+        """Character-class shapes and known formats of every text column"""
+        patterns = {}
+        for col, col_frequencies in frequencies.items():
+            col_patterns = self.pattern_profiler.profile(col_frequencies)
+            if col_patterns is not None:
+                patterns[col] = col_patterns
+        return patterns
+    
+    def _detect_correlation_issues(self, backend):
         """Detect highly correlated features"""
-        numeric_data = data.select_dtypes(include=[np.number])
+        columns = backend.numeric_columns()
         
-        if numeric_data.shape[1] < 2:
+        if len(columns) < 2:
             return {}
         
-        correlation_matrix = numeric_data.corr().abs()
+        # Wide frames are scanned block by block on a row sample so the
+        # full correlation matrix is never materialized
+        if len(columns) > self.correlation_block_size:
+            sample = backend.sample(self.correlation_sample_rows)[columns]
+            high_corr_pairs = self._blocked_correlation_pairs(sample)
+            mode = 'blocked'
+        else:
+            correlation_matrix = backend.correlations(columns, method=self.correlation_method).abs()
+            high_corr_pairs = self._extract_high_correlation_pairs(
+                correlation_matrix.to_numpy(),
+                correlation_matrix.columns,
+                correlation_matrix.columns,
+                upper_triangle=True
+            )
+            mode = 'full'
         
-        # Find pairs with correlation > 0.9
+        high_corr_pairs.sort(key=lambda x: x['correlation'], reverse=True)
+        return {
+            'high_correlation_pairs': high_corr_pairs,
+            'method': self.correlation_method,
+            'mode': mode
+        }
+    
+    def _extract_high_correlation_pairs(self, matrix, row_labels, col_labels, upper_triangle=False):
+        """Pull |r| > threshold pairs out of a correlation block with a vectorized mask"""
+        mask = np.abs(matrix) > self.correlation_threshold
+        if upper_triangle:
+            mask &= np.triu(np.ones(matrix.shape, dtype=bool), k=1)
+        
+        rows, cols = np.nonzero(mask)
+        return [
+            {
+                'feature1': row_labels[i],
+                'feature2': col_labels[j],
+                'correlation': float(abs(matrix[i, j]))
+            }
+            for i, j in zip(rows, cols)
+        ]
+    
+    def _blocked_correlation_pairs(self, numeric_data):
+        """Find highly correlated pairs in column blocks over a row sample"""
+        if len(numeric_data) > self.correlation_sample_rows:
+            numeric_data = numeric_data.sample(n=self.correlation_sample_rows, random_state=42)
+        
+        if self.correlation_method == 'spearman':
+            # Spearman is Pearson on ranks
+            numeric_data = numeric_data.rank()
+        
+        # Standardize once so each block product is a correlation block.
+        # Missing values are mean-imputed (zero after centering), which keeps
+        # the estimate close to pairwise-complete Pearson for sparse gaps.
+        values = numeric_data.to_numpy(dtype=np.float64)
+        means = np.nanmean(values, axis=0)
+        stds = np.nanstd(values, axis=0)
+        stds[stds == 0] = np.nan
+        standardized = np.nan_to_num((values - means) / stds)
+        n_rows = standardized.shape[0]
+        
+        columns = numeric_data.columns
+        block = self.correlation_block_size
         high_corr_pairs = []
-        for i in range(len(correlation_matrix.columns)):
-            for j in range(i+1, len(correlation_matrix.columns)):
-                if correlation_matrix.iloc[i, j] > 0.9:
-                    high_corr_pairs.append({
-                        'feature1': correlation_matrix.columns[i],
-                        'feature2': correlation_matrix.columns[j],
-                        'correlation': float(correlation_matrix.iloc[i, j])
-                    })
-        
-        return {'high_correlation_pairs': high_corr_pairs}
+        for start_i in range(0, len(columns), block):
+            block_i = standardized[:, start_i:start_i + block]
+            for start_j in range(start_i, len(columns), block):
+                block_j = standardized[:, start_j:start_j + block]
+                corr_block = (block_i.T @ block_j) / n_rows
+                high_corr_pairs.extend(self._extract_high_correlation_pairs(
+                    corr_block,
+                    columns[start_i:start_i + block],
+                    columns[start_j:start_j + block],
+                    upper_triangle=(start_i == start_j)
+                ))
+        
+        return high_corr_pairs
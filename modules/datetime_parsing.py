@@ -0,0 +1,300 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+
+class DateTimeParser:
+    """
+    Datetime detection, parsing and profiling for text columns.
+
+    The format is inferred once from a sample of distinct values and cached
+    per column name, so later calls (other chunks, the cleaner after the
+    profiler) parse with that exact format instead of guessing per element.
+    Fixed-width numeric formats ('%d/%m/%Y %H:%M:%S' and the like) are
+    decoded straight from the byte matrix of the strings; other formats go
+    through pd.to_datetime with the exact format. Columns with many repeated
+    values are parsed on their distinct values and broadcast back through
+    the factorized codes. Values with UTC offsets are parsed to UTC.
+    """
+
+    # Exact formats first; ISO8601 last catches mixed ISO variants
+    FORMATS = [
+        '%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M',
+        '%Y-%m-%dT%H:%M:%S%z', '%Y-%m-%d %H:%M:%S%z', '%Y-%m-%dT%H:%M:%S.%f',
+        '%Y/%m/%d', '%Y%m%d', '%d/%m/%Y', '%m/%d/%Y', '%d.%m.%Y', '%d-%m-%Y',
+        '%d/%m/%Y %H:%M', '%m/%d/%Y %H:%M', '%d/%m/%Y %H:%M:%S', '%m/%d/%Y %H:%M:%S',
+        '%d %b %Y', '%b %d, %Y', '%d-%b-%Y', '%d %B %Y', '%B %d, %Y', 'ISO8601'
+    ]
+    FIELD_WIDTHS = {'%Y': 4, '%m': 2, '%d': 2, '%H': 2, '%M': 2, '%S': 2}
+    OFFSET_PATTERN = r'(?:Z|[+-]\d{2}:?\d{2})$'
+    PARTS = ('year', 'quarter', 'month', 'day', 'weekday', 'hour', 'minute')
+
+    def __init__(self, confidence_threshold=0.8, sample_size=1000, gap_factor=10,
+                 distinct_ratio=0.5, random_state=42):
+        self.confidence_threshold = confidence_threshold  # Share of values the format must parse
+        self.sample_size = sample_size  # Distinct values tried per candidate format
+        self.gap_factor = gap_factor  # Gaps this many times the median step are reported
+        self.distinct_ratio = distinct_ratio  # Above this share of distinct values, skip factorizing
+        self.random_state = random_state
+        self._formats = {}  # column name -> inferred format
+
+    def best_format(self, sample):
+        """(format, parse rate) of the candidate parsing most of a sample of distinct strings"""
+        if len(sample) == 0 or not sample.str.contains(r'\d', regex=True).any():
+            return None, 0.0
+        best_format, best_rate = None, 0.0
+        for fmt in self.FORMATS:
+            rate = self.parse_values(sample, fmt).notna().mean()
+            if rate > best_rate:
+                best_format, best_rate = fmt, rate
+            if rate == 1.0:
+                break
+        return best_format, best_rate
+
+    def format_for(self, series):
+        """Inferred format of a column (cached by column name); None when it holds no dates"""
+        if series.name is not None and series.name in self._formats:
+            return self._formats[series.name]
+        fmt, rate = self.best_format(self._sample_distinct(series))
+        return self._remember(series.name, fmt if rate >= self.confidence_threshold else None)
+
+    def remember_format(self, column, fmt):
+        """Cache a format found elsewhere (e.g. by TypeInferencer) for a column"""
+        self._remember(column, fmt)
+
+    def parse(self, series, fmt=None):
+        """
+        Parse a column to datetime64 with its inferred (or the given)
+        format; unparseable values become NaT. A cached format that no
+        longer fits (most values fail) is re-inferred once.
+        """
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series
+        cached = fmt is None and series.name in self._formats
+        fmt = fmt or self.format_for(series)
+        if fmt is None:
+            return pd.Series(pd.NaT, index=series.index, dtype='datetime64[ns]', name=series.name)
+
+        if self._mostly_distinct(series):
+            parsed = self.parse_values(series, fmt)
+        else:
+            codes, uniques = pd.factorize(series)
+            parsed_uniques = self.parse_values(pd.Series(uniques, dtype=object).astype(str), fmt)
+            values = parsed_uniques.to_numpy()[np.maximum(codes, 0)] if len(uniques) else \
+                np.full(len(series), np.datetime64('NaT'), dtype='datetime64[ns]')
+            parsed = pd.Series(values, index=series.index, dtype=parsed_uniques.dtype).where(codes >= 0)
+        parsed.name = series.name
+
+        if cached and parsed.notna().sum() < self.confidence_threshold * series.notna().sum():
+            # The cached format no longer fits this column's values
+            del self._formats[series.name]
+            return self.parse(series)
+        return parsed
+
+    def parse_values(self, values, fmt):
+        """
+        Vectorized parse of a Series of strings with one exact format.
+        Values the fixed-width decoder rejects (unpadded fields, stray
+        whitespace, other formats) are retried with pd.to_datetime.
+        """
+        utc = '%z' in fmt or (fmt == 'ISO8601' and values.str.contains(self.OFFSET_PATTERN, regex=True).any())
+        layout = self._fixed_layout(fmt)
+        if layout is None:
+            return pd.to_datetime(values, format=fmt, errors='coerce', utc=utc)
+
+        parsed, ok = self._decode_fixed_width(values, *layout)
+        retry = ~ok & values.notna().to_numpy()
+        if retry.any():
+            parsed[retry] = self._as_ns(pd.to_datetime(
+                values[retry].astype(str).str.strip(), format=fmt, errors='coerce'
+            ).to_numpy())
+        return pd.Series(parsed, index=values.index, name=values.name)
+
+    def profile(self, series, now=None):
+        """
+        Summary of a date column: format, parse failures, min/max, future
+        dates, gaps between consecutive distinct dates and the UTC offsets
+        found in the raw text.
+        """
+        fmt = None if pd.api.types.is_datetime64_any_dtype(series) else self.format_for(series)
+        parsed = self.parse(series, fmt)
+        present = int(series.notna().sum())
+        valid = parsed.dropna()
+
+        if fmt is None:
+            timezones = {str(parsed.dt.tz or 'none'): len(valid)} if len(valid) else {}
+        elif '%z' in fmt or fmt == 'ISO8601':
+            offsets = series.astype(object).where(series.notna()).dropna().astype(str).str.strip()
+            offsets = offsets.str.extract(f'({self.OFFSET_PATTERN[:-1]})$', expand=False).fillna('none')
+            timezones = {str(offset): int(count) for offset, count in offsets.value_counts().items()}
+        else:
+            # Formats without %z cannot parse values that carry an offset
+            timezones = {'none': present} if present else {}
+
+        if now is None:
+            now = pd.Timestamp.now(tz=parsed.dt.tz)
+
+        # Gaps between consecutive distinct dates; large ones hint at missing periods
+        distinct = np.sort(valid.unique())
+        steps = pd.Series(np.diff(distinct)) if len(distinct) > 1 else None
+        median_step = steps.median() if steps is not None else None
+
+        return {
+            'format': fmt,
+            'parsed': int(len(valid)),
+            'failed_count': present - int(len(valid)),
+            'min': valid.min() if len(valid) else None,
+            'max': valid.max() if len(valid) else None,
+            'future_count': int((valid > now).sum()),
+            'timezones': timezones,
+            'mixed_timezones': len(timezones) > 1,
+            'median_gap': median_step,
+            'max_gap': steps.max() if steps is not None else None,
+            'max_gap_start': pd.Timestamp(distinct[int(steps.to_numpy().argmax())]) if steps is not None else None,
+            'large_gap_count': int((steps > median_step * self.gap_factor).sum()) if steps is not None else 0
+        }
+
+    def profile_frame(self, data, columns=None, now=None):
+        """Profile every datetime column and every text column holding dates"""
+        if columns is None:
+            columns = [
+                col for col in data.columns
+                if pd.api.types.is_datetime64_any_dtype(data[col])
+                or (self._is_text(data[col]) and self.format_for(data[col]) is not None)
+            ]
+        return {col: self.profile(data[col], now=now) for col in columns}
+
+    def to_iso(self, series, fmt=None):
+        """
+        Rewrite a date column as ISO 8601 text: date only when every value
+        is at midnight, with the UTC offset when values are tz-aware.
+        Distinct values are formatted once and broadcast.
+        """
+        parsed = self.parse(series, fmt)
+        codes, uniques = pd.factorize(parsed)
+        uniques = pd.DatetimeIndex(uniques)
+        if len(uniques) and (uniques == uniques.normalize()).all():
+            pattern = '%Y-%m-%d'
+        else:
+            pattern = '%Y-%m-%dT%H:%M:%S'
+        if uniques.tz is not None:
+            pattern += '%z'
+        formatted = np.append(uniques.strftime(pattern).to_numpy(dtype=object), None)
+        return pd.Series(formatted[codes], index=series.index, name=series.name)
+
+    def extract_parts(self, series, parts=None, fmt=None):
+        """Frame of date components ('{column}_{part}') as small nullable integers"""
+        parts = parts or ['year', 'month', 'day']
+        unknown = set(parts) - set(self.PARTS)
+        if unknown:
+            raise ValueError(f"Unknown date part(s): {sorted(unknown)}")
+        accessor = self.parse(series, fmt).dt
+        return pd.DataFrame({
+            f"{series.name}_{part}": getattr(accessor, part).astype('Int16' if part == 'year' else 'Int8')
+            for part in parts
+        }, index=series.index)
+
+    def _remember(self, column, fmt):
+        if column is not None:
+            self._formats[column] = fmt
+        return fmt
+
+    def _row_sample(self, series):
+        """Non-null values of up to 10 x sample_size random rows (drawn with replacement)"""
+        if len(series) > self.sample_size * 10:
+            rng = np.random.default_rng(self.random_state)
+            series = series.iloc[rng.integers(0, len(series), self.sample_size * 10)]
+        return series.dropna()
+
+    def _sample_distinct(self, series):
+        """Up to sample_size distinct non-null values, as stripped strings"""
+        values = pd.Series(self._row_sample(series).unique(), dtype=object).astype(str).str.strip()
+        if len(values) > self.sample_size:
+            values = values.sample(n=self.sample_size, random_state=self.random_state)
+        return values.reset_index(drop=True)
+
+    def _mostly_distinct(self, series):
+        """Whether factorizing would barely shrink the work, judged on a row sample"""
+        sample = self._row_sample(series)
+        return len(sample) > 0 and sample.nunique() / len(sample) > self.distinct_ratio
+
+    @classmethod
+    def _fixed_layout(cls, fmt):
+        """(field positions, literal positions, width) for zero-padded numeric formats, else None"""
+        fields, literals, position = {}, [], 0
+        for token in re.findall(r'%.|[^%]', fmt):
+            if token in cls.FIELD_WIDTHS:
+                fields[token] = position
+                position += cls.FIELD_WIDTHS[token]
+            elif token.startswith('%') or not token.isascii():
+                return None
+            else:
+                literals.append((position, ord(token)))
+                position += 1
+        if '%Y' not in fields:
+            return None
+        return fields, literals, position
+
+    @classmethod
+    def _decode_fixed_width(cls, values, fields, literals, width):
+        """
+        Decode fixed-width strings as a uint8 matrix: digits are read by
+        position and combined with integer arithmetic, so no string is
+        parsed in Python. Returns (datetime64[ns] array, valid mask).
+        """
+        text = values.fillna('').to_numpy(dtype=object)
+        try:
+            raw = text.astype(f'S{width + 1}')
+            ascii_text = np.ones(len(text), dtype=bool)
+        except UnicodeEncodeError:
+            # Non-ASCII values cannot be byte-decoded; blank them and leave them to the retry
+            ascii_text = ~values.fillna('').astype(str).str.contains(r'[^\x00-\x7f]', regex=True).to_numpy(dtype=bool)
+            text[~ascii_text] = ''
+            raw = text.astype(f'S{width + 1}')
+        matrix = raw.view(np.uint8).reshape(-1, width + 1)
+        ok = ascii_text & (matrix[:, width] == 0)  # Longer values spill into the extra byte
+        for position, char in literals:
+            ok &= matrix[:, position] == char
+
+        components = {}
+        for token, position in fields.items():
+            value = np.zeros(len(matrix), dtype=np.int64)
+            for column in range(position, position + cls.FIELD_WIDTHS[token]):
+                # uint8 wrap-around maps every non-digit byte above 9
+                digit = matrix[:, column] - np.uint8(ord('0'))
+                ok &= digit <= 9
+                value = value * 10 + digit
+            components[token] = value
+
+        ones = np.ones(len(matrix), dtype=np.int64)
+        month, day = components.get('%m', ones), components.get('%d', ones)
+        ok &= (month >= 1) & (month <= 12) & (day >= 1)
+        # Whole years of the datetime64[ns] range; the cast below would wrap around outside it
+        ok &= (components['%Y'] >= 1678) & (components['%Y'] <= 2261)
+        months = np.where(ok, (components['%Y'] - 1970) * 12 + month - 1, 0)
+        month_start = months.astype('datetime64[M]').astype('datetime64[D]')
+        month_end = (months + 1).astype('datetime64[M]').astype('datetime64[D]')
+        ok &= day <= (month_end - month_start).astype(np.int64)
+
+        seconds = (day - 1) * 86400
+        for token, unit, limit in (('%H', 3600, 24), ('%M', 60, 60), ('%S', 1, 60)):
+            if token in components:
+                ok &= components[token] < limit
+                seconds = seconds + components[token] * unit
+
+        parsed = (month_start.astype('datetime64[s]') + seconds.astype('timedelta64[s]')).astype('datetime64[ns]')
+        parsed[~ok] = np.datetime64('NaT')
+        return parsed, ok
+
+    @staticmethod
+    def _as_ns(values):
+        """datetime64[ns] array; values outside the nanosecond range become NaT instead of wrapping"""
+        if values.dtype == np.dtype('datetime64[ns]'):
+            return values
+        in_range = (values >= np.datetime64('1677-09-22')) & (values < np.datetime64('2262-04-11'))
+        return np.where(in_range, values, np.datetime64('NaT')).astype('datetime64[ns]')
+
+    @staticmethod
+    def _is_text(series):
+        return pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
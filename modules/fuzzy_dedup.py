@@ -0,0 +1,140 @@
+import pandas as pd
+import numpy as np
+
+from utils.row_sets import RowSet
+
+
+class FuzzyDeduplicator:
+    """
+    Near-duplicate row detection with MinHash signatures and LSH banding.
+
+    Key columns are normalized (case, whitespace) and joined into one string
+    per row. Rows with identical normalized keys collapse before any hashing,
+    signatures are built per distinct key, and only keys that collide in at
+    least one LSH band are compared. Every step is vectorized or chunked, so
+    cost grows near-linearly with row count.
+    """
+
+    MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+
+    def __init__(self, key_columns=None, similarity_threshold=0.8, num_perm=64,
+                 bands=16, shingle_size=3, max_bucket_size=1000,
+                 chunk_size=100000, random_state=42):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.key_columns = key_columns  # None means all columns
+        self.similarity_threshold = similarity_threshold  # Estimated Jaccard needed to merge
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.max_bucket_size = max_bucket_size  # Larger LSH buckets are skipped
+        self.chunk_size = chunk_size  # Distinct keys hashed per batch
+
+        rng = np.random.default_rng(random_state)
+        self._hash_a = rng.integers(1, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+        self._hash_b = rng.integers(0, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+
+    def find_clusters(self, data):
+        """
+        Detect near-duplicate rows.
+
+        Returns {'cluster_ids', 'cluster_count', 'rows_in_clusters',
+        'duplicate_rows', 'redundant_rows'} where cluster_ids holds one
+        cluster id per row (-1 for rows without a near-duplicate) and
+        redundant_rows is a RowSet of every clustered row except the first.
+        """
+        keys = self.normalize(data)
+        key_codes, unique_keys = pd.factorize(keys)
+
+        signatures = self._signatures(unique_keys)
+        left, right = self._candidate_pairs(signatures)
+        if len(left):
+            similarity = (signatures[left] == signatures[right]).mean(axis=1)
+            keep = similarity >= self.similarity_threshold
+            left, right = left[keep], right[keep]
+
+        key_clusters = self._connected_components(len(unique_keys), left, right)
+        row_clusters = key_clusters[key_codes]
+
+        # Only clusters with more than one row are reported
+        cluster_sizes = np.bincount(row_clusters)
+        clustered = cluster_sizes[row_clusters] > 1
+        cluster_ids = np.where(clustered, row_clusters, -1)
+
+        first_in_cluster = ~pd.Series(cluster_ids).duplicated().to_numpy()
+        redundant = clustered & ~first_in_cluster
+        cluster_count = int((cluster_sizes > 1).sum())
+
+        return {
+            'cluster_ids': cluster_ids,
+            'cluster_count': cluster_count,
+            'rows_in_clusters': int(clustered.sum()),
+            'duplicate_rows': int(redundant.sum()),
+            'redundant_rows': RowSet.from_mask(redundant, data.index)
+        }
+
+    def normalize(self, data):
+        """Lowercase, trim and collapse whitespace of the key columns, joined per row"""
+        columns = self.key_columns or list(data.columns)
+        normalized = None
+        for col in columns:
+            values = data[col].astype(str).where(data[col].notna(), '')
+            values = values.str.lower().str.strip().str.replace(r'\s+', ' ', regex=True)
+            normalized = values if normalized is None else normalized.str.cat(values, sep='\x1f')
+        return normalized
+
+    def _signatures(self, keys):
+        """MinHash signature matrix (distinct keys x num_perm)"""
+        signatures = np.empty((len(keys), self.num_perm), dtype=np.uint64)
+        for start in range(0, len(keys), self.chunk_size):
+            chunk = keys[start:start + self.chunk_size]
+            shingles = [self._shingles(key) for key in chunk]
+            counts = np.fromiter((len(s) for s in shingles), dtype=np.int64, count=len(shingles))
+            flat = np.array([shingle for group in shingles for shingle in group], dtype=object)
+            hashed = pd.util.hash_array(flat) & self.MERSENNE_PRIME
+            offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+            # Multiply-add hash family (wrapping, masked to 61 bits), minimized per key
+            for perm in range(self.num_perm):
+                permuted = (self._hash_a[perm] * hashed + self._hash_b[perm]) & self.MERSENNE_PRIME
+                signatures[start:start + len(chunk), perm] = np.minimum.reduceat(permuted, offsets)
+        return signatures
+
+    def _shingles(self, key):
+        size = self.shingle_size
+        if len(key) <= size:
+            return [key]
+        return list({key[i:i + size] for i in range(len(key) - size + 1)})
+
+    def _candidate_pairs(self, signatures):
+        """Key pairs that share a bucket in at least one LSH band"""
+        rows_per_band = self.num_perm // self.bands
+        positions = np.arange(len(signatures))
+        pair_frames = []
+        for band in range(self.bands):
+            band_values = signatures[:, band * rows_per_band:(band + 1) * rows_per_band]
+            buckets = pd.util.hash_pandas_object(pd.DataFrame(band_values), index=False).to_numpy()
+            band_frame = pd.DataFrame({'bucket': buckets, 'key': positions})
+            bucket_sizes = band_frame.groupby('bucket')['key'].transform('size')
+            band_frame = band_frame[(bucket_sizes > 1) & (bucket_sizes <= self.max_bucket_size)]
+            if band_frame.empty:
+                continue
+            pairs = band_frame.merge(band_frame, on='bucket', suffixes=('_left', '_right'))
+            pairs = pairs.loc[pairs['key_left'] < pairs['key_right'], ['key_left', 'key_right']]
+            pair_frames.append(pairs)
+
+        if not pair_frames:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+        pairs = pd.concat(pair_frames, ignore_index=True).drop_duplicates()
+        return pairs['key_left'].to_numpy(), pairs['key_right'].to_numpy()
+
+    def _connected_components(self, node_count, left, right):
+        from scipy.sparse import coo_matrix
+        from scipy.sparse.csgraph import connected_components
+
+        graph = coo_matrix(
+            (np.ones(len(left), dtype=np.int8), (left, right)),
+            shape=(node_count, node_count)
+        )
+        _, labels = connected_components(graph, directed=False)
+        return labels
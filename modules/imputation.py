@@ -0,0 +1,153 @@
+import pandas as pd
+import numpy as np
+
+
+class Imputer:
+    """
+    Missing value imputation engine.
+
+    Strategies:
+    - 'global': median for numeric columns, mode for the rest
+    - 'group':  median/mode within groups (e.g. per region) with a vectorized
+                groupby-transform, falling back to the global value for
+                groups that have no observed values
+    - 'knn':    mean of the k nearest complete rows over standardized numeric
+                features; non-numeric columns use the group/global mode
+    """
+
+    STRATEGIES = ('global', 'group', 'knn')
+
+    def __init__(self, strategy='global', group_by=None, n_neighbors=5,
+                 max_donors=200000, projection_dims=10, chunk_size=20000,
+                 neighbor_eps=0.5, random_state=42):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown imputation strategy: {strategy}")
+        if strategy == 'group' and not group_by:
+            raise ValueError("Group-wise imputation needs group_by columns")
+        self.strategy = strategy
+        self.group_by = [group_by] if isinstance(group_by, str) else list(group_by or [])
+        self.n_neighbors = n_neighbors
+        self.max_donors = max_donors  # Complete rows indexed for KNN (bounds memory)
+        self.projection_dims = projection_dims  # Wider feature sets are projected before indexing
+        self.chunk_size = chunk_size  # Rows queried against the index per batch
+        self.neighbor_eps = neighbor_eps  # Neighbours may be up to (1 + eps) times farther than exact
+        self.random_state = random_state
+
+    def impute(self, data, columns=None):
+        """
+        Fill missing values in place and return (data, report).
+        report: {'operations': [...], 'missing_values_handled': int, 'columns': [...]}
+        """
+        report = {"operations": [], "missing_values_handled": 0, "columns": []}
+        missing_counts = data.isna().sum()
+        columns = [
+            col for col in (columns or data.columns)
+            if missing_counts[col] > 0 and col not in self.group_by
+        ]
+        if not columns:
+            return data, report
+
+        numeric_cols = [col for col in columns if pd.api.types.is_numeric_dtype(data[col])]
+        other_cols = [col for col in columns if col not in numeric_cols]
+
+        if self.strategy == 'knn' and numeric_cols:
+            self._impute_knn(data, numeric_cols)
+            method = f"KNN (k={self.n_neighbors})"
+            remaining = []
+            for col in numeric_cols:
+                if data[col].isna().any():
+                    remaining.append(col)
+                else:
+                    self._record(report, col, missing_counts[col], method)
+            numeric_cols = remaining
+
+        if numeric_cols:
+            fill_values = data[numeric_cols].median()
+            if self.group_by:
+                group_medians = data.groupby(self.group_by, dropna=False)[numeric_cols].transform('median')
+                data[numeric_cols] = data[numeric_cols].fillna(group_medians)
+            data[numeric_cols] = data[numeric_cols].fillna(fill_values)
+            method = "group median" if self.group_by else "median"
+            for col in numeric_cols:
+                self._record(report, col, missing_counts[col], method)
+
+        for col in other_cols:
+            if self.group_by:
+                data[col] = data[col].fillna(self._group_mode(data, col))
+            mode = data[col].mode()
+            if len(mode):
+                data[col] = data[col].fillna(mode.iloc[0])
+            method = "group mode" if self.group_by else "mode"
+            self._record(report, col, missing_counts[col], method)
+
+        return data, report
+
+    def _record(self, report, col, missing_count, method):
+        report["missing_values_handled"] += int(missing_count)
+        report["columns"].append(col)
+        report["operations"].append(
+            f"Filled {missing_count} missing values in '{col}' with {method}"
+        )
+
+    def _group_mode(self, data, col):
+        """Most frequent value of `col` within each group, aligned to the rows"""
+        counts = data.groupby(self.group_by + [col], dropna=False, observed=True).size()
+        counts = counts[counts.index.get_level_values(col).notna()]
+        if counts.empty:
+            return pd.Series(np.nan, index=data.index)
+        modes = counts.sort_values(ascending=False).reset_index()
+        modes = modes.drop_duplicates(self.group_by)[self.group_by + [col]]
+        aligned = data[self.group_by].merge(modes, on=self.group_by, how='left')[col]
+        aligned.index = data.index
+        return aligned
+
+    def _impute_knn(self, data, target_cols):
+        """Average the target columns over the nearest complete rows, chunk by chunk"""
+        from scipy.spatial import cKDTree
+
+        feature_cols = list(data.select_dtypes(include=[np.number]).columns)
+        features = data[feature_cols].to_numpy(dtype=np.float64)
+        means = np.nanmean(features, axis=0)
+        stds = np.nanstd(features, axis=0)
+        stds[~(stds > 0)] = 1.0
+        # Standardize; missing features sit at the column mean (zero)
+        features = np.nan_to_num((features - means) / stds)
+
+        targets = data[target_cols].to_numpy(dtype=np.float64, copy=True)
+        complete = ~np.isnan(targets).any(axis=1)
+        donor_positions = np.flatnonzero(complete)
+        if len(donor_positions) == 0:
+            return
+
+        rng = np.random.default_rng(self.random_state)
+        if len(donor_positions) > self.max_donors:
+            donor_positions = np.sort(rng.choice(donor_positions, self.max_donors, replace=False))
+
+        projection = None
+        if features.shape[1] > self.projection_dims:
+            # Project onto the leading principal axes of a donor sample so the
+            # KD-tree stays effective (approximate neighbours)
+            sample = features[rng.choice(donor_positions, min(len(donor_positions), 10000), replace=False)]
+            _, _, components = np.linalg.svd(sample - sample.mean(axis=0), full_matrices=False)
+            projection = components[:self.projection_dims].T
+
+        def project(rows):
+            return rows if projection is None else rows @ projection
+
+        tree = cKDTree(project(features[donor_positions]))
+        donor_targets = targets[donor_positions]
+        k = min(self.n_neighbors, len(donor_positions))
+
+        incomplete = np.flatnonzero(~complete)
+        for start in range(0, len(incomplete), self.chunk_size):
+            positions = incomplete[start:start + self.chunk_size]
+            _, neighbors = tree.query(project(features[positions]), k=k, eps=self.neighbor_eps, workers=-1)
+            neighbors = neighbors.reshape(len(positions), k)
+            estimates = donor_targets[neighbors].mean(axis=1)
+            chunk = targets[positions]
+            missing = np.isnan(chunk)
+            chunk[missing] = estimates[missing]
+            targets[positions] = chunk
+
+        for position, col in enumerate(target_cols):
+            data[col] = targets[:, position]
@@ -1,12 +1,19 @@
 import os
 import json
-from openai import OpenAI
 
 
 class InstructionParser:
 
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self._client = None
+
+    @property
+    def client(self):
+        """OpenAI client, created (and openai imported) on first use"""
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return self._client
 
     def extract_commands(self, instruction_text, columns):
 
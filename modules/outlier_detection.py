@@ -0,0 +1,134 @@
+import pandas as pd
+import numpy as np
+
+from utils.row_sets import RowSet
+
+
+class OutlierDetector:
+    """Vectorized multi-method outlier detection over the numeric block"""
+
+    METHODS = ('iqr', 'zscore', 'modified_zscore', 'percentile')
+
+    def __init__(self, default_method='iqr', column_methods=None,
+                 iqr_multiplier=1.5, zscore_threshold=3.0,
+                 modified_zscore_threshold=3.5, percentile_range=(0.01, 0.99)):
+        if default_method not in self.METHODS:
+            raise ValueError(f"Unknown outlier method: {default_method}")
+        self.default_method = default_method
+        self.column_methods = column_methods or {}  # {column: method}
+        self.iqr_multiplier = iqr_multiplier
+        self.zscore_threshold = zscore_threshold
+        self.modified_zscore_threshold = modified_zscore_threshold
+        self.percentile_range = percentile_range
+
+    def detect(self, data):
+        """
+        Detect outliers in every numeric column in a single pass.
+
+        Returns (outliers, flags) where outliers maps column -> summary for
+        columns with at least one outlier, and flags holds the per-row
+        outlier matrix packed to one bit per cell.
+        """
+        numeric_data = data.select_dtypes(include=[np.number])
+        numeric_data = numeric_data.loc[:, numeric_data.notna().any()]  # Skip all-NaN columns
+
+        if numeric_data.shape[1] == 0:
+            return {}, self._pack_flags(np.zeros((len(data), 0), dtype=bool), [], data.index)
+
+        methods = self._methods(numeric_data.columns)
+        lower_bound, upper_bound = self._compute_bounds(numeric_data, methods)
+
+        # Broadcast the bound vectors across the whole block; NaN never flags
+        values = numeric_data.to_numpy(dtype=np.float64)
+        mask = (values < lower_bound.to_numpy()) | (values > upper_bound.to_numpy())
+
+        counts = mask.sum(axis=0)
+        row_count = len(data)
+        outliers = {}
+        for position, col in enumerate(numeric_data.columns):
+            if counts[position] > 0:
+                outliers[col] = {
+                    'count': int(counts[position]),
+                    'percentage': float((counts[position] / row_count) * 100),
+                    'method': methods[col],
+                    'lower_bound': float(lower_bound[col]),
+                    'upper_bound': float(upper_bound[col]),
+                    'outlier_indices': RowSet.from_mask(mask[:, position], data.index)
+                }
+
+        return outliers, self._pack_flags(mask, list(numeric_data.columns), data.index)
+
+    def bounds(self, numeric_data):
+        """
+        (lower, upper) bound Series for every column of a numeric frame, e.g.
+        a sample whose bounds are applied to data that is not in memory.
+        """
+        return self._compute_bounds(numeric_data, self._methods(numeric_data.columns))
+
+    def _methods(self, columns):
+        methods = pd.Series(
+            [self.column_methods.get(col, self.default_method) for col in columns],
+            index=columns
+        )
+        unknown = set(methods) - set(self.METHODS)
+        if unknown:
+            raise ValueError(f"Unknown outlier method(s): {sorted(unknown)}")
+        return methods
+
+    def _compute_bounds(self, numeric_data, methods):
+        """Compute lower/upper bounds for every column from block-level statistics"""
+        low_pct, high_pct = self.percentile_range
+        quantiles = numeric_data.quantile([0.25, 0.5, 0.75, low_pct, high_pct])
+        q1 = quantiles.iloc[0]
+        median = quantiles.iloc[1]
+        q3 = quantiles.iloc[2]
+
+        lower_bound = pd.Series(np.nan, index=numeric_data.columns)
+        upper_bound = pd.Series(np.nan, index=numeric_data.columns)
+
+        selected = methods == 'iqr'
+        if selected.any():
+            iqr = q3 - q1
+            lower_bound[selected] = (q1 - self.iqr_multiplier * iqr)[selected]
+            upper_bound[selected] = (q3 + self.iqr_multiplier * iqr)[selected]
+
+        selected = methods == 'zscore'
+        if selected.any():
+            block = numeric_data.loc[:, selected]
+            mean = block.mean()
+            std = block.std()
+            lower_bound[selected] = mean - self.zscore_threshold * std
+            upper_bound[selected] = mean + self.zscore_threshold * std
+
+        selected = methods == 'modified_zscore'
+        if selected.any():
+            block = numeric_data.loc[:, selected]
+            block_median = median[selected]
+            mad = (block - block_median).abs().median()
+            # 0.6745 rescales MAD to the standard deviation of a normal distribution
+            spread = self.modified_zscore_threshold * mad / 0.6745
+            lower_bound[selected] = block_median - spread
+            upper_bound[selected] = block_median + spread
+
+        selected = methods == 'percentile'
+        if selected.any():
+            lower_bound[selected] = quantiles.iloc[3][selected]
+            upper_bound[selected] = quantiles.iloc[4][selected]
+
+        return lower_bound, upper_bound
+
+    def _pack_flags(self, mask, columns, index):
+        """Pack a rows x columns boolean mask to one bit per cell"""
+        return {
+            'columns': columns,
+            'row_count': int(mask.shape[0]),
+            'packed': np.packbits(mask, axis=1),
+            'any_outlier': RowSet.from_mask(mask.any(axis=1), index)
+        }
+
+    @staticmethod
+    def unpack_flags(flags):
+        """Expand packed outlier flags back to a boolean rows x columns matrix"""
+        return np.unpackbits(
+            flags['packed'], axis=1, count=len(flags['columns'])
+        ).astype(bool)
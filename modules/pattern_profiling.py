@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+from modules.rule_validation import fullmatch_all
+
+
+class _CharClasses(dict):
+    """str.translate table mapping any character to its class, filled on first use"""
+
+    def __missing__(self, code):
+        char = chr(code)
+        if char.isdigit():
+            mapped = '9'
+        elif char.isalpha():
+            mapped = 'A' if char.isupper() else 'a'
+        elif char.isspace():
+            mapped = ' '
+        else:
+            mapped = char
+        self[code] = mapped
+        return mapped
+
+
+class PatternProfiler:
+    """
+    Shape profiling of text columns.
+
+    Every distinct value is reduced to a character-class mask (upper case
+    letters -> 'A', lower case -> 'a', digits -> '9', whitespace -> ' ',
+    punctuation kept), e.g. 'AB-1234' -> 'AA-9999', and masks are weighted
+    by the value counts. Values are also tested against a library of known
+    formats fused into one regex, matched once per column. Both work on a
+    value frequency table, so the cost grows with the number of distinct
+    values rather than the number of rows.
+    """
+
+    KNOWN_FORMATS = {
+        'email': r"[A-Za-z0-9._%+'-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}",
+        'url': r"(?:https?|ftp)://[^\s/$.?#][^\s]*",
+        'uuid': r"[0-9A-Fa-f]{8}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{12}",
+        'ipv4': r"(?:(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)\.){3}(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)",
+        # E.164, or groups split by separators (plain digit runs are left to 'integer')
+        'phone': r"\+\d{7,15}|\+?(?:\d{1,3}[ .-])?\(?\d{2,4}\)?[ .-]?\d{3,4}[ .-]\d{3,4}",
+        'us_zip': r"\d{5}(?:-\d{4})?",
+        'uk_postcode': r"[A-Za-z]{1,2}\d[A-Za-z\d]? ?\d[A-Za-z]{2}",
+        'iso_date': r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?",
+        'hex_color': r"#(?:[0-9A-Fa-f]{3}){1,2}",
+        'integer': r"[+-]?\d+",
+        'decimal': r"[+-]?\d*[.,]\d+",
+    }
+
+    def __init__(self, max_patterns=10, max_examples=3, min_format_share=0.0,
+                 max_mask_length=64, formats=None):
+        self.max_patterns = max_patterns  # Most frequent masks reported per column
+        self.max_examples = max_examples  # Sample values shown per mask
+        self.min_format_share = min_format_share  # Known formats below this share of rows are omitted
+        self.max_mask_length = max_mask_length  # Longer values are truncated (mask ends with '…')
+        self.formats = dict(self.KNOWN_FORMATS if formats is None else formats)
+        self._char_classes = _CharClasses()
+
+    def profile(self, frequencies):
+        """
+        Profile one column from its value frequency table (distinct values
+        -> row counts). Returns {'rows', 'distinct_patterns', 'patterns',
+        'formats', 'dominant_format', 'dominant_pattern_share'}; each
+        pattern holds its mask, row count, percentage and example values.
+        """
+        values = pd.Series(frequencies.index, dtype=object).astype(str)
+        counts = pd.Series(frequencies.to_numpy(dtype=np.int64))
+        rows = int(counts.sum())
+        if rows == 0:
+            return None
+
+        masks = self.masks(values)
+        pattern_rows = counts.groupby(masks.to_numpy(), sort=False).sum().sort_values(ascending=False, kind='stable')
+        top = pattern_rows.head(self.max_patterns)
+        # Examples are the most frequent values of each mask
+        examples = values.groupby(masks.to_numpy(), sort=False).head(self.max_examples)
+        examples_by_mask = examples.groupby(masks[examples.index].to_numpy(), sort=False).agg(list)
+
+        patterns = [
+            {
+                'pattern': mask,
+                'count': int(count),
+                'percentage': float(count / rows * 100),
+                'examples': examples_by_mask[mask]
+            }
+            for mask, count in top.items()
+        ]
+
+        formats = {}
+        for name, matched in fullmatch_all(values, self.formats).items():
+            count = int(counts[matched].sum())
+            if count and count / rows >= self.min_format_share:
+                formats[name] = {'count': count, 'percentage': float(count / rows * 100)}
+        dominant = max(formats, key=lambda name: formats[name]['count']) if formats else None
+
+        return {
+            'rows': rows,
+            'distinct_patterns': int(len(pattern_rows)),
+            'patterns': patterns,
+            'formats': formats,
+            'dominant_format': dominant,
+            'dominant_pattern_share': patterns[0]['percentage']
+        }
+
+    def masks(self, values):
+        """Character-class mask of every value in a Series of strings"""
+        masks = values.str.slice(0, self.max_mask_length).str.translate(self._char_classes)
+        long_values = (values.str.len() > self.max_mask_length).to_numpy()
+        if long_values.any():
+            masks[long_values] = masks[long_values] + '…'
+        return masks
+
+    @staticmethod
+    def summary(profile):
+        """One-line shape summary, e.g. "AA-9999 92%, 9999-AA 8%" """
+        return ", ".join(f"{pattern['pattern']} {pattern['percentage']:.0f}%" for pattern in profile['patterns'])
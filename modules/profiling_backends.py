@@ -0,0 +1,384 @@
+import os
+
+import pandas as pd
+import numpy as np
+
+from utils.memory_accounting import memory_accountant
+
+
+class PandasBackend:
+    """
+    Profile primitives on an in-memory DataFrame (the default backend).
+
+    Every backend answers the same questions (null counts, distinct counts,
+    quantiles, duplicates, value frequencies, correlations, ...) with pandas
+    objects keyed by column name, so DataProfiler builds one result schema
+    regardless of where the data lives.
+    """
+
+    def __init__(self, data):
+        self.data = data
+
+    def frame(self):
+        """The full DataFrame, or None when the data is not held in memory"""
+        return self.data
+
+    def row_count(self):
+        return len(self.data)
+
+    def columns(self):
+        return list(self.data.columns)
+
+    def dtypes(self):
+        return {col: str(dtype) for col, dtype in self.data.dtypes.items()}
+
+    def text_columns(self):
+        return list(self.data.select_dtypes(include=['object', 'string']).columns)
+
+    def numeric_columns(self):
+        """Numeric columns with at least one non-null value"""
+        numeric_data = self.data.select_dtypes(include=[np.number])
+        return list(numeric_data.columns[numeric_data.notna().any()])
+
+    def memory_bytes(self):
+        return memory_accountant.total_bytes(self.data)
+
+    def null_counts(self):
+        return self.data.isnull().sum()
+
+    def distinct_counts(self):
+        return self.data.nunique()
+
+    def duplicate_mask(self):
+        return self.data.duplicated()
+
+    def duplicate_count(self):
+        return int(self.duplicate_mask().sum())
+
+    def numeric_summary(self, columns):
+        """DataFrame with min/max/mean/integral rows per column"""
+        numeric_data = self.data[columns]
+        values = numeric_data.to_numpy(dtype=np.float64, na_value=np.nan)
+        return pd.DataFrame(
+            [numeric_data.min(), numeric_data.max(), numeric_data.mean(),
+             pd.Series((values == np.floor(values)).all(axis=0), index=columns)],
+            index=['min', 'max', 'mean', 'integral']
+        )
+
+    def quantiles(self, columns, qs):
+        return self.data[columns].quantile(qs)
+
+    def range_within(self, lower, upper):
+        """Per-column min/max of the values inside [lower, upper] (box-plot whiskers)"""
+        numeric_data = self.data[list(lower.index)]
+        return (numeric_data.where(numeric_data >= lower).min(),
+                numeric_data.where(numeric_data <= upper).max())
+
+    def count_outside(self, lower, upper):
+        numeric_data = self.data[list(lower.index)]
+        return ((numeric_data < lower) | (numeric_data > upper)).sum()
+
+    def outlier_samples(self, lower, upper, size, random_state=42):
+        """Up to `size` values per column outside [lower, upper]"""
+        rng = np.random.default_rng(random_state)
+        samples = {}
+        for col in lower.index:
+            values = self.data[col].dropna().to_numpy(dtype=np.float64)
+            outside = values[(values < lower[col]) | (values > upper[col])]
+            if len(outside) > size:
+                outside = rng.choice(outside, size=size, replace=False)
+            samples[col] = outside
+        return samples
+
+    def histograms(self, columns, bins):
+        """{column: (counts, edges)} with np.histogram semantics, over the finite values"""
+        histograms = {}
+        for col in columns:
+            values = self.data[col].dropna().to_numpy(dtype=np.float64)
+            histograms[col] = np.histogram(values[np.isfinite(values)], bins=bins)
+        return histograms
+
+    def infinite_counts(self, columns):
+        """Per-column counts of +inf and -inf values"""
+        values = self.data[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        return pd.DataFrame(
+            [(values == np.inf).sum(axis=0), (values == -np.inf).sum(axis=0)],
+            index=['positive', 'negative'], columns=columns
+        )
+
+    def value_frequencies(self, column, limit=None):
+        """Counts of the distinct non-null values as strings, most frequent first"""
+        counts = self.data[column].dropna().astype(str).value_counts()
+        return counts if limit is None else counts.head(limit)
+
+    def correlations(self, columns, method='pearson'):
+        return self.data[columns].corr(method=method)
+
+    def sample(self, n_rows, random_state=42):
+        if len(self.data) <= n_rows:
+            return self.data
+        return self.data.sample(n=n_rows, random_state=random_state)
+
+
+class DuckDBBackend:
+    """
+    Profile primitives pushed down to DuckDB.
+
+    CSV and Parquet files are queried in place, so files larger than memory
+    can be profiled with DuckDB's multithreaded, vectorized execution.
+    Distinct counts use HyperLogLog (approx_count_distinct) and histogram
+    edges follow np.histogram, so results share PandasBackend's schema.
+    """
+
+    TYPE_NAMES = {
+        'TINYINT': 'int8', 'SMALLINT': 'int16', 'INTEGER': 'int32', 'BIGINT': 'int64',
+        'HUGEINT': 'int64', 'UTINYINT': 'uint8', 'USMALLINT': 'uint16', 'UINTEGER': 'uint32',
+        'UBIGINT': 'uint64', 'FLOAT': 'float32', 'DOUBLE': 'float64', 'BOOLEAN': 'bool',
+        'VARCHAR': 'object', 'DATE': 'datetime64[ns]', 'TIMESTAMP': 'datetime64[ns]'
+    }
+    INTEGER_TYPES = {'TINYINT', 'SMALLINT', 'INTEGER', 'BIGINT', 'HUGEINT',
+                     'UTINYINT', 'USMALLINT', 'UINTEGER', 'UBIGINT'}
+    NUMERIC_TYPES = INTEGER_TYPES | {'FLOAT', 'DOUBLE'}
+
+    def __init__(self, source, threads=None, max_frequency_values=1000000):
+        import duckdb
+
+        self.source = source
+        self.max_frequency_values = max_frequency_values  # Cap on distinct values fetched per column
+        self.connection = duckdb.connect()
+        if threads:
+            self.connection.execute(f"SET threads TO {int(threads)}")
+
+        if isinstance(source, pd.DataFrame):
+            self.connection.register('source_frame', source)
+            self.relation = 'source_frame'
+        elif str(source).endswith('.parquet'):
+            self.relation = f"read_parquet({self._literal(source)})"
+        else:
+            self.relation = f"read_csv_auto({self._literal(source)})"
+
+        described = self._query(f"DESCRIBE SELECT * FROM {self.relation}")
+        self._types = dict(zip(described['column_name'], described['column_type']))
+        self._row_count = None
+        self._cache = {}  # Full-scan aggregates reused across profile sections
+
+    def frame(self):
+        return None
+
+    def row_count(self):
+        if self._row_count is None:
+            self._row_count = int(self._scalar(f"SELECT count(*) FROM {self.relation}"))
+        return self._row_count
+
+    def columns(self):
+        return list(self._types)
+
+    def dtypes(self):
+        # pandas-style dtype names, so dtype-based checks read the same for both backends
+        return {
+            col: 'float64' if sql_type.startswith('DECIMAL')
+            else self.TYPE_NAMES.get(sql_type.split('(')[0], sql_type.lower())
+            for col, sql_type in self._types.items()
+        }
+
+    def text_columns(self):
+        return [col for col, sql_type in self._types.items() if sql_type == 'VARCHAR']
+
+    def numeric_columns(self):
+        candidates = [col for col, sql_type in self._types.items()
+                      if sql_type.split('(')[0] in self.NUMERIC_TYPES or sql_type.startswith('DECIMAL')]
+        null_counts = self.null_counts()
+        return [col for col in candidates if null_counts[col] < self.row_count()]
+
+    def memory_bytes(self):
+        """On-disk size of the source; the data is never loaded as a whole"""
+        if isinstance(self.source, pd.DataFrame):
+            return memory_accountant.total_bytes(self.source)
+        return os.path.getsize(self.source)
+
+    def null_counts(self):
+        if 'null_counts' not in self._cache:
+            self._cache['null_counts'] = self._aggregate(
+                self.columns(), "count(*) - count({col})").astype(np.int64)
+        return self._cache['null_counts']
+
+    def distinct_counts(self):
+        if 'distinct_counts' not in self._cache:
+            self._cache['distinct_counts'] = self._aggregate(
+                self.columns(), "approx_count_distinct({col})").astype(np.int64)
+        return self._cache['distinct_counts']
+
+    def duplicate_mask(self):
+        return None
+
+    def duplicate_count(self):
+        distinct_rows = self._scalar(f"SELECT count(*) FROM (SELECT DISTINCT * FROM {self.relation})")
+        return self.row_count() - int(distinct_rows)
+
+    def numeric_summary(self, columns):
+        summary = {}
+        for stat, template in (('min', "min({col})"), ('max', "max({col})"), ('mean', "avg({col})"),
+                               ('integral', "bool_and(coalesce({col} = floor({col}), false))")):
+            summary[stat] = self._aggregate(columns, template)
+        return pd.DataFrame(summary).T
+
+    def quantiles(self, columns, qs):
+        qs = list(qs)
+        selects = ", ".join(
+            f"quantile_cont({self._ident(col)}, {self._list_literal(qs)})" for col in columns
+        )
+        row = self.connection.execute(f"SELECT {selects} FROM {self.relation}").fetchone()
+        return pd.DataFrame(
+            {col: [np.nan] * len(qs) if values is None else values for col, values in zip(columns, row)},
+            index=qs
+        ).astype(np.float64)
+
+    def range_within(self, lower, upper):
+        columns = list(lower.index)
+        minimums = self._aggregate(columns, "min({col}) FILTER (WHERE {col} >= {lower})", lower=lower)
+        maximums = self._aggregate(columns, "max({col}) FILTER (WHERE {col} <= {upper})", upper=upper)
+        return minimums, maximums
+
+    def count_outside(self, lower, upper):
+        return self._aggregate(
+            list(lower.index), "count(*) FILTER (WHERE {col} < {lower} OR {col} > {upper})",
+            lower=lower, upper=upper
+        ).astype(np.int64)
+
+    def outlier_samples(self, lower, upper, size, random_state=42):
+        samples = {}
+        for col in lower.index:
+            ident = self._ident(col)
+            # USING SAMPLE applies to the FROM relation before WHERE, so the
+            # filter runs in a subquery and the sample is drawn from its result
+            values = self._query(
+                f"SELECT value FROM ("
+                f"SELECT {ident} AS value FROM {self.relation} "
+                f"WHERE {ident} < {self._float(lower[col])} OR {ident} > {self._float(upper[col])}"
+                f") USING SAMPLE reservoir({int(size)} ROWS) REPEATABLE ({int(random_state)})"
+            )['value']
+            samples[col] = values.to_numpy(dtype=np.float64)
+        return samples
+
+    def histograms(self, columns, bins):
+        histograms = {}
+        for col in columns:
+            ident = self._ident(col)
+            bounds = self._query(
+                f"SELECT min({ident}) AS low, max({ident}) AS high FROM {self.relation} "
+                f"WHERE isfinite(CAST({ident} AS DOUBLE))"
+            )
+            low, high = float(bounds.at[0, 'low']), float(bounds.at[0, 'high'])
+            if np.isnan(low):
+                histograms[col] = (np.zeros(bins, dtype=np.int64), np.linspace(0.0, 1.0, bins + 1))
+                continue
+            if low == high:
+                low, high = low - 0.5, high + 0.5
+            edges = np.linspace(low, high, bins + 1)
+            width = (high - low) / bins
+            buckets = self._query(
+                f"SELECT least(CAST(floor(({ident} - {low!r}) / {width!r}) AS BIGINT), {bins - 1}) AS bucket, "
+                f"count(*) AS n FROM {self.relation} WHERE isfinite(CAST({ident} AS DOUBLE)) GROUP BY bucket"
+            )
+            counts = np.zeros(bins, dtype=np.int64)
+            counts[buckets['bucket'].to_numpy(dtype=np.int64)] = buckets['n'].to_numpy(dtype=np.int64)
+            histograms[col] = (counts, edges)
+        return histograms
+
+    def infinite_counts(self, columns):
+        return pd.DataFrame({
+            'positive': self._aggregate(columns, "count(*) FILTER (WHERE CAST({col} AS DOUBLE) = 'inf'::DOUBLE)"),
+            'negative': self._aggregate(columns, "count(*) FILTER (WHERE CAST({col} AS DOUBLE) = '-inf'::DOUBLE)")
+        }).T.astype(np.int64)
+
+    def value_frequencies(self, column, limit=None):
+        limit = min(limit or self.max_frequency_values, self.max_frequency_values)
+        ident = self._ident(column)
+        frequencies = self._query(
+            f"SELECT CAST({ident} AS VARCHAR) AS value, count(*) AS n FROM {self.relation} "
+            f"WHERE {ident} IS NOT NULL GROUP BY 1 ORDER BY n DESC LIMIT {int(limit)}"
+        )
+        return pd.Series(frequencies['n'].to_numpy(), index=frequencies['value'].astype(object), name='count')
+
+    def correlations(self, columns, method='pearson'):
+        relation = self.relation
+        if method == 'spearman':
+            # Spearman is Pearson on ranks; ties get the average of their
+            # lowest (ascending rank) and highest (count - descending rank + 1) rank
+            ranks = ", ".join(
+                "CASE WHEN {c} IS NULL THEN NULL ELSE "
+                "(rank() OVER (ORDER BY {c} NULLS LAST) + count({c}) OVER () + 1 "
+                "- rank() OVER (ORDER BY {c} DESC NULLS LAST)) / 2.0 END AS {c}".format(c=self._ident(col))
+                for col in columns
+            )
+            relation = f"(SELECT {ranks} FROM {self.relation})"
+
+        pairs = [(i, j) for i in range(len(columns)) for j in range(i + 1, len(columns))]
+        matrix = np.eye(len(columns))
+        if pairs:
+            selects = ", ".join(
+                f"corr({self._ident(columns[i])}, {self._ident(columns[j])})" for i, j in pairs
+            )
+            row = self.connection.execute(f"SELECT {selects} FROM {relation}").fetchone()
+            for (i, j), value in zip(pairs, row):
+                matrix[i, j] = matrix[j, i] = np.nan if value is None else value
+        return pd.DataFrame(matrix, index=columns, columns=columns)
+
+    def sample(self, n_rows, random_state=42):
+        return self._query(
+            f"SELECT * FROM {self.relation} USING SAMPLE reservoir({int(n_rows)} ROWS) "
+            f"REPEATABLE ({int(random_state)})"
+        )
+
+    def _aggregate(self, columns, template, **bounds):
+        """One scan computing `template` for every column; returns a Series"""
+        if not columns:
+            return pd.Series(dtype=np.float64)
+        selects = []
+        for col in columns:
+            values = {name: self._float(series[col]) for name, series in bounds.items()}
+            selects.append(template.format(col=self._ident(col), **values))
+        row = self.connection.execute(f"SELECT {', '.join(selects)} FROM {self.relation}").fetchone()
+        return pd.Series([np.nan if value is None else value for value in row], index=columns)
+
+    def _query(self, sql):
+        return self.connection.execute(sql).df()
+
+    def _scalar(self, sql):
+        return self.connection.execute(sql).fetchone()[0]
+
+    @staticmethod
+    def _ident(name):
+        return '"' + str(name).replace('"', '""') + '"'
+
+    @staticmethod
+    def _literal(value):
+        return "'" + str(value).replace("'", "''") + "'"
+
+    @staticmethod
+    def _float(value):
+        """SQL literal of a bound; NaN becomes NULL so comparisons with it never match"""
+        value = float(value)
+        if np.isnan(value):
+            return "CAST(NULL AS DOUBLE)"
+        return repr(value) if np.isfinite(value) else ("'inf'::DOUBLE" if value > 0 else "'-inf'::DOUBLE")
+
+    @staticmethod
+    def _list_literal(values):
+        return "[" + ", ".join(repr(float(value)) for value in values) + "]"
+
+
+def make_backend(source, backend='pandas', **options):
+    """
+    Backend for a DataFrame or a CSV/Parquet path. Paths are loaded into
+    pandas for the pandas backend and queried in place by DuckDB.
+    """
+    if backend == 'duckdb':
+        return DuckDBBackend(source, **options)
+    if backend != 'pandas':
+        raise ValueError(f"Unknown profiling backend: {backend}")
+    if isinstance(source, pd.DataFrame):
+        return PandasBackend(source)
+    if str(source).endswith('.parquet'):
+        return PandasBackend(pd.read_parquet(source))
+    return PandasBackend(pd.read_csv(source))
@@ -2,6 +2,8 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 
+from utils.memory_accounting import memory_accountant
+
 
 class ReportGenerator:
     """Generate comprehensive cleaning reports"""
@@ -9,8 +11,14 @@ class ReportGenerator:
     def __init__(self):
         pass
 
-    def generate_report(self, original_data, cleaned_data, cleaning_report):
-        """Generate comprehensive cleaning report"""
+    def generate_report(self, original_data, cleaned_data, cleaning_report, original_profile=None):
+        """
+        Generate comprehensive cleaning report.
+
+        Statistics are taken from the stored profile of the original data and
+        the "final_stats" recorded by DataCleaner; the frames are only
+        scanned as a fallback when those are missing.
+        """
 
         # Safe extraction (prevents KeyError)
         missing_values_handled = cleaning_report.get("missing_values_handled", 0)
@@ -21,25 +29,33 @@ class ReportGenerator:
             cleaning_report.get("operations", [])
         )
 
+        original_stats = self._stats_from_profile(original_profile)
+        if original_stats is None:
+            original_stats = self._compute_stats(original_data)
+        final_stats = cleaning_report.get("final_stats") or self._compute_stats(cleaned_data)
+
         # Quality score
-        original_quality = self._calculate_quality_score(original_data)
-        final_quality = self._calculate_quality_score(cleaned_data)
+        original_quality = self._quality_score_from_stats(original_stats)
+        final_quality = self._quality_score_from_stats(final_stats)
         quality_improvement = final_quality - original_quality
 
         # Memory usage
-        original_memory = original_data.memory_usage(deep=True).sum() / 1024**2
-        final_memory = cleaned_data.memory_usage(deep=True).sum() / 1024**2
+        original_memory = original_stats["memory_bytes"] / 1024**2
+        final_memory = final_stats["memory_bytes"] / 1024**2
 
         memory_reduction = 0
         if original_memory > 0:
             memory_reduction = ((original_memory - final_memory) / original_memory) * 100
 
+        original_shape = tuple(original_stats["shape"])
+        final_shape = tuple(final_stats["shape"])
+
         report = {
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "original_shape": original_data.shape,
-            "final_shape": cleaned_data.shape,
-            "rows_removed": original_data.shape[0] - cleaned_data.shape[0],
-            "columns_removed": original_data.shape[1] - cleaned_data.shape[1],
+            "original_shape": original_shape,
+            "final_shape": final_shape,
+            "rows_removed": original_shape[0] - final_shape[0],
+            "columns_removed": original_shape[1] - final_shape[1],
             "missing_values_handled": missing_values_handled,
             "duplicates_removed": duplicates_removed,
             "outliers_handled": outliers_handled,
@@ -58,17 +74,46 @@ class ReportGenerator:
 
         return report
 
-    def _calculate_quality_score(self, data):
-        """Simple quality score"""
-        if data.empty:
-            return 0.0
+    def _stats_from_profile(self, profile):
+        """Reuse the statistics DataProfiler already computed"""
+        if not profile or "basic_info" not in profile:
+            return None
+        basic_info = profile["basic_info"]
+        return {
+            "shape": basic_info["shape"],
+            "missing_cells": profile["missing_values"]["total_missing"],
+            "duplicate_rows": profile["duplicates"]["count"],
+            "memory_bytes": int(basic_info["memory_usage"]),
+        }
 
-        total_cells = data.shape[0] * data.shape[1]
-        missing_cells = data.isnull().sum().sum()
-        duplicate_rows = data.duplicated().sum()
+    def _compute_stats(self, data):
+        """Fallback scan when no stored statistics are available"""
+        return {
+            "shape": data.shape,
+            "missing_cells": int(data.isnull().sum().sum()),
+            "duplicate_rows": int(data.duplicated().sum()),
+            "memory_bytes": memory_accountant.total_bytes(data),
+        }
+
+    def _quality_score_from_stats(self, stats):
+        """Simple quality score from missing/duplicate counts"""
+        rows, cols = stats["shape"]
+        if rows == 0 or cols == 0:
+            return 0.0
 
-        missing_penalty = (missing_cells / total_cells) * 100
-        duplicate_penalty = (duplicate_rows / data.shape[0]) * 10 if data.shape[0] > 0 else 0
+        missing_penalty = (stats["missing_cells"] / (rows * cols)) * 100
+        duplicate_penalty = (stats["duplicate_rows"] / rows) * 10
 
         quality_score = 100 - missing_penalty - duplicate_penalty
         return max(0, min(100, quality_score))
+
+    def _calculate_quality_score(self, data):
+        """Simple quality score"""
+        if data.empty:
+            return 0.0
+
+        return self._quality_score_from_stats({
+            "shape": data.shape,
+            "missing_cells": data.isnull().sum().sum(),
+            "duplicate_rows": data.duplicated().sum(),
+        })
@@ -0,0 +1,254 @@
+import operator
+import re
+
+import numpy as np
+import pandas as pd
+
+from utils.row_sets import RowSet
+
+
+class RuleValidator:
+    """
+    Declarative domain rules compiled into vectorized checks.
+
+    Rules are dicts:
+        {'type': 'range', 'column': 'age', 'min': 0, 'max': 120}
+        {'type': 'compare', 'left': 'end_date', 'op': '>=', 'right': 'start_date'}
+        {'type': 'in_set', 'column': 'country', 'values': [...], 'case_sensitive': True}
+        {'type': 'regex', 'column': 'email', 'pattern': r'[^@\\s]+@[^@\\s]+'}
+    Every rule takes an optional 'name' and 'allow_missing' (default True;
+    when False a missing value is a violation).
+
+    Rules are grouped by column so each column is factorized and converted
+    once. Set and pattern rules run on the distinct values only and are
+    broadcast back through the codes; all regex rules of a column are fused
+    into one anchored pattern of optional lookaheads and matched in a
+    single pass. Patterns with their own named groups or backreferences
+    are matched separately.
+    """
+
+    TYPES = ('range', 'compare', 'in_set', 'regex')
+    OPERATORS = {
+        '>=': operator.ge, '>': operator.gt, '<=': operator.le,
+        '<': operator.lt, '==': operator.eq, '!=': operator.ne
+    }
+
+    def __init__(self, rules):
+        self.rules = [self._compile(rule) for rule in rules]
+        names = [rule['name'] for rule in self.rules]
+        if len(set(names)) != len(names):
+            raise ValueError("Validation rule names must be unique")
+
+    def _compile(self, rule):
+        rule_type = rule.get('type')
+        if rule_type not in self.TYPES:
+            raise ValueError(f"Unknown validation rule type: {rule_type}")
+        compiled = dict(rule)
+        compiled.setdefault('allow_missing', True)
+
+        if rule_type == 'compare':
+            if rule.get('op') not in self.OPERATORS:
+                raise ValueError(f"Unknown comparison operator: {rule.get('op')}")
+            compiled['columns'] = [rule['left'], rule['right']]
+            default_name = f"{rule['left']} {rule['op']} {rule['right']}"
+        else:
+            compiled['columns'] = [rule['column']]
+            if rule_type == 'range':
+                if rule.get('min') is None and rule.get('max') is None:
+                    raise ValueError(f"Range rule on '{rule['column']}' needs a min or a max")
+                default_name = f"{rule['column']} between {rule.get('min', '-inf')} and {rule.get('max', 'inf')}"
+            elif rule_type == 'in_set':
+                compiled['values'] = list(rule['values'])
+                default_name = f"{rule['column']} in reference set"
+            else:
+                # Fails early on an invalid pattern, before it is fused with others
+                compiled['regex'] = re.compile(rule['pattern'])
+                default_name = f"{rule['column']} matches {rule['pattern']}"
+
+        compiled.setdefault('name', default_name)
+        return compiled
+
+    def validate(self, data):
+        """
+        Evaluate every rule. Returns {'rules': {name: result}, 'skipped',
+        'total_violations', 'invalid_rows', 'invalid_row_count'} where each
+        result holds the violation count, percentage and a RowSet of the
+        violating rows, and invalid_rows is the union over all rules.
+        """
+        row_count = len(data)
+        comparable_cache = {}
+        results = {}
+        skipped = []
+
+        for column, column_rules in self._column_groups():
+            if column not in data.columns:
+                skipped.extend(rule['name'] for rule in column_rules)
+                continue
+            violations = self._validate_column(data[column], column_rules, comparable_cache)
+            for rule in column_rules:
+                results[rule['name']] = self._result(rule, violations[rule['name']], row_count, data.index)
+
+        for rule in self.rules:
+            if rule['type'] != 'compare':
+                continue
+            if any(col not in data.columns for col in rule['columns']):
+                skipped.append(rule['name'])
+                continue
+            mask = self._validate_compare(data, rule, comparable_cache)
+            results[rule['name']] = self._result(rule, mask, row_count, data.index)
+
+        # Keep the declared rule order in the output
+        ordered = {rule['name']: results[rule['name']] for rule in self.rules if rule['name'] in results}
+        invalid_rows = RowSet.union_all([result['rows'] for result in ordered.values()],
+                                        size=row_count, index=data.index)
+        return {
+            'rules': ordered,
+            'skipped': skipped,
+            'total_violations': int(sum(result['violations'] for result in ordered.values())),
+            'invalid_rows': invalid_rows,
+            'invalid_row_count': len(invalid_rows)
+        }
+
+    def _column_groups(self):
+        """Single-column rules grouped by column, in first-seen order"""
+        groups = {}
+        for rule in self.rules:
+            if rule['type'] != 'compare':
+                groups.setdefault(rule['column'], []).append(rule)
+        return groups.items()
+
+    def _result(self, rule, mask, row_count, index):
+        violations = int(mask.sum())
+        return {
+            'type': rule['type'],
+            'columns': rule['columns'],
+            'violations': violations,
+            'percentage': float(violations / row_count * 100) if row_count else 0.0,
+            'rows': RowSet.from_mask(mask, index)
+        }
+
+    def _validate_column(self, series, rules, comparable_cache):
+        """Violation masks for every single-column rule on one column"""
+        present = series.notna().to_numpy()
+        masks = {}
+
+        range_rules = [rule for rule in rules if rule['type'] == 'range']
+        if range_rules:
+            values = self._comparable(series, comparable_cache)
+            parsed = values.notna().to_numpy()
+            for rule in range_rules:
+                valid = np.ones(len(series), dtype=bool)
+                if rule.get('min') is not None:
+                    valid &= (values >= self._bound(values, rule['min'])).to_numpy(dtype=bool, na_value=False)
+                if rule.get('max') is not None:
+                    valid &= (values <= self._bound(values, rule['max'])).to_numpy(dtype=bool, na_value=False)
+                # Present values that cannot be read as numbers/dates break the rule too
+                masks[rule['name']] = self._violations(valid & parsed, present, rule)
+
+        value_rules = [rule for rule in rules if rule['type'] in ('in_set', 'regex')]
+        if value_rules:
+            codes, uniques = pd.factorize(series)
+            unique_values = pd.Series(uniques, dtype=object)
+            valid_uniques = {}
+
+            for rule in value_rules:
+                if rule['type'] != 'in_set':
+                    continue
+                if rule.get('case_sensitive', True):
+                    valid_uniques[rule['name']] = unique_values.isin(rule['values']).to_numpy()
+                else:
+                    allowed = {str(value).casefold() for value in rule['values']}
+                    valid_uniques[rule['name']] = unique_values.astype(str).str.casefold().isin(allowed).to_numpy()
+
+            regex_rules = [rule for rule in value_rules if rule['type'] == 'regex']
+            if regex_rules:
+                valid_uniques.update(self._match_patterns(unique_values.astype(str), regex_rules))
+
+            for rule in value_rules:
+                # Broadcast the per-value verdicts back to rows; missing rows map to code -1
+                valid = np.append(valid_uniques[rule['name']], False)[codes]
+                masks[rule['name']] = self._violations(valid, present, rule)
+
+        return masks
+
+    def _match_patterns(self, text, rules):
+        """Full-match verdicts of the regex rules over the distinct values"""
+        return fullmatch_all(text, {rule['name']: rule['pattern'] for rule in rules})
+
+    def _validate_compare(self, data, rule, comparable_cache):
+        left = self._comparable(data[rule['left']], comparable_cache)
+        right = self._comparable(data[rule['right']], comparable_cache)
+        try:
+            valid = self.OPERATORS[rule['op']](left, right).to_numpy(dtype=bool, na_value=False)
+        except TypeError as e:
+            raise ValueError(f"Cannot compare '{rule['left']}' with '{rule['right']}': {e}")
+
+        present = (data[rule['left']].notna() & data[rule['right']].notna()).to_numpy()
+        parsed = (left.notna() & right.notna()).to_numpy()
+        return self._violations(valid & parsed, present, rule)
+
+    @staticmethod
+    def _violations(valid, present, rule):
+        if rule['allow_missing']:
+            return present & ~valid
+        return ~(present & valid)
+
+    @staticmethod
+    def _comparable(series, cache):
+        """
+        Numeric or datetime view of a column, computed once per column.
+        Text columns are parsed on their distinct values: as numbers when
+        most values parse, as dates otherwise; unparseable values become NaN.
+        """
+        if series.name in cache:
+            return cache[series.name]
+
+        if pd.api.types.is_bool_dtype(series) or not (
+            pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series)
+        ):
+            codes, uniques = pd.factorize(series)
+            unique_values = pd.Series(uniques, dtype=object)
+            converted = pd.to_numeric(unique_values, errors='coerce')
+            if converted.notna().sum() * 2 < len(unique_values):
+                converted = pd.to_datetime(unique_values.astype(str), errors='coerce', format='mixed')
+            if len(converted):
+                values = converted.iloc[np.maximum(codes, 0)].to_numpy()
+                series = pd.Series(values, index=series.index, name=series.name).where(codes >= 0)
+            else:
+                series = pd.Series(np.nan, index=series.index, name=series.name)
+
+        cache[series.name] = series
+        return series
+
+    @staticmethod
+    def _bound(values, bound):
+        return pd.Timestamp(bound) if pd.api.types.is_datetime64_any_dtype(values) else bound
+
+
+def fullmatch_all(text, patterns):
+    """
+    Full-match verdicts of several patterns ({name: pattern}) over a Series
+    of strings, as {name: boolean array}. Fusable patterns become
+    `^(?=(?P<r0>(?:p0)\\Z))?(?=(?P<r1>(?:p1)\\Z))?...`: each optional
+    lookahead captures only when its pattern matches the whole value, so
+    one str.extract answers every pattern at once. Patterns with their own
+    named groups, backreferences or leading global flags ('(?i)...', only
+    valid at the start of a whole pattern) are matched separately.
+    """
+    verdicts = {}
+    fused = []
+    for name, pattern in patterns.items():
+        if (re.compile(pattern).groupindex or re.search(r'\\\d|\(\?P=', pattern)
+                or re.match(r'\(\?[aiLmsux]+\)', pattern)):
+            verdicts[name] = text.str.fullmatch(pattern).to_numpy(dtype=bool, na_value=False)
+        else:
+            fused.append((name, pattern))
+
+    if fused:
+        fused_pattern = '^' + ''.join(
+            f"(?=(?P<r{position}>(?:{pattern})\\Z))?" for position, (_, pattern) in enumerate(fused)
+        )
+        matches = text.str.extract(fused_pattern, expand=True)
+        for position, (name, _) in enumerate(fused):
+            verdicts[name] = matches[f"r{position}"].notna().to_numpy()
+    return verdicts
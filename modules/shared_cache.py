@@ -0,0 +1,222 @@
+import atexit
+import hashlib
+import os
+import pickle
+import shutil
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from modules.data_ingest import default_cache_dir
+from utils.memory_accounting import memory_accountant
+
+
+class SharedCache:
+    """
+    Process-wide cache for parsed frames, profiles and suggestion lists.
+
+    Entries are keyed by (namespace, key), where key starts with the
+    dataset fingerprint, so every Streamlit session working on the same
+    file shares one copy. Cached values are shared read-only: callers must
+    copy before modifying them.
+
+    Memory is bounded by memory_budget. The least recently used entries are
+    spilled to disk (pickle) when the budget is exceeded and are promoted
+    back to memory on their next hit. Entries larger than
+    max_item_fraction of the budget live on disk only. Concurrent requests
+    for the same missing entry compute it once. Spills are chosen under
+    the cache lock but pickled and written outside it, so a large spill
+    never blocks other sessions.
+    """
+
+    NAMESPACES = ("frames", "profiles", "suggestions")
+
+    def __init__(self, memory_budget=1024 ** 3, spill_dir=None, max_item_fraction=0.5):
+        self.memory_budget = memory_budget  # Bytes held in memory across all namespaces
+        # Spilled entries are only valid for this process, so each process
+        # gets its own directory, removed at exit
+        self.spill_dir = os.path.join(spill_dir or default_cache_dir(), "shared", str(os.getpid()))
+        atexit.register(shutil.rmtree, self.spill_dir, True)
+        self.max_item_fraction = max_item_fraction
+        self._memory = OrderedDict()  # (namespace, key) -> (value, size), oldest first
+        self._disk = {}  # (namespace, key) -> (path, size)
+        self._spilling = {}  # (namespace, key) -> value being written to disk
+        self._memory_bytes = 0
+        self._lock = threading.RLock()
+        self._compute_locks = {}
+        self._counters = {}  # namespace -> {'hits', 'disk_hits', 'misses', 'evictions'}
+
+    def get(self, namespace, key, default=None):
+        source, value = self._lookup((namespace, key))
+        self._count(namespace, source)
+        return default if source == "misses" else value
+
+    def put(self, namespace, key, value):
+        entry_key = (namespace, key)
+        size = self.estimate_size(value)
+        with self._lock:
+            # A new value replaces any copy on disk or being written
+            self._spilling.pop(entry_key, None)
+            stale = self._disk.pop(entry_key, None)
+            victims = self._store_in_memory(entry_key, value, size)
+        if stale is not None and os.path.exists(stale[0]):
+            os.remove(stale[0])
+        self._spill_all(victims)
+        return value
+
+    def get_or_compute(self, namespace, key, compute):
+        """Cached value, or compute(), store and return it (computed once per key)"""
+        entry_key = (namespace, key)
+        source, value = self._lookup(entry_key)
+        if source != "misses":
+            self._count(namespace, source)
+            return value
+
+        with self._lock:
+            compute_lock = self._compute_locks.setdefault(entry_key, threading.Lock())
+        with compute_lock:
+            # Another session may have finished computing while we waited
+            source, value = self._lookup(entry_key)
+            self._count(namespace, source)
+            if source != "misses":
+                return value
+            try:
+                return self.put(namespace, key, compute())
+            finally:
+                with self._lock:
+                    self._compute_locks.pop(entry_key, None)
+
+    def invalidate(self, namespace=None):
+        """Drop every entry (or every entry of one namespace) from memory and disk"""
+        with self._lock:
+            for entry_key in [k for k in self._memory if namespace in (None, k[0])]:
+                self._memory_bytes -= self._memory.pop(entry_key)[1]
+            for entry_key in [k for k in self._spilling if namespace in (None, k[0])]:
+                del self._spilling[entry_key]  # The writer discards its file
+            for entry_key in [k for k in self._disk if namespace in (None, k[0])]:
+                path, _ = self._disk.pop(entry_key)
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def stats(self):
+        """Usage and hit-rate metrics per namespace"""
+        with self._lock:
+            namespaces = {}
+            for namespace in sorted(set(self.NAMESPACES) | set(self._counters), key=str):
+                counters = dict(self._namespace_counters(namespace))
+                lookups = counters["hits"] + counters["disk_hits"] + counters["misses"]
+                counters["hit_rate"] = (counters["hits"] + counters["disk_hits"]) / lookups if lookups else 0.0
+                counters["memory_entries"] = sum(1 for k in self._memory if k[0] == namespace)
+                counters["disk_entries"] = sum(1 for k in self._disk if k[0] == namespace)
+                namespaces[namespace] = counters
+            return {
+                "memory_bytes": self._memory_bytes,
+                "memory_budget": self.memory_budget,
+                "disk_bytes": sum(size for _, size in self._disk.values()),
+                "namespaces": namespaces
+            }
+
+    @staticmethod
+    def estimate_size(value):
+        """Bytes a value holds: exact accounting for frames, pickled size otherwise"""
+        if isinstance(value, pd.DataFrame):
+            return memory_accountant.total_bytes(value)
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def _lookup(self, entry_key):
+        """(source, value) where source is 'hits', 'disk_hits' or 'misses'"""
+        with self._lock:
+            if entry_key in self._memory:
+                self._memory.move_to_end(entry_key)
+                return "hits", self._memory[entry_key][0]
+            if entry_key in self._spilling:
+                return "hits", self._spilling[entry_key]
+            if entry_key not in self._disk:
+                return "misses", None
+            path, size = self._disk[entry_key]
+
+        try:
+            value = pd.read_pickle(path)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            with self._lock:
+                self._disk.pop(entry_key, None)
+            return "misses", None
+
+        with self._lock:
+            victims = self._store_in_memory(entry_key, value, size)
+        self._spill_all(victims)
+        return "disk_hits", value
+
+    def _count(self, namespace, source):
+        with self._lock:
+            self._namespace_counters(namespace)[source] += 1
+
+    def _namespace_counters(self, namespace):
+        return self._counters.setdefault(
+            namespace, {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        )
+
+    def _store_in_memory(self, entry_key, value, size):
+        """
+        Insert under the lock, then evict least recently used entries to
+        fit the budget. Returns the (entry_key, value, size) entries to
+        spill; the caller writes them with _spill_all after releasing the lock.
+        """
+        if entry_key in self._memory:
+            self._memory_bytes -= self._memory.pop(entry_key)[1]
+
+        victims = []
+        if size > self.memory_budget * self.max_item_fraction:
+            # Too large to keep resident without flushing everything else
+            if entry_key not in self._disk and entry_key not in self._spilling:
+                self._spilling[entry_key] = value
+                victims.append((entry_key, value, size))
+            return victims
+
+        self._memory[entry_key] = (value, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.memory_budget and len(self._memory) > 1:
+            evicted_key, (evicted_value, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+            self._namespace_counters(evicted_key[0])["evictions"] += 1
+            if evicted_key not in self._disk and evicted_key not in self._spilling:
+                # Stays readable from _spilling until the file is written
+                self._spilling[evicted_key] = evicted_value
+                victims.append((evicted_key, evicted_value, evicted_size))
+        return victims
+
+    def _spill_all(self, victims):
+        for entry_key, value, size in victims:
+            self._spill(entry_key, value, size)
+
+    def _spill(self, entry_key, value, size):
+        """Pickle to disk without holding the lock, then register the file"""
+        namespace, key = entry_key
+        directory = os.path.join(self.spill_dir, str(namespace))
+        path = os.path.join(directory, hashlib.sha256(repr(key).encode("utf-8")).hexdigest() + ".pkl")
+        try:
+            os.makedirs(directory, exist_ok=True)
+            pd.to_pickle(value, path)
+            written = True
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            # Unpicklable value or no disk space: the entry is simply dropped
+            written = False
+
+        with self._lock:
+            # Invalidated or replaced while being written: the file is stale
+            current = self._spilling.get(entry_key) is value
+            if current:
+                del self._spilling[entry_key]
+                if written:
+                    self._disk[entry_key] = (path, size)
+        if not (written and current) and os.path.exists(path):
+            os.remove(path)
+
+
+def _budget_from_env():
+    return int(float(os.getenv("DATA_CLEANING_CACHE_BUDGET_MB", "1024")) * 1024 ** 2)
+
+
+# Shared by every session of the Streamlit process
+shared_cache = SharedCache(memory_budget=_budget_from_env())
@@ -0,0 +1,182 @@
+import os
+
+import pandas as pd
+import numpy as np
+
+from modules.cleaning_recipe import CleaningRecipe
+from modules.data_ingest import CSVSniffer
+from utils.streaming_stats import DedupeIndex, FrequencyCounter, RowSample, row_hashes
+
+
+class StreamingCleaner:
+    """
+    Two-pass cleaning of files larger than memory.
+
+    Pass 1 reads the input chunk by chunk and collects global statistics:
+    a uniform row sample drawn across all chunks, value counters for text
+    columns, and a row-hash index (spilling to SQLite) that marks duplicate
+    raw rows. The dtype plan, value merging, medians (approximate quantiles
+    of the sample) and outlier bounds are fitted on the sample, so a column
+    that is all-null or integer in the first chunk is still typed from the
+    whole file; modes come from the counters. The statistics become a
+    CleaningRecipe. Pass 2 re-reads the input, drops the marked duplicates,
+    transforms each chunk with the recipe and appends it to CSV or Parquet
+    output. Peak memory is bounded by the chunk size, the sample size and
+    the counter capacities, not by the file size.
+
+    config: same keys as CleaningRecipe.
+    """
+
+    def __init__(self, config=None, chunksize=100000, sample_rows=100000,
+                 max_counter_items=100000, dedupe_memory_limit=1000000, spill_dir=None):
+        self.config = dict(config or {})
+        self.chunksize = chunksize
+        self.sample_rows = sample_rows  # Rows kept in the sample the recipe is fitted on
+        self.max_counter_items = max_counter_items  # Distinct values tracked per column
+        self.dedupe_memory_limit = dedupe_memory_limit  # Row hashes held before spilling to disk
+        self.spill_dir = spill_dir
+
+    def clean_file(self, input_path, output_path):
+        """
+        Clean input_path (CSV or Parquet) into output_path (.parquet writes
+        Parquet, anything else CSV). Returns a report in the shape of
+        DataCleaner.clean_data's report plus the fitted recipe.
+        """
+        recipe, duplicate_bits, rows_in = self._collect_statistics(input_path)
+        report = {
+            "operations": [],
+            "rows_in": rows_in,
+            "rows_out": 0,
+            "missing_values_handled": 0,
+            "duplicates_removed": 0,
+            "recipe": recipe.to_dict()
+        }
+
+        writer = None
+        try:
+            for position, chunk in enumerate(self._read_chunks(input_path)):
+                if duplicate_bits is not None:
+                    duplicates = np.unpackbits(duplicate_bits[position], count=len(chunk)).astype(bool)
+                    chunk = chunk[~duplicates]
+                    report["duplicates_removed"] += int(duplicates.sum())
+
+                missing_before = int(chunk.isna().sum().sum())
+                cleaned = recipe.transform(chunk)
+                report["missing_values_handled"] += max(missing_before - int(cleaned.isna().sum().sum()), 0)
+                report["rows_out"] += len(cleaned)
+                writer = self._write_chunk(cleaned, output_path, writer, first=(position == 0))
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if report["duplicates_removed"]:
+            report["operations"].append(f"Removed {report['duplicates_removed']} duplicate rows")
+        if report["missing_values_handled"]:
+            report["operations"].append(
+                f"Filled {report['missing_values_handled']} missing values with global medians/modes"
+            )
+        if recipe.outlier_bounds:
+            report["operations"].append(f"Clipped outliers in {len(recipe.outlier_bounds)} numeric columns")
+        return report
+
+    # ------------------------------------------------------------------
+    # Pass 1: statistics
+    # ------------------------------------------------------------------
+    def _collect_statistics(self, input_path):
+        """Returns (fitted recipe, per-chunk packed duplicate bitmaps or None, row count)"""
+        recipe_config = dict(self.config, remove_duplicates=False)
+        recipe = CleaningRecipe(recipe_config)
+        sample = RowSample(self.sample_rows)
+        counters = {}
+        duplicate_bits = [] if self.config.get("remove_duplicates", False) else None
+        rows_in = 0
+
+        with DedupeIndex(self.dedupe_memory_limit, self.spill_dir) as dedupe_index:
+            for chunk in self._read_chunks(input_path):
+                rows_in += len(chunk)
+                if not recipe.columns:
+                    recipe.columns = list(chunk.columns)
+                if duplicate_bits is not None:
+                    is_new = dedupe_index.add_new(row_hashes(chunk))
+                    duplicate_bits.append(np.packbits(~is_new))
+                    chunk = chunk[is_new]
+
+                sample.update(chunk)
+                # Every column is counted: its cleaned type is only known after the pass
+                for col in chunk.columns:
+                    counter = counters.setdefault(col, FrequencyCounter(self.max_counter_items))
+                    counter.update(chunk[col])
+
+        rows = sample.sample()
+        if rows is None:
+            rows = pd.DataFrame(columns=recipe.columns)
+        rows = recipe._fit_text_rules(recipe._fit_dtype_plan(rows.copy()))
+
+        if self.config.get("handle_missing", False):
+            medians, modes = {}, {}
+            for col in rows.columns:
+                if recipe._is_numeric(rows[col]):
+                    medians[col] = rows[col].median()
+                else:
+                    modes[col] = self._mode(recipe, col, counters.get(col), rows[col])
+            recipe._set_fill_values(medians, modes)
+        if self.config.get("clip_outliers", False):
+            # The uniform sample stands in for the full columns
+            recipe._fit_outlier_bounds(rows.select_dtypes(include=[np.number]))
+
+        recipe.fitted = True
+        return recipe, duplicate_bits, rows_in
+
+    @staticmethod
+    def _mode(recipe, col, counter, sampled):
+        """
+        Most frequent cleaned value of a column: the raw value counts are
+        passed through the fitted dtype plan and text rules and re-added,
+        so values that merge (e.g. 'Paris' and 'paris') count together.
+        Falls back to the sample when the counter is empty.
+        """
+        if counter is not None:
+            counts = counter.most_common(counter.max_items)
+            if len(counts):
+                raw = pd.DataFrame({col: pd.Series(counts.index, dtype=object)})
+                cleaned = recipe._apply_text_rules(recipe._apply_dtype_plan(raw))[col]
+                totals = pd.Series(counts.to_numpy()).groupby(cleaned.to_numpy()).sum()
+                if len(totals):
+                    return totals.idxmax()
+        mode = sampled.mode()
+        return mode.iloc[0] if len(mode) else None
+
+    # ------------------------------------------------------------------
+    # I/O
+    # ------------------------------------------------------------------
+    def _read_chunks(self, input_path):
+        if input_path.endswith(".parquet"):
+            import pyarrow.parquet as pq
+
+            for batch in pq.ParquetFile(input_path).iter_batches(batch_size=self.chunksize):
+                yield batch.to_pandas()
+            return
+
+        with open(input_path, "rb") as f:
+            csv_settings = CSVSniffer().sniff(f)
+        yield from pd.read_csv(input_path, chunksize=self.chunksize, **csv_settings)
+
+    def _write_chunk(self, chunk, output_path, writer, first):
+        """Append a chunk; returns the open Parquet writer (None for CSV)"""
+        if not output_path.endswith(".parquet"):
+            chunk.to_csv(output_path, mode="w" if first else "a", header=first, index=False)
+            return None
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if writer is None:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            writer = pq.ParquetWriter(output_path, table.schema)
+        else:
+            # Later chunks are cast to the schema of the first one
+            table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+        writer.write_table(table)
+        return writer
@@ -0,0 +1,156 @@
+import pandas as pd
+import numpy as np
+
+from modules.datetime_parsing import DateTimeParser
+
+
+class TypeInferencer:
+    """
+    Semantic type inference for text columns.
+
+    Candidate parsers (boolean, integer/float with thousands separators,
+    datetime) are tried on a sample of distinct values. The best candidate
+    is then verified on the full column with a vectorized conversion of the
+    column's distinct values, broadcast back through the factorized codes.
+    Date formats are detected and parsed by a DateTimeParser, which keeps
+    the detected format per column for later parsing.
+    """
+
+    BOOLEAN_VALUES = {
+        'true': True, 'false': False, 'yes': True, 'no': False,
+        'y': True, 'n': False, 't': True, 'f': False
+    }
+
+    def __init__(self, confidence_threshold=0.8, sample_size=1000,
+                 max_failed_examples=10, id_uniqueness=0.99, random_state=42,
+                 datetime_parser=None):
+        self.confidence_threshold = confidence_threshold  # Share of values that must parse
+        self.sample_size = sample_size  # Distinct values tested per candidate
+        self.max_failed_examples = max_failed_examples
+        self.id_uniqueness = id_uniqueness  # Distinct ratio above which text is treated as an ID
+        self.random_state = random_state
+        self.datetime_parser = datetime_parser or DateTimeParser(
+            confidence_threshold=confidence_threshold, sample_size=sample_size, random_state=random_state
+        )
+
+    def infer(self, data):
+        """Infer semantic types for every text column"""
+        text_cols = data.select_dtypes(include=['object', 'string']).columns
+        return {col: self.infer_column(data[col]) for col in text_cols}
+
+    def infer_column(self, series):
+        """
+        Returns {'inferred_type', 'confidence', 'failed_count',
+        'failed_values', 'format'} for one column.
+        """
+        codes, uniques = pd.factorize(series)
+        uniques = pd.Series(uniques, dtype=object).astype(str).str.strip()
+        non_null = int((codes >= 0).sum())
+        if non_null == 0:
+            return self._result('empty', 1.0)
+
+        sample = uniques
+        if len(uniques) > self.sample_size:
+            sample = uniques.sample(n=self.sample_size, random_state=self.random_state)
+
+        best = None
+        for inferred_type, parser in self._candidates(sample):
+            rate = parser(sample).notna().mean()
+            if rate >= self.confidence_threshold and (best is None or rate > best[2]):
+                best = (inferred_type, parser, rate)
+
+        if best is None:
+            unique_ratio = len(uniques) / non_null
+            inferred_type = 'id' if unique_ratio >= self.id_uniqueness and non_null > 1 else 'text'
+            if inferred_type == 'text' and unique_ratio < 0.5:
+                inferred_type = 'categorical'
+            return self._result(inferred_type, 1.0)
+
+        inferred_type, parser, _ = best
+        if inferred_type == 'datetime':
+            self.datetime_parser.remember_format(series.name, parser.format)
+        # Verify on the full column: parse each distinct value once
+        parsed_uniques = parser(uniques)
+        parsed_ok = parsed_uniques.notna().to_numpy()
+        value_ok = np.where(codes >= 0, parsed_ok[np.maximum(codes, 0)], True)
+        failed_count = int((~value_ok).sum())
+        failed_values = uniques[~parsed_ok].head(self.max_failed_examples).tolist()
+
+        return self._result(
+            inferred_type,
+            (non_null - failed_count) / non_null,
+            failed_count,
+            failed_values,
+            getattr(parser, 'format', None)
+        )
+
+    def convert(self, series, inference):
+        """Convert a column to its inferred type; values that fail to parse become missing"""
+        parser = self._parser_for(inference['inferred_type'], inference.get('format'))
+        if parser is None:
+            if inference['inferred_type'] == 'categorical':
+                return series.astype('category')
+            return series
+
+        codes, uniques = pd.factorize(series)
+        if len(uniques) == 0:
+            # All missing (e.g. a chunk of a sparse column): parse a blank to get the dtype
+            uniques = np.array([''], dtype=object)
+        parsed = parser(pd.Series(uniques, dtype=object).astype(str).str.strip())
+        values = parsed.take(np.maximum(codes, 0)).reset_index(drop=True)
+        values = values.where(codes >= 0)
+        values.index = series.index
+
+        if inference['inferred_type'] == 'integer':
+            return values.astype('Int64')
+        if inference['inferred_type'] == 'boolean':
+            return values.astype('boolean')
+        return values
+
+    def _result(self, inferred_type, confidence, failed_count=0, failed_values=None, fmt=None):
+        return {
+            'inferred_type': inferred_type,
+            'confidence': float(confidence),
+            'failed_count': int(failed_count),
+            'failed_values': failed_values or [],
+            'format': fmt
+        }
+
+    def _candidates(self, sample):
+        yield 'boolean', self._parse_boolean
+        yield 'integer', self._parse_integer
+        yield 'float', self._parse_float
+        fmt, _ = self.datetime_parser.best_format(sample)
+        if fmt is not None:
+            yield 'datetime', self._datetime_parser(fmt)
+
+    def _parser_for(self, inferred_type, fmt=None):
+        return {
+            'boolean': self._parse_boolean,
+            'integer': self._parse_integer,
+            'float': self._parse_float,
+            'datetime': self._datetime_parser(fmt) if fmt else None
+        }.get(inferred_type)
+
+    def _parse_boolean(self, values):
+        return values.str.lower().map(self.BOOLEAN_VALUES)
+
+    def _parse_float(self, values):
+        # Spaces and currency signs are ignored; commas only as thousands
+        # separators ('1,234.5', not '1,5'). Percentages and zero-padded
+        # codes ('02134') are not numbers: converting them would change the value.
+        cleaned = values.str.replace(r'[\s$€£]', '', regex=True)
+        thousands = cleaned.str.fullmatch(r'[+-]?\d{1,3}(?:,\d{3})+(?:\.\d+)?').to_numpy(dtype=bool)
+        cleaned = cleaned.where(~thousands, cleaned.str.replace(',', '', regex=False))
+        zero_padded = cleaned.str.match(r'[+-]?0\d').to_numpy(dtype=bool)
+        return pd.to_numeric(cleaned.where((cleaned != '') & ~zero_padded), errors='coerce')
+
+    def _parse_integer(self, values):
+        numbers = self._parse_float(values)
+        return numbers.where(numbers == np.floor(numbers))
+
+    def _datetime_parser(self, fmt):
+        def parse(values):
+            return self.datetime_parser.parse_values(values, fmt)
+        parse.format = fmt
+        return parse
@@ -0,0 +1,216 @@
+import re
+import unicodedata
+
+import pandas as pd
+import numpy as np
+
+
+class ValueClusterer:
+    """
+    Cluster near-duplicate categorical labels ("New York", "new-york",
+    "NewYork", "New Yrok").
+
+    Works on the distinct values of a column, never on rows:
+    1. key collision: values sharing a normalized fingerprint are merged;
+    2. n-gram blocking: fingerprints sharing a deletion-neighbourhood
+       n-gram (the key with up to max_blocking_edits characters removed)
+       become candidate pairs, so there is no all-pairs comparison;
+    3. edit distance: candidate pairs within a length-relative
+       Damerau-Levenshtein budget whose digits are identical are similar
+       ('10001' and '10002' are different values, not typos).
+
+    Clusters are not chained: the most frequent key of a cluster is its
+    centre and every other member is within the budget of that centre.
+    Columns whose values are mostly unique (IDs, codes) are not clustered.
+    """
+
+    def __init__(self, max_edit_ratio=0.2, max_blocking_edits=1, max_block_size=1000,
+                 min_key_length=3, max_clusters=100, chunk_size=100000,
+                 id_uniqueness=0.9, min_id_values=20):
+        self.max_edit_ratio = max_edit_ratio  # Allowed edits per character of the shorter key
+        self.max_blocking_edits = max_blocking_edits  # Deletions used to build blocking keys
+        self.chunk_size = chunk_size  # Distinct keys expanded per batch
+        self.max_block_size = max_block_size  # n-grams shared by more keys are ignored
+        self.min_key_length = min_key_length  # Shorter keys only merge by key collision
+        self.max_clusters = max_clusters  # Largest clusters reported per column
+        self.id_uniqueness = id_uniqueness  # Distinct/row ratio above which a column is treated as an ID
+        self.min_id_values = min_id_values  # Fewer distinct values are always clustered
+
+    def cluster_column(self, series):
+        """
+        Return clusters of near-duplicate values, largest first.
+        Each cluster: {'canonical', 'values', 'counts', 'rows_affected'}
+        """
+        return self.cluster_counts(series.dropna().astype(str).value_counts())
+
+    def cluster_counts(self, value_counts):
+        """
+        Same as cluster_column, from a precomputed value -> count table
+        sorted by count (e.g. a frequency query run by a profiling backend).
+        """
+        if len(value_counts) < 2 or self._is_id_like(value_counts):
+            return []
+
+        values = value_counts.index.to_series(index=np.arange(len(value_counts)))
+        keys = self.fingerprint(values)
+        key_codes, unique_keys = pd.factorize(keys)
+
+        # Key collisions are already grouped; similar keys join the most frequent one
+        neighbours = {}
+        for left, right in self._candidate_pairs(pd.Series(unique_keys)):
+            if self._within_edit_budget(unique_keys[left], unique_keys[right]):
+                neighbours.setdefault(left, []).append(right)
+                neighbours.setdefault(right, []).append(left)
+        key_totals = np.bincount(key_codes, weights=value_counts.to_numpy(), minlength=len(unique_keys))
+        roots = self._assign_centres(neighbours, key_totals)
+        value_roots = roots[key_codes]
+
+        frame = pd.DataFrame({
+            'value': values.to_numpy(),
+            'count': value_counts.to_numpy(),
+            'root': value_roots,
+            'is_centre': key_codes == value_roots
+        })
+        sizes = frame.groupby('root')['value'].transform('size')
+        frame = frame[sizes > 1]
+        if frame.empty:
+            return []
+
+        clusters = []
+        # value_counts is sorted by frequency, so the first value of the centre key is the canonical one
+        for _, group in frame.groupby('root', sort=False):
+            canonical = group['value'][group['is_centre']].iloc[0]
+            clusters.append({
+                'canonical': canonical,
+                'values': group['value'].tolist(),
+                'counts': [int(count) for count in group['count']],
+                'rows_affected': int(group['count'][group['value'] != canonical].sum())
+            })
+
+        clusters.sort(key=lambda cluster: cluster['rows_affected'], reverse=True)
+        return clusters[:self.max_clusters]
+
+    def build_mapping(self, clusters):
+        """Mapping of every non-canonical value to its cluster's canonical value"""
+        mapping = {}
+        for cluster in clusters:
+            for value in cluster['values']:
+                if value != cluster['canonical']:
+                    mapping[value] = cluster['canonical']
+        return mapping
+
+    def fingerprint(self, values):
+        """Vectorized key: accents stripped, lowercased, non-alphanumerics removed"""
+        normalized = values.map(
+            lambda value: unicodedata.normalize('NFKD', value).encode('ascii', 'ignore').decode('ascii')
+        )
+        return normalized.str.lower().str.replace(r'[^0-9a-z]+', '', regex=True)
+
+    def _candidate_pairs(self, keys):
+        """
+        Pairs of key positions that share a deletion-neighbourhood n-gram.
+
+        Every key is expanded to the subsequences obtained by deleting up to
+        max_blocking_edits characters. Two keys within that many edits
+        (including a transposition) always share one of them, so joining on
+        the hashed variants finds every such pair without comparing all
+        pairs. Variants are hashed in chunks so memory stays bounded.
+        """
+        lengths = keys.str.len().to_numpy()
+        eligible = np.flatnonzero(lengths >= self.min_key_length)
+        if len(eligible) < 2:
+            return []
+
+        hash_chunks = []
+        key_chunks = []
+        for start in range(0, len(eligible), self.chunk_size):
+            chunk = eligible[start:start + self.chunk_size]
+            variants = [self._deletion_variants(keys.iat[position]) for position in chunk]
+            counts = np.fromiter((len(v) for v in variants), dtype=np.int64, count=len(variants))
+            flat = np.array([variant for group in variants for variant in group], dtype=object)
+            hash_chunks.append(pd.util.hash_array(flat))
+            key_chunks.append(np.repeat(chunk, counts))
+
+        postings = pd.DataFrame({
+            'gram': np.concatenate(hash_chunks),
+            'key': np.concatenate(key_chunks)
+        })
+        # Oversized blocks come from very short or repetitive keys and carry little signal
+        block_sizes = postings.groupby('gram')['key'].transform('size')
+        postings = postings[(block_sizes > 1) & (block_sizes <= self.max_block_size)]
+        if postings.empty:
+            return []
+
+        pairs = postings.merge(postings, on='gram', suffixes=('_left', '_right'))
+        pairs = pairs.loc[pairs['key_left'] < pairs['key_right'], ['key_left', 'key_right']]
+        pairs = pairs.drop_duplicates()
+        if pairs.empty:
+            return []
+
+        left = pairs['key_left'].to_numpy()
+        right = pairs['key_right'].to_numpy()
+        budget = np.floor(np.minimum(lengths[left], lengths[right]) * self.max_edit_ratio)
+        keep = np.abs(lengths[left] - lengths[right]) <= budget
+        return list(zip(left[keep], right[keep]))
+
+    def _deletion_variants(self, key):
+        variants = {key}
+        frontier = {key}
+        for _ in range(self.max_blocking_edits):
+            frontier = {
+                variant[:i] + variant[i + 1:]
+                for variant in frontier
+                for i in range(len(variant))
+            }
+            variants |= frontier
+        return variants
+
+    def _is_id_like(self, value_counts):
+        """Mostly unique values (IDs, codes): clustering them would merge distinct entities"""
+        if len(value_counts) < self.min_id_values:
+            return False
+        return len(value_counts) / value_counts.sum() >= self.id_uniqueness
+
+    @staticmethod
+    def _assign_centres(neighbours, key_totals):
+        """
+        Cluster centre of every key. Keys are visited by descending row
+        count; an unassigned key becomes a centre and takes its unassigned
+        direct neighbours, so members are never joined through a chain.
+        """
+        roots = np.full(len(key_totals), -1, dtype=np.int64)
+        for key in np.argsort(-key_totals, kind='stable'):
+            if roots[key] >= 0:
+                continue
+            roots[key] = key
+            for neighbour in neighbours.get(key, ()):
+                if roots[neighbour] < 0:
+                    roots[neighbour] = key
+        return roots
+
+    def _within_edit_budget(self, left, right):
+        budget = int(min(len(left), len(right)) * self.max_edit_ratio)
+        if budget == 0:
+            return False
+        # A changed, added or removed digit makes a different value (ID, zip code, room number)
+        if re.sub(r'\D', '', left) != re.sub(r'\D', '', right):
+            return False
+        return self._edit_distance(left, right, budget) <= budget
+
+    @staticmethod
+    def _edit_distance(left, right, limit):
+        """Optimal string alignment distance, stopping early once it exceeds limit"""
+        previous_previous = None
+        previous = list(range(len(right) + 1))
+        for i in range(1, len(left) + 1):
+            current = [i] + [0] * len(right)
+            for j in range(1, len(right) + 1):
+                cost = 0 if left[i - 1] == right[j - 1] else 1
+                current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+                if (i > 1 and j > 1 and left[i - 1] == right[j - 2]
+                        and left[i - 2] == right[j - 1]):
+                    current[j] = min(current[j], previous_previous[j - 2] + 1)
+            if min(current) > limit:
+                return limit + 1
+            previous_previous, previous = previous, current
+        return previous[-1]
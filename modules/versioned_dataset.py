@@ -0,0 +1,197 @@
+import numpy as np
+import pandas as pd
+
+from utils.row_sets import RowSet
+
+
+class VersionedDataset:
+    """
+    Version history of a dataset as a column-level copy-on-write log.
+
+    Version 0 is the base frame, which is never modified. Each later version
+    is a step that stores only the columns it replaced or added and a RowSet
+    of the rows it kept, so memory grows with what changed rather than with
+    the number of steps. Any version can be materialized on demand, which
+    gives undo/redo and "compare with version N" without full copies.
+    """
+
+    def __init__(self, base):
+        self.base = base
+        self._steps = []  # Applied steps, oldest first
+        self._redo = []  # Undone steps, most recently undone last
+        self._materialized = (0, base)  # (version, frame) of the last frame built
+
+    @property
+    def version(self):
+        return len(self._steps)
+
+    def can_undo(self):
+        return bool(self._steps)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def apply(self, result, description, changed_columns=None, metadata=None):
+        """
+        Record `result` (the output of an operation on the current version)
+        as a new version. Rows are matched by index label. changed_columns
+        lists the columns the operation rewrote; when omitted, shared columns
+        are compared to find them. Returns the new version number.
+        """
+        current = self.frame()
+        if len(result) == len(current) and result.index.equals(current.index):
+            row_mask = None
+            kept = current
+        else:
+            if not current.index.is_unique:
+                raise ValueError("Row removal can only be tracked on a frame with a unique index")
+            keep = current.index.isin(result.index)
+            row_mask = RowSet.from_mask(keep)
+            kept = current[keep]
+            if not kept.index.equals(result.index):
+                raise ValueError("Operation result must keep the current row order")
+
+        if changed_columns is None:
+            changed_columns = [
+                col for col in result.columns
+                if col in kept.columns and not result[col].equals(kept[col])
+            ]
+        stored = set(changed_columns) | (set(result.columns) - set(current.columns))
+
+        self._steps.append({
+            'description': description,
+            'row_mask': row_mask,
+            # Copied so a step never keeps the operation's whole result block alive
+            'columns': {col: result[col].copy() for col in result.columns if col in stored},
+            'column_order': list(result.columns),
+            'metadata': metadata or {}
+        })
+        self._redo = []
+        self._materialized = (self.version, result)
+        return self.version
+
+    def undo(self):
+        if not self._steps:
+            raise ValueError("Nothing to undo")
+        self._redo.append(self._steps.pop())
+        return self.version
+
+    def redo(self):
+        if not self._redo:
+            raise ValueError("Nothing to redo")
+        self._steps.append(self._redo.pop())
+        return self.version
+
+    def metadata(self, version=None):
+        """Metadata recorded with a version (empty for the base)"""
+        version = self.version if version is None else version
+        return self._steps[version - 1]['metadata'] if version else {}
+
+    def history(self):
+        """One entry per version, base first"""
+        entries = [{'version': 0, 'description': 'Original data', 'rows': len(self.base),
+                    'columns_changed': [], 'rows_removed': 0}]
+        rows = len(self.base)
+        for version, step in enumerate(self._steps, start=1):
+            removed = 0 if step['row_mask'] is None else rows - len(step['row_mask'])
+            rows -= removed
+            entries.append({
+                'version': version,
+                'description': step['description'],
+                'rows': rows,
+                'columns_changed': list(step['columns']),
+                'rows_removed': removed
+            })
+        return entries
+
+    def frame(self, version=None):
+        """Materialize a version (the current one by default)"""
+        version = self.version if version is None else version
+        if not 0 <= version <= self.version:
+            raise ValueError(f"Version {version} does not exist (current is {self.version})")
+        if version == 0:
+            return self.base
+        if self._materialized[0] == version:
+            return self._materialized[1]
+
+        positions = self._positions(version)
+        final = positions[-1]
+        columns = {}
+        for col in self._column_order(version):
+            source_version = self._column_source(col, version)
+            source = self.base[col] if source_version == 0 else self._steps[source_version - 1]['columns'][col]
+            if len(positions[source_version]) != len(final):
+                source = source.iloc[np.searchsorted(positions[source_version], final)]
+            columns[col] = source.reset_index(drop=True)
+
+        frame = pd.DataFrame(columns, copy=False)
+        frame.index = self.base.index[final]
+        if version == self.version:
+            self._materialized = (version, frame)
+        return frame
+
+    def compare(self, version, other=None):
+        """
+        Differences between `version` and `other` (the current version by
+        default) over the rows both contain.
+        """
+        other = self.version if other is None else other
+        positions = self._positions(max(version, other))
+        rows_a, rows_b = positions[version], positions[other]
+        common = np.intersect1d(rows_a, rows_b, assume_unique=True)
+        columns_a, columns_b = self._column_order(version), self._column_order(other)
+
+        cells_changed = {}
+        for col in columns_a:
+            if col not in columns_b or self._column_source(col, version) == self._column_source(col, other):
+                continue
+            values_a = self._column_values(col, version, positions, common)
+            values_b = self._column_values(col, other, positions, common)
+            if values_a.dtype != values_b.dtype:
+                values_a, values_b = values_a.astype(object), values_b.astype(object)
+            same = (values_a == values_b).fillna(False) | (values_a.isna() & values_b.isna())
+            changed = int((~same).sum())
+            if changed:
+                cells_changed[col] = changed
+
+        return {
+            'version': version,
+            'other': other,
+            'rows_only_in_version': int(len(rows_a) - len(common)),
+            'rows_only_in_other': int(len(rows_b) - len(common)),
+            'columns_added': [col for col in columns_b if col not in columns_a],
+            'columns_removed': [col for col in columns_a if col not in columns_b],
+            'cells_changed': cells_changed
+        }
+
+    def nbytes(self):
+        """Memory held by the log itself (stored columns and row masks)"""
+        total = 0
+        for step in self._steps + self._redo:
+            total += sum(int(series.memory_usage(index=False, deep=True)) for series in step['columns'].values())
+            if step['row_mask'] is not None:
+                total += step['row_mask'].nbytes
+        return total
+
+    def _positions(self, version):
+        """Base row positions of versions 0..version"""
+        positions = [np.arange(len(self.base))]
+        for step in self._steps[:version]:
+            current = positions[-1]
+            positions.append(current if step['row_mask'] is None else current[step['row_mask'].to_mask()])
+        return positions
+
+    def _column_order(self, version):
+        return list(self.base.columns) if version == 0 else self._steps[version - 1]['column_order']
+
+    def _column_source(self, col, version):
+        """Latest version up to `version` that stored `col` (0 for the base)"""
+        for source in range(version, 0, -1):
+            if col in self._steps[source - 1]['columns']:
+                return source
+        return 0
+
+    def _column_values(self, col, version, positions, rows):
+        source_version = self._column_source(col, version)
+        source = self.base[col] if source_version == 0 else self._steps[source_version - 1]['columns'][col]
+        return source.iloc[np.searchsorted(positions[source_version], rows)].reset_index(drop=True)
@@ -1,30 +1,70 @@
-from faster_whisper import WhisperModel
 import os
+import tempfile
+import threading
+
+# Whisper model size (can be tiny, base, small, medium, large)
+MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "base")
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_model():
+    """
+    Load the Whisper model on first use and reuse it afterwards.
+    faster_whisper is only imported here, so importing this module is cheap.
+    """
+    global _model
+    with _model_lock:
+        if _model is None:
+            from faster_whisper import WhisperModel
+            _model = WhisperModel(MODEL_SIZE)
+    return _model
 
-# Load the Whisper model once (can be tiny, base, small, medium, large)
-model = WhisperModel("base")  # change to "small" or "medium" for higher accuracy
 
 def transcribe_file(file_path):
     """
     Transcribes audio to text using local Faster-Whisper.
-    
+
     Args:
         file_path (str): Path to the audio file.
-        
+
     Returns:
         str: Transcribed text.
     """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Audio file not found: {file_path}")
-    
-    segments, info = model.transcribe(file_path)
+
+    segments, info = get_model().transcribe(file_path)
     text = ""
     for segment in segments:
         text += segment.text + " "
-    
+
     return text.strip()
 
 
+class VoiceService:
+    """
+    Transcription of uploaded audio files. When a WarmWorker is given (and
+    alive) the work runs in that process, where the model is already loaded.
+    """
+
+    def __init__(self, worker=None):
+        self.worker = worker
+
+    def transcribe(self, uploaded_file):
+        suffix = os.path.splitext(getattr(uploaded_file, "name", ""))[1]
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+            f.write(uploaded_file.getvalue())
+            path = f.name
+        try:
+            if self.worker is not None and self.worker.is_alive():
+                return self.worker.transcribe(path)
+            return transcribe_file(path)
+        finally:
+            os.remove(path)
+
+
 # Example usage
 if __name__ == "__main__":
     audio_file = "sample_audio.mp3"  # replace with your file
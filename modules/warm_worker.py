@@ -0,0 +1,149 @@
+import importlib
+import multiprocessing
+import queue
+import threading
+import time
+import uuid
+
+# Heavy modules the UI only needs after the first page has rendered
+HEAVY_MODULES = (
+    "plotly.express",
+    "plotly.graph_objects",
+    "scipy.spatial",
+    "scipy.sparse.csgraph",
+    "openai",
+)
+
+_prewarm_started = False
+_prewarm_lock = threading.Lock()
+
+
+def prewarm_imports(modules=HEAVY_MODULES):
+    """
+    Import heavy modules in a daemon thread so they are usually loaded
+    before the user opens a chart. Missing optional packages are skipped.
+    Only the first call starts a thread.
+    """
+    global _prewarm_started
+    with _prewarm_lock:
+        if _prewarm_started:
+            return
+        _prewarm_started = True
+
+    def run():
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass
+
+    threading.Thread(target=run, name="prewarm-imports", daemon=True).start()
+
+
+def _serve(requests, responses, modules, load_whisper):
+    """Worker loop: preload, report readiness, then answer requests until None arrives"""
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+    from modules import voice_service
+    if load_whisper:
+        try:
+            voice_service.get_model()
+        except Exception as e:
+            responses.put(("ready", False, str(e)))
+        else:
+            responses.put(("ready", True, None))
+    else:
+        responses.put(("ready", True, None))
+
+    while True:
+        request = requests.get()
+        if request is None:
+            break
+        request_id, action, payload = request
+        try:
+            if action == "transcribe":
+                result = voice_service.transcribe_file(payload)
+            else:
+                raise ValueError(f"Unknown worker action: {action}")
+            responses.put((request_id, True, result))
+        except Exception as e:
+            responses.put((request_id, False, str(e)))
+
+
+class WarmWorker:
+    """
+    Separate process that keeps heavy dependencies and the Whisper model
+    loaded, so transcription requests skip model start-up. The child loads
+    everything in the background while the UI renders.
+
+    The Streamlit server is multi-threaded (and prewarm_imports() may be
+    importing in a thread), so the worker is never forked from it: a
+    child forked while another thread holds an import lock can deadlock.
+    It is started from the forkserver (a clean single-threaded process)
+    where available, otherwise spawned.
+    """
+
+    def __init__(self, modules=HEAVY_MODULES, load_whisper=True):
+        methods = multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self._requests = self._context.Queue()
+        self._responses = self._context.Queue()
+        self._process = self._context.Process(
+            target=_serve,
+            args=(self._requests, self._responses, tuple(modules), load_whisper),
+            name="warm-worker",
+            daemon=True
+        )
+        self._lock = threading.Lock()  # One request in flight at a time
+        self._ready = None  # (ok, error) once the worker has reported
+
+    def start(self):
+        self._process.start()
+        return self
+
+    def is_alive(self):
+        return self._process.is_alive()
+
+    def wait_ready(self, timeout=None):
+        """Block until preloading finished; returns True when the model loaded"""
+        with self._lock:
+            if self._ready is None:
+                _, ok, error = self._responses.get(timeout=timeout)
+                self._ready = (ok, error)
+        return self._ready[0]
+
+    def transcribe(self, path, timeout=600):
+        if not self.wait_ready(timeout=timeout):
+            raise RuntimeError(f"Warm worker failed to load the model: {self._ready[1]}")
+        with self._lock:
+            request_id = uuid.uuid4().hex
+            self._requests.put((request_id, "transcribe", path))
+            ok, result = self._receive(request_id, timeout)
+        if not ok:
+            raise RuntimeError(result)
+        return result
+
+    def _receive(self, request_id, timeout):
+        """
+        (ok, result) of one request. Late replies to earlier requests that
+        timed out are still queued; they are discarded until the matching
+        id arrives, so one timeout does not desync every later call.
+        Raises queue.Empty when no matching reply arrives within timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise queue.Empty
+            response_id, ok, result = self._responses.get(timeout=remaining)
+            if response_id == request_id:
+                return ok, result
+
+    def stop(self, timeout=5):
+        if self._process.is_alive():
+            self._requests.put(None)
+            self._process.join(timeout)
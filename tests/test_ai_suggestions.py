@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from modules.ai_suggestions import AISuggestionEngine
+from modules.data_cleaning import DataCleaner
+from modules.data_profiling import DataProfiler
+
+
+def _frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'id': [f'ID{number:04d}' for number in range(1000)],
+        'zip': pd.Series([f'{number:05d}' for number in rng.integers(1000, 99999, 1000)], dtype=object),
+        'city': pd.Series(['Paris ', 'paris', 'Paris', 'Lyon'] * 250, dtype=object),
+        'value': np.append(rng.normal(10, 1, 990), [1000.0] * 10),
+        'small': rng.integers(0, 100, 1000)
+    })
+
+
+def test_cheap_wins_are_lossless_only():
+    data = _frame()
+    profile = DataProfiler().generate_profile(data)
+    engine = AISuggestionEngine()
+    suggestions = engine.generate_suggestions(data, profile)
+    wins = engine.cheap_wins(suggestions)
+    assert wins
+    assert all(suggestion['action'] in AISuggestionEngine.AUTO_ACTIONS for suggestion in wins)
+
+    config = engine.build_cleaning_config(wins, profile)
+    cleaned = DataCleaner().clean_data(data, config)['cleaned_data']
+    for col in data.columns:
+        assert cleaned[col].tolist() == data[col].tolist()
+
+
+def test_value_changing_fixes_are_not_cheap_wins():
+    data = _frame()
+    profile = DataProfiler().generate_profile(data)
+    engine = AISuggestionEngine()
+    suggestions = engine.generate_suggestions(data, profile)
+    actions = {suggestion['action'] for suggestion in suggestions}
+    assert actions & {'handle_outliers', 'standardize_case', 'strip_whitespace'}
+    wins = {suggestion['action'] for suggestion in engine.cheap_wins(suggestions, max_seconds=float('inf'))}
+    assert not wins & {'handle_outliers', 'standardize_case', 'strip_whitespace', 'merge_values',
+                       'convert_types', 'impute_numeric', 'impute_categorical'}
+
+
+def test_suggestions_are_ranked_by_score():
+    data = _frame()
+    suggestions = AISuggestionEngine().generate_suggestions(data, DataProfiler().generate_profile(data))
+    scores = [suggestion['score'] for suggestion in suggestions]
+    assert scores == sorted(scores, reverse=True)
+    assert all(suggestion['estimated_seconds'] > 0 for suggestion in suggestions)
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.cleaning_recipe import CleaningRecipe
+
+
+def _reference():
+    return pd.DataFrame({
+        'amount': np.append(np.arange(1.0, 21.0), [np.nan, 1000.0]),
+        'city': ['Paris'] * 11 + ['Lyon'] * 10 + [None],
+        'joined': ['2024-01-%02d' % day for day in range(1, 23)]
+    })
+
+
+CONFIG = {'convert_types': True, 'handle_missing': True, 'clip_outliers': True,
+          'standardize_text': True, 'remove_duplicates': True}
+
+
+def test_transform_replays_fitted_parameters():
+    recipe = CleaningRecipe(CONFIG).fit(_reference())
+    assert recipe.dtype_plan['joined']['inferred_type'] == 'datetime'
+    assert recipe.fill_values['city'] == 'paris'
+
+    batch = pd.DataFrame({'amount': [np.nan, 5000.0, 5000.0], 'city': [None, 'LYON', 'LYON'],
+                          'joined': ['2024-02-01', '2024-02-02', '2024-02-02']})
+    cleaned = recipe.transform(batch)
+    assert len(cleaned) == 2
+    assert cleaned['amount'].iloc[0] == recipe.fill_values['amount']
+    assert cleaned['amount'].iloc[1] == recipe.outlier_bounds['amount'][1]
+    assert cleaned['city'].tolist() == ['paris', 'lyon']
+    assert pd.api.types.is_datetime64_any_dtype(cleaned['joined'])
+
+
+def test_save_and_load_round_trip(tmp_path):
+    recipe = CleaningRecipe(CONFIG).fit(_reference())
+    path = tmp_path / 'recipe.json'
+    recipe.save(path)
+    loaded = CleaningRecipe.load(path)
+    batch = _reference()
+    pd.testing.assert_frame_equal(loaded.transform(batch), recipe.transform(batch))
+
+
+def test_transform_file_dedupes_across_chunks(tmp_path):
+    source = tmp_path / 'feed.csv'
+    pd.DataFrame({'amount': [1.0, 2.0, 1.0, 3.0], 'city': ['a', 'b', 'a', 'c']}).to_csv(source, index=False)
+    recipe = CleaningRecipe({'remove_duplicates': True}).fit(pd.read_csv(source))
+    counts = recipe.transform_file(str(source), str(tmp_path / 'out.csv'), chunksize=2)
+    assert counts == {'rows_in': 4, 'rows_out': 3}
+
+
+def test_unfitted_and_unknown_versions_are_rejected():
+    with pytest.raises(ValueError):
+        CleaningRecipe().transform(_reference())
+    with pytest.raises(ValueError):
+        CleaningRecipe.from_dict({'version': 99})
@@ -0,0 +1,20 @@
+import pytest
+
+from modules.cost_model import CostModel
+
+
+def test_estimate_is_linear_in_cells():
+    model = CostModel({'standardize_text': (0.5, 1e-6)})
+    assert model.estimate('standardize_text', 1000, 2) == pytest.approx(0.5 + 2e-3)
+    # Zero columns still charge one column; unknown operations use a fallback
+    assert model.estimate('standardize_text', 1000, 0) == model.estimate('standardize_text', 1000, 1)
+    assert model.estimate('unknown', 0) > 0
+
+
+def test_calibrate_refits_per_cell_coefficients():
+    model = CostModel().calibrate(rows=2000)
+    assert model.calibrated
+    for operation, (overhead, per_cell) in model.coefficients.items():
+        assert overhead == CostModel.DEFAULT_COEFFICIENTS[operation][0]
+        assert per_cell >= 0
+    assert model.estimate('remove_duplicates', 10 ** 6, 5) > model.estimate('remove_duplicates', 10, 5)
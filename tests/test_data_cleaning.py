@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.data_cleaning import DataCleaner
+
+
+@pytest.fixture
+def data():
+    return pd.DataFrame({
+        'count': pd.Series([10, 11, 12, 13, 14, 12, 11, 200], dtype='int64'),
+        'nullable': pd.Series([10, 11, 12, 13, None, 12, 11, 200], dtype='Int64'),
+        'value': [1.0, 1.1, 1.2, 1.3, 1.4, 1.2, 1.1, 90.0],
+    })
+
+
+@pytest.mark.parametrize('method', ['clip', 'winsorize'])
+def test_capping_keeps_integer_columns_integral(data, method):
+    cleaned, report = DataCleaner()._treat_outliers(data.copy(), method)
+    assert cleaned['count'].dtype == 'int64'
+    assert cleaned['nullable'].dtype == 'Int64'
+    assert cleaned['nullable'].isna().sum() == 1
+    assert cleaned['count'].max() < 200
+    assert report['outliers_handled'] >= 3
+
+
+def test_clip_uses_the_given_bounds(data):
+    outliers = {'count': {'lower_bound': 8.5, 'upper_bound': 15.5}}
+    cleaned, report = DataCleaner()._treat_outliers(data.copy(), 'clip', outliers=outliers)
+    assert cleaned['count'].tolist() == [10, 11, 12, 13, 14, 12, 11, 15]
+    assert report['by_column'] == {'count': 1}
+
+
+def test_log_makes_nullable_integers_nullable_floats(data):
+    cleaned, _ = DataCleaner()._treat_outliers(data.copy(), 'log')
+    assert cleaned['nullable'].dtype == 'Float64'
+    assert cleaned['nullable'].isna().sum() == 1
+
+
+def test_drop_rows(data):
+    cleaned, report = DataCleaner()._treat_outliers(data.copy(), 'drop_rows')
+    assert len(cleaned) == 7
+
+
+def test_standardize_dates_keeps_unparseable_values():
+    data = pd.DataFrame({'day': ['25/12/2024', '01/02/2024', '03/03/2023', '04/04/2023', 'unknown']})
+    result = DataCleaner().clean_data(data, {'standardize_dates': True})
+    assert result['cleaned_data']['day'].tolist() == [
+        '2024-12-25', '2024-02-01', '2023-03-03', '2023-04-04', 'unknown'
+    ]
+    assert result['report']['changed_columns'] == ['day']
+
+
+def test_optimize_types_skips_lossy_casts():
+    data = pd.DataFrame({'small': [1, 2, 3], 'large': [1, 2, 300]})
+    cleaned, report = DataCleaner()._optimize_types(data.copy(), {'small': 'int8', 'large': 'int8'})
+    assert cleaned['small'].dtype == np.int8
+    assert cleaned['large'].tolist() == [1, 2, 300]
+    assert report['columns'] == ['small']
+
+
+@pytest.mark.parametrize('config', [
+    {'value_mappings': {'a': {'x ': 'x'}}},
+    {'standardize_text': True},
+])
+def test_duplicates_created_after_dedupe_are_counted(config):
+    data = pd.DataFrame({'a': ['x ', 'x', 'y'], 'b': [1, 1, 2]})
+    result = DataCleaner().clean_data(data, {'remove_duplicates': True, **config})
+    cleaned = result['cleaned_data']
+    assert cleaned.duplicated().sum() == 1
+    assert result['report']['final_stats']['duplicate_rows'] == 1
+
+
+def test_dedupe_as_last_value_change_reports_no_duplicates():
+    data = pd.DataFrame({'a': ['x', 'x', 'y'], 'b': [1, 1, 2]})
+    result = DataCleaner().clean_data(data, {'remove_duplicates': True})
+    assert result['report']['final_stats']['duplicate_rows'] == 0
+    assert len(result['cleaned_data']) == 2
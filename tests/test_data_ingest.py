@@ -0,0 +1,72 @@
+import io
+
+import pandas as pd
+import pytest
+
+from modules import data_ingest
+from modules.data_ingest import CSVSniffer, ExcelIngestor
+
+
+def _read(text):
+    buffer = io.BytesIO(text.encode('utf-8'))
+    settings = CSVSniffer().sniff(buffer)
+    buffer.seek(0)
+    return settings, pd.read_csv(buffer, **settings)
+
+
+@pytest.mark.parametrize('text', [
+    'name,city\nAlice,New York\nBob,Paris\n',
+    'name,age\nAlice,30\nBob,41\n',
+    'id;amount\n1;2,5\n2;3,75\n',
+])
+def test_header_is_kept(text):
+    settings, frame = _read(text)
+    assert settings['header'] == 0
+    assert list(frame.columns) == text.split('\n')[0].split(settings['sep'])
+
+
+def test_headerless_numeric_file():
+    settings, frame = _read('1,2.5,a\n2,3.5,b\n3,4.5,c\n')
+    assert settings['header'] is None
+    assert len(frame) == 3
+
+
+def test_semicolon_and_comma_decimal():
+    settings, frame = _read('product;price\napple;1,25\npear;1.234,50\n')
+    assert settings['sep'] == ';'
+    assert settings['decimal'] == ','
+    assert settings['thousands'] == '.'
+    assert frame['price'].tolist() == [1.25, 1234.5]
+
+
+def _workbook():
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        pd.DataFrame({'a': [1, 2]}).to_excel(writer, sheet_name='first', index=False)
+        pd.DataFrame({'b': ['x', 'y', 'z']}).to_excel(writer, sheet_name='second', index=False)
+    return buffer.getvalue()
+
+
+def test_excel_sheets_are_parsed_once_and_cached(tmp_path, monkeypatch):
+    file_bytes = _workbook()
+    ingestor = ExcelIngestor(cache_dir=str(tmp_path))
+    assert ingestor.sheet_names(file_bytes) == ['first', 'second']
+    assert ingestor.load(file_bytes, 'second')['b'].tolist() == ['x', 'y', 'z']
+
+    def fail(*args, **kwargs):
+        raise AssertionError('workbook parsed again')
+
+    monkeypatch.setattr(pd, 'read_excel', fail)
+    frames = ExcelIngestor(cache_dir=str(tmp_path)).load_all(file_bytes)
+    assert list(frames) == ['first', 'second']
+    assert frames['first']['a'].tolist() == [1, 2]
+
+
+def test_excel_workbook_is_hashed_once_per_call(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(data_ingest, 'file_fingerprint', lambda file_bytes: calls.append(1) or 'workbook')
+    file_bytes = _workbook()
+    ExcelIngestor(cache_dir=str(tmp_path)).load(file_bytes, 'first')
+    assert len(calls) == 1
+    ExcelIngestor(cache_dir=str(tmp_path)).load(file_bytes, 'first', fingerprint='workbook')
+    assert len(calls) == 1
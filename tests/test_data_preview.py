@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from modules.data_preview import DataWindow
+from utils.row_sets import RowSet
+
+
+def test_sort_filter_and_page():
+    data = pd.DataFrame({'name': ['b', 'a', 'c', 'ab'], 'n': [2, 1, 3, 4]})
+    window = DataWindow(data, page_size=2)
+    page, total = window.get_page(1, sort_by='name', filter_column='name', filter_text='a')
+    assert total == 2
+    assert page['name'].tolist() == ['a', 'ab']
+    flagged = RowSet.from_mask(np.array([True, False, False, True]))
+    page, total = window.get_page(1, row_set=flagged)
+    assert page['n'].tolist() == [2, 4]
+
+
+def test_caches_are_bounded():
+    data = pd.DataFrame({'text': [str(number) for number in range(100)]})
+    window = DataWindow(data, max_cached=3)
+    for number in range(10):
+        window.view_positions(filter_column='text', filter_text=str(number))
+        window.view_positions(sort_by='text', ascending=number % 2 == 0)
+    assert len(window._filter_masks) == 3
+    assert list(window._filter_masks) == [('text', '7'), ('text', '8'), ('text', '9')]
+    assert len(window._sort_orders) == 2
+
+
+def _profile(index):
+    return {
+        'duplicates': {'duplicate_indices': RowSet.from_mask([False, True, False, False, True], index)},
+        'outlier_flags': {'any_outlier': RowSet.from_mask([False, False, False, True, False], index)},
+    }
+
+
+def test_flags_follow_rows_after_rows_are_removed():
+    base = pd.DataFrame({'n': range(5)}, index=[10, 11, 12, 13, 14])
+    profile = _profile(base.index)
+    flagged, stale = DataWindow(base).flagged_rows(profile)
+    assert (flagged.tolist(), stale) == ([11, 13, 14], 0)
+
+    # A cleaning step dropped rows 11 and 12
+    current = base.drop(index=[11, 12])
+    flagged, stale = DataWindow(current).flagged_rows(profile)
+    assert (flagged.tolist(), stale) == ([13, 14], 0)
+    page, total = DataWindow(current).get_page(1, row_set=flagged)
+    assert page['n'].tolist() == [3, 4]
+
+
+def test_unmatchable_flags_are_reported_as_stale():
+    profile = _profile(None)
+    current = pd.DataFrame({'n': range(3)})
+    flagged, stale = DataWindow(current).flagged_rows(profile)
+    assert len(flagged) == 0
+    assert stale == 2
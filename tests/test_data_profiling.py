@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from modules.data_profiling import DataProfiler
+
+
+def test_infinite_values_are_counted_not_histogrammed():
+    data = pd.DataFrame({'x': [1.0, 2.0, np.inf, -np.inf, 3.0, np.nan, 4.0, 100.0], 'y': range(8)})
+    distribution = DataProfiler().generate_profile(data)['distributions']['x']
+    assert distribution['infinite_count'] == {'positive': 1, 'negative': 1}
+    assert sum(distribution['histogram']['counts']) == 5
+    assert np.isfinite(distribution['histogram']['edges']).all()
+
+
+def test_profile_sections():
+    data = pd.DataFrame({
+        'amount': ['1,200', '35', '4,000', '12'] * 5,
+        'code': ['AB-1234'] * 18 + ['1234-AB'] * 2,
+        'day': ['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04'] * 5,
+        'value': [1.0, 2.0, 3.0, 50.0] * 5
+    })
+    profile = DataProfiler().generate_profile(data)
+    assert profile['type_inference']['amount']['inferred_type'] == 'integer'
+    assert profile['patterns']['code']['patterns'][0] == {
+        'pattern': 'AA-9999', 'count': 18, 'percentage': 90.0, 'examples': ['AB-1234']
+    }
+    assert profile['datetimes']['day']['format'] == '%Y-%m-%d'
+    assert profile['duplicates']['count'] == 14
+    assert profile['validation'] is None
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.data_profiling import DataProfiler
+from modules.datetime_parsing import DateTimeParser
+
+
+def test_infers_day_first_format():
+    series = pd.Series(['25/12/2024', '01/02/2024', '13/03/2023'], name='eu')
+    assert DateTimeParser().format_for(series) == '%d/%m/%Y'
+
+
+def test_fixed_width_decoding_matches_pandas():
+    values = pd.Series(['2024-02-29 23:59:59', '1999-12-31 00:00:00', '2024-02-30 10:00:00',
+                        '2024-13-01 10:00:00', '2024-01-01 24:00:00', None])
+    parsed = DateTimeParser().parse_values(values, '%Y-%m-%d %H:%M:%S')
+    expected = pd.to_datetime(values, format='%Y-%m-%d %H:%M:%S', errors='coerce')
+    assert parsed.tolist() == expected.tolist()
+
+
+def test_unpadded_and_padded_values_are_retried():
+    parsed = DateTimeParser().parse_values(pd.Series([' 2024-01-07', '5/1/2024']), '%Y-%m-%d')
+    assert parsed.iloc[0] == pd.Timestamp('2024-01-07')
+    assert pd.isna(parsed.iloc[1])
+
+
+def test_non_ascii_text_does_not_crash():
+    values = pd.Series(['Straße 12', 'Königsallee 3', '2024-01-05'])
+    parsed = DateTimeParser().parse_values(values, '%Y-%m-%d')
+    assert parsed.isna().tolist() == [True, True, False]
+
+    profile = DataProfiler().generate_profile(pd.DataFrame({'addr': ['Straße 12', 'Königsallee 3']}))
+    assert profile['datetimes'] == {}
+
+
+@pytest.mark.parametrize('fmt', ['%Y-%m-%d', 'ISO8601'])
+def test_years_outside_nanosecond_range_become_nat(fmt):
+    values = pd.Series(['9999-12-31', '1500-01-01', '2020-01-01'])
+    parsed = DateTimeParser().parse_values(values, fmt)
+    assert parsed.iloc[2] == pd.Timestamp('2020-01-01')
+    # Never wrapped around into another in-range date
+    assert all(pd.isna(value) or value.year in (9999, 1500) for value in parsed.iloc[:2])
+    if fmt != 'ISO8601':
+        assert parsed.iloc[:2].isna().all()
+
+
+def test_repeated_values_are_broadcast_with_missing():
+    dates = [f'2024-01-{day:02d}' for day in range(1, 10)]
+    series = pd.Series((dates + [None, 'bad']) * 50, name='d')
+    parsed = DateTimeParser().parse(series)
+    assert parsed.notna().sum() == 450
+    assert parsed.iloc[:9].tolist() == pd.to_datetime(dates).tolist()
+    assert parsed.name == 'd'
+
+
+def test_stale_cached_format_is_reinferred():
+    parser = DateTimeParser()
+    parser.remember_format('d', '%d/%m/%Y')
+    parsed = parser.parse(pd.Series(['2024-01-05', '2024-01-06'], name='d'))
+    assert parsed.notna().all()
+    assert parser.format_for(pd.Series([], name='d', dtype=object)) == '%Y-%m-%d'
+
+
+def test_profile_reports_timezone_mix_and_gaps():
+    parser = DateTimeParser()
+    tz = pd.Series(['2024-01-05T10:00:00+02:00', '2024-01-05T10:00:00Z', '2024-01-05T10:00:00'], name='tz')
+    profile = parser.profile(tz)
+    assert profile['mixed_timezones']
+    assert profile['timezones'] == {'+02:00': 1, 'Z': 1, 'none': 1}
+
+    dates = pd.Series([f'2024-01-{day:02d}' for day in range(1, 10)] + ['2024-06-01', '2099-01-01'], name='d')
+    profile = parser.profile(dates, now=pd.Timestamp('2025-01-01'))
+    assert profile['future_count'] == 1
+    assert profile['large_gap_count'] == 2
+    assert profile['max_gap_start'] == pd.Timestamp('2024-06-01')
+    assert profile['failed_count'] == 0
+
+
+def test_to_iso_and_extract_parts():
+    parser = DateTimeParser()
+    series = pd.Series(['25/12/2024', None], name='eu')
+    assert parser.to_iso(series).tolist()[0] == '2024-12-25'
+    parts = parser.extract_parts(series, ['year', 'quarter'])
+    assert list(parts.columns) == ['eu_year', 'eu_quarter']
+    assert parts['eu_year'].dtype == 'Int16'
+    assert parts.iloc[0].tolist() == [2024, 4]
+    with pytest.raises(ValueError):
+        parser.extract_parts(series, ['century'])
@@ -0,0 +1,27 @@
+import pandas as pd
+import pytest
+
+from modules.fuzzy_dedup import FuzzyDeduplicator
+
+
+def test_clusters_near_duplicates_after_normalization():
+    data = pd.DataFrame({
+        'name': ['Acme Corporation', 'acme  corporation', 'Acme Corporatio', 'Globex Inc', 'Initech'],
+        'city': ['Paris', 'PARIS', 'Paris', 'Lyon', 'Nice']
+    }, index=[10, 11, 12, 13, 14])
+    result = FuzzyDeduplicator(key_columns=['name', 'city'], similarity_threshold=0.7).find_clusters(data)
+    ids = result['cluster_ids']
+    assert ids[0] == ids[1] == ids[2] != -1
+    assert ids[3] == ids[4] == -1
+    assert result['cluster_count'] == 1
+    assert result['rows_in_clusters'] == 3
+    assert result['redundant_rows'].tolist() == [11, 12]
+
+
+def test_distinct_rows_and_configuration():
+    data = pd.DataFrame({'name': ['alpha', 'bravo', 'charlie']})
+    result = FuzzyDeduplicator().find_clusters(data)
+    assert result['cluster_count'] == 0
+    assert (result['cluster_ids'] == -1).all()
+    with pytest.raises(ValueError):
+        FuzzyDeduplicator(num_perm=10, bands=3)
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.imputation import Imputer
+
+
+def _frame():
+    return pd.DataFrame({
+        'region': ['north', 'north', 'north', 'south', 'south', 'south', 'east'],
+        'value': [1.0, np.nan, 3.0, 100.0, np.nan, 300.0, np.nan],
+        'label': ['a', None, 'a', 'b', 'b', None, None]
+    })
+
+
+def test_global_strategy_uses_median_and_mode():
+    data, report = Imputer().impute(_frame())
+    assert data['value'].tolist()[1] == 51.5
+    assert data['label'].notna().all()
+    assert report['missing_values_handled'] == 6
+    assert report['columns'] == ['value', 'label']
+
+
+def test_group_strategy_falls_back_to_global_values():
+    data, report = Imputer('group', group_by='region').impute(_frame())
+    assert data['value'].tolist() == [1.0, 2.0, 3.0, 100.0, 200.0, 300.0, 51.5]
+    assert data['label'].tolist()[:6] == ['a', 'a', 'a', 'b', 'b', 'b']
+    assert data['label'].notna().all()
+    assert 'region' not in report['columns']
+
+
+def test_knn_strategy_averages_nearest_rows():
+    data = pd.DataFrame({'x': [0.0, 0.1, 10.0, 10.1, 0.05, 10.05],
+                         'y': [1.0, 1.0, 5.0, 5.0, np.nan, np.nan]})
+    data, report = Imputer('knn', n_neighbors=2, neighbor_eps=0).impute(data)
+    assert data['y'].tolist()[4:] == [1.0, 5.0]
+    assert report['operations'][0].endswith('KNN (k=2)')
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        Imputer('mean')
+    with pytest.raises(ValueError):
+        Imputer('group')
+    data, report = Imputer().impute(pd.DataFrame({'a': [1, 2]}))
+    assert report['missing_values_handled'] == 0
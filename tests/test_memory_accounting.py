@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from utils.memory_accounting import MemoryAccountant
+
+
+def _frame(rows=5000):
+    return pd.DataFrame({
+        'number': np.arange(rows, dtype=np.int64),
+        'text': pd.Series([f'value {i}' * (i % 5 + 1) for i in range(rows)], dtype=object),
+        'category': pd.Categorical(['a', 'b'] * (rows // 2))
+    })
+
+
+def test_exact_summary_matches_pandas():
+    data = _frame()
+    summary = MemoryAccountant().summary(data, exact=True)
+    assert summary['exact'] and summary['error_bytes'] == 0
+    assert summary['total_bytes'] == int(data.memory_usage(index=True, deep=True).sum())
+
+
+def test_sampled_estimate_is_within_its_error_bound():
+    data = _frame(50000)
+    actual = int(data['text'].memory_usage(index=False, deep=True))
+    summary = MemoryAccountant(sample_size=1000).summary(data, exact=False)
+    assert not summary['exact']
+    assert abs(summary['by_column']['text'] - actual) <= summary['error_bytes']
+
+
+def test_cache_is_reused_until_invalidated():
+    accountant = MemoryAccountant()
+    data = _frame()
+    before = accountant.total_bytes(data)
+    data['text'] = data['text'] + ' longer suffix'
+    assert accountant.total_bytes(data) == before
+    accountant.invalidate(data, ['text'])
+    assert accountant.total_bytes(data) > before
+
+
+def test_derive_carries_unchanged_columns():
+    accountant = MemoryAccountant()
+    source = _frame()
+    accountant.summary(source)
+    target = source.copy()
+    accountant.derive(source, target, changed_columns=['number'])
+    assert accountant._cache[id(target)]['columns']['text'] is accountant._cache[id(source)]['columns']['text']
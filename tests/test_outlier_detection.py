@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.outlier_detection import OutlierDetector
+
+
+def _frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'a': np.append(rng.normal(0, 1, 98), [50.0, -50.0]),
+        'b': np.append(rng.normal(0, 1, 99), np.nan),
+        'empty': np.nan,
+        'text': ['x'] * 100
+    }, index=[f'r{i}' for i in range(100)])
+
+
+def test_detect_reports_outliers_and_packed_flags():
+    outliers, flags = OutlierDetector().detect(_frame())
+    assert outliers['a']['count'] == 2
+    assert outliers['a']['outlier_indices'].tolist() == ['r98', 'r99']
+    assert flags['columns'] == ['a', 'b']
+    matrix = OutlierDetector.unpack_flags(flags)
+    assert matrix.shape == (100, 2)
+    assert matrix[98:, 0].all()
+    # NaN never flags
+    assert not matrix[99, 1]
+    assert set(flags['any_outlier'].tolist()) >= {'r98', 'r99'}
+
+
+def test_per_column_methods():
+    detector = OutlierDetector(column_methods={'a': 'percentile'}, percentile_range=(0.05, 0.95))
+    lower, upper = detector.bounds(_frame()[['a', 'b']])
+    assert lower['a'] == _frame()['a'].quantile(0.05)
+    assert upper['b'] == pytest.approx(_frame()['b'].quantile(0.75) + 1.5 * (
+        _frame()['b'].quantile(0.75) - _frame()['b'].quantile(0.25)))
+
+
+def test_no_numeric_columns_and_unknown_methods():
+    outliers, flags = OutlierDetector().detect(pd.DataFrame({'text': ['x', 'y']}))
+    assert outliers == {}
+    assert OutlierDetector.unpack_flags(flags).shape == (2, 0)
+    with pytest.raises(ValueError):
+        OutlierDetector('median')
+    with pytest.raises(ValueError):
+        OutlierDetector(column_methods={'a': 'median'}).detect(_frame())
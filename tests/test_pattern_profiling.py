@@ -0,0 +1,32 @@
+import pandas as pd
+
+from modules.pattern_profiling import PatternProfiler
+
+
+def test_masks_map_character_classes_and_truncate():
+    profiler = PatternProfiler(max_mask_length=5)
+    masks = profiler.masks(pd.Series(['AB-12', 'ab 9é', 'Abcdefgh']))
+    assert masks.tolist() == ['AA-99', 'aa 9a', 'Aaaaa…']
+
+
+def test_profile_weights_patterns_by_row_counts():
+    frequencies = pd.Series({'AB-1234': 90, 'CD-5678': 2, '1234-XY': 8})
+    profile = PatternProfiler(max_examples=1).profile(frequencies)
+    assert profile['rows'] == 100
+    assert profile['distinct_patterns'] == 2
+    assert profile['patterns'][0] == {'pattern': 'AA-9999', 'count': 92, 'percentage': 92.0,
+                                      'examples': ['AB-1234']}
+    assert PatternProfiler.summary(profile) == 'AA-9999 92%, 9999-AA 8%'
+    assert PatternProfiler().profile(pd.Series(dtype='int64')) is None
+
+
+def test_known_formats_and_minimum_share():
+    frequencies = pd.Series({'a@example.com': 8, 'b@example.org': 1, '12345': 1})
+    profile = PatternProfiler().profile(frequencies)
+    assert profile['formats']['email']['count'] == 9
+    assert profile['dominant_format'] == 'email'
+    # A zip code is also an integer; both formats are reported
+    assert {'us_zip', 'integer'} <= set(profile['formats'])
+
+    strict = PatternProfiler(min_format_share=0.5).profile(frequencies)
+    assert set(strict['formats']) == {'email'}
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.profiling_backends import DuckDBBackend, PandasBackend
+
+
+@pytest.mark.parametrize('value, literal', [
+    (1.5, '1.5'),
+    (np.inf, "'inf'::DOUBLE"),
+    (-np.inf, "'-inf'::DOUBLE"),
+    (np.nan, 'CAST(NULL AS DOUBLE)'),
+])
+def test_duckdb_float_literals(value, literal):
+    assert DuckDBBackend._float(value) == literal
+
+
+def test_pandas_histograms_skip_infinities():
+    backend = PandasBackend(pd.DataFrame({'x': [1.0, 2.0, np.inf, -np.inf, np.nan]}))
+    counts, edges = backend.histograms(['x'], 4)['x']
+    assert counts.sum() == 2
+    assert backend.infinite_counts(['x'])['x'].tolist() == [1, 1]
+
+
+def test_duckdb_matches_pandas():
+    pytest.importorskip('duckdb')
+    data = pd.DataFrame({'x': [1.0, 2.0, 3.0, 100.0, np.nan, np.inf], 'label': ['a', 'b', 'a', None, 'a', 'c']})
+    duck, pandas_backend = DuckDBBackend(data), PandasBackend(data)
+    assert duck.null_counts().to_dict() == pandas_backend.null_counts().to_dict()
+    lower = pd.Series({'x': 0.0})
+    upper = pd.Series({'x': np.nan})
+    # A NaN bound flags nothing
+    assert duck.count_outside(lower, upper)['x'] == 0
+    assert duck.value_frequencies('label').to_dict() == pandas_backend.value_frequencies('label').to_dict()
+
+
+def test_duckdb_outlier_samples_are_drawn_from_outliers_only():
+    pytest.importorskip('duckdb')
+    values = np.arange(100000, dtype=np.float64)
+    values[::1000] = 1e9
+    duck = DuckDBBackend(pd.DataFrame({'x': values}))
+    samples = duck.outlier_samples(pd.Series({'x': -1.0}), pd.Series({'x': 1e6}), size=20)['x']
+    assert len(samples) == 20
+    assert (samples == 1e9).all()
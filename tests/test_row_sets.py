@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.row_sets import RowSet
+
+
+def test_round_trips_masks_of_any_length():
+    for size in (0, 1, 7, 8, 9, 1001):
+        mask = np.arange(size) % 3 == 0
+        row_set = RowSet.from_mask(mask)
+        assert np.array_equal(row_set.to_mask(), mask)
+        assert len(row_set) == int(mask.sum())
+        assert row_set.nbytes == (size + 7) // 8
+
+
+def test_set_algebra_matches_boolean_masks():
+    a = RowSet.from_positions([0, 2, 4, 9], 10)
+    b = RowSet.from_positions([2, 3, 9], 10)
+    assert (a | b).positions().tolist() == [0, 2, 3, 4, 9]
+    assert (a & b).positions().tolist() == [2, 9]
+    assert (a - b).positions().tolist() == [0, 4]
+    assert RowSet.union_all([a, b]) == a | b
+    assert RowSet.intersection_all([a, b]) == a & b
+    assert not RowSet.empty(10)
+
+
+def test_empty_union_and_mismatched_sizes():
+    assert len(RowSet.union_all([], size=5)) == 0
+    with pytest.raises(ValueError):
+        RowSet.from_positions([1], 10) | RowSet.from_positions([1], 11)
+
+
+def test_labels_use_the_attached_index():
+    index = pd.Index(['a', 'b', 'c', 'd'])
+    row_set = RowSet.from_mask([False, True, False, True], index)
+    assert row_set.tolist() == ['b', 'd']
+    assert row_set.tolist(limit=1) == ['b']
+    assert RowSet.from_mask([True, False]).tolist() == [0]
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.rule_validation import RuleValidator, fullmatch_all
+
+
+@pytest.fixture
+def data():
+    return pd.DataFrame({
+        'age': [25, -1, 130, None, 40],
+        'start': ['2024-01-01', '2024-02-01', '2024-03-01', '2024-04-01', 'bad'],
+        'end': ['2024-01-05', '2024-01-15', '2024-03-01', None, '2024-05-01'],
+        'country': ['FR', 'fr', 'DE', 'XX', None],
+        'email': ['a@b.com', 'A@B.COM', 'nope', 'x@y.org', None]
+    })
+
+
+def test_rule_types(data):
+    result = RuleValidator([
+        {'type': 'range', 'column': 'age', 'min': 0, 'max': 120, 'name': 'age'},
+        {'type': 'compare', 'left': 'end', 'op': '>=', 'right': 'start', 'name': 'dates'},
+        {'type': 'in_set', 'column': 'country', 'values': ['FR', 'DE'], 'name': 'country'},
+        {'type': 'in_set', 'column': 'country', 'values': ['fr', 'de'], 'case_sensitive': False, 'name': 'ci'},
+        {'type': 'regex', 'column': 'email', 'pattern': r'[a-z]+@[a-z]+\.[a-z]+', 'name': 'email'},
+    ]).validate(data)
+    rules = result['rules']
+    assert rules['age']['violations'] == 2
+    # 'bad' cannot be read as a date, so that row breaks the rule too
+    assert rules['dates']['violations'] == 2
+    assert rules['country']['violations'] == 2
+    assert rules['ci']['violations'] == 1
+    assert rules['email']['violations'] == 2
+    assert result['invalid_rows'].to_mask().sum() == result['invalid_row_count']
+
+
+def test_allow_missing_false(data):
+    result = RuleValidator([{'type': 'range', 'column': 'age', 'min': 0, 'allow_missing': False}]).validate(data)
+    assert list(result['rules'].values())[0]['violations'] == 2
+
+
+def test_inline_global_flags_are_not_fused(data):
+    result = RuleValidator([
+        {'type': 'regex', 'column': 'email', 'pattern': r'(?i)[a-z]+@[a-z]+\.[a-z]+', 'name': 'ci'},
+        {'type': 'regex', 'column': 'email', 'pattern': r'[a-z]+@[a-z]+\.com', 'name': 'com'},
+    ]).validate(data)
+    assert result['rules']['ci']['violations'] == 1
+    assert result['rules']['com']['violations'] == 3
+
+
+def test_fullmatch_all_matches_each_pattern_separately():
+    text = pd.Series(['abc', 'ABC', '123', 'aa'])
+    patterns = {'lower': r'[a-z]+', 'digits': r'\d+', 'double': r'(\w)\1', 'flags': r'(?i)abc'}
+    verdicts = fullmatch_all(text, patterns)
+    for name, pattern in patterns.items():
+        expected = text.str.fullmatch(pattern).to_numpy(dtype=bool)
+        assert np.array_equal(verdicts[name], expected), name
+
+
+def test_invalid_rules_raise():
+    with pytest.raises(ValueError):
+        RuleValidator([{'type': 'unknown', 'column': 'a'}])
+    with pytest.raises(ValueError):
+        RuleValidator([{'type': 'range', 'column': 'a'}])
+    with pytest.raises(ValueError):
+        RuleValidator([{'type': 'compare', 'left': 'a', 'op': '=>', 'right': 'b'}])
@@ -0,0 +1,89 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.row_sets import RowSet
+from utils.serialization import from_json, from_msgpack, to_json, to_msgpack
+
+
+def _payload():
+    return {
+        'counts': {1: 'one', (2, 3): 'pair'},
+        'values': np.array([[1.5, np.nan], [3.0, 4.0]]),
+        'labels': np.array(['a', None], dtype=object),
+        'rows': RowSet.from_mask([True, False, True], pd.Index(['x', 'y', 'z'])),
+        'range': pd.RangeIndex(0, 10, 2, name='r'),
+        'bounds': (float('-inf'), float('inf')),
+        'tags': {'a'},
+        'when': pd.Timestamp('2024-01-02 03:04', tz='UTC'),
+        'missing': [pd.NaT, pd.NA, None],
+        'gap': pd.Timedelta('1h'),
+    }
+
+
+def _check(restored):
+    assert restored['counts'] == {1: 'one', (2, 3): 'pair'}
+    assert np.array_equal(restored['values'], _payload()['values'], equal_nan=True)
+    assert restored['labels'].tolist() == ['a', None]
+    assert restored['rows'].tolist() == ['x', 'z']
+    assert restored['range'].equals(pd.RangeIndex(0, 10, 2)) and restored['range'].name == 'r'
+    assert restored['bounds'] == (float('-inf'), float('inf'))
+    assert restored['tags'] == {'a'}
+    assert restored['when'] == pd.Timestamp('2024-01-02 03:04', tz='UTC')
+    assert restored['missing'][0] is pd.NaT and restored['missing'][1] is pd.NA
+    assert restored['gap'] == pd.Timedelta('1h')
+
+
+def test_json_round_trip_keeps_types():
+    text = to_json(_payload(), 'profile')
+    assert json.loads(text)['kind'] == 'profile'
+    _check(from_json(text, 'profile'))
+
+
+def test_msgpack_round_trip_keeps_types():
+    pytest.importorskip('msgpack')
+    _check(from_msgpack(to_msgpack(_payload(), 'profile'), 'profile'))
+
+
+def test_rejects_foreign_or_newer_payloads():
+    with pytest.raises(ValueError):
+        from_json(to_json({}, 'report'), 'profile')
+    with pytest.raises(ValueError):
+        from_json(json.dumps({'format': 'other', 'data': {}}))
+    payload = json.loads(to_json({}, 'profile'))
+    payload['schema_version'] += 1
+    with pytest.raises(ValueError):
+        from_json(json.dumps(payload))
+    with pytest.raises(TypeError):
+        to_json({'frame': pd.DataFrame()}, 'profile')
+
+
+def test_row_index_is_written_once_per_payload():
+    from modules.data_profiling import DataProfiler
+
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(rng.standard_t(3, (20000, 10)), columns=[f'c{i}' for i in range(10)],
+                        index=[f'row-{i}' for i in range(20000)])
+    profile = DataProfiler().generate_profile(data)
+    text = to_json(profile, 'profile')
+    assert text.count('"row-19999"') == 1
+    assert len(text) < 2 * len(to_json({'index': data.index}, 'index'))
+
+    restored = from_json(text, 'profile')
+    row_sets = [info['outlier_indices'] for info in restored['outliers'].values()]
+    assert len(row_sets) > 1
+    assert all(row_set.index is row_sets[0].index for row_set in row_sets)
+    assert row_sets[0].index.equals(data.index)
+
+
+def test_reads_version_1_payloads_with_inline_indexes():
+    payload = {
+        'format': 'data-cleaning-system', 'kind': 'profile', 'schema_version': 1,
+        'data': {'rows': {'__type__': 'rowset', 'size': 3, 'bits': 'oA==', 'index': {
+            '__type__': 'index', 'name': None,
+            'values': {'__type__': 'ndarray', 'dtype': 'object', 'shape': [3], 'items': ['x', 'y', 'z']}
+        }}}
+    }
+    assert from_json(json.dumps(payload), 'profile')['rows'].tolist() == ['x', 'z']
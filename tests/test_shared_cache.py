@@ -0,0 +1,87 @@
+import threading
+
+import pandas as pd
+
+from modules.shared_cache import SharedCache
+
+
+def _cache(tmp_path, budget=1500):
+    return SharedCache(memory_budget=budget, spill_dir=str(tmp_path))
+
+
+def test_lru_spills_to_disk_and_promotes_back(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put("profiles", "a", "x" * 600)
+    cache.put("profiles", "b", "y" * 600)
+    cache.put("profiles", "c", "z" * 600)
+    stats = cache.stats()["namespaces"]["profiles"]
+    assert stats["memory_entries"] == 2 and stats["disk_entries"] == 1
+    assert cache.get("profiles", "a") == "x" * 600
+    assert cache.stats()["namespaces"]["profiles"]["disk_hits"] == 1
+
+
+def test_spill_io_runs_outside_the_lock(tmp_path, monkeypatch):
+    cache = _cache(tmp_path)
+    cache.put("frames", "a", "x" * 600)
+    cache.put("frames", "b", "y" * 600)
+    lock_free = []
+    original = pd.to_pickle
+
+    def checking_to_pickle(value, path):
+        # Another thread must be able to take the lock while a spill is written
+        acquired = []
+
+        def try_lock():
+            acquired.append(cache._lock.acquire(timeout=1))
+            if acquired[0]:
+                cache._lock.release()
+
+        thread = threading.Thread(target=try_lock)
+        thread.start()
+        thread.join()
+        lock_free.append(acquired[0])
+        original(value, path)
+
+    monkeypatch.setattr(pd, "to_pickle", checking_to_pickle)
+    cache.put("frames", "c", "z" * 600)
+    assert lock_free == [True]
+    assert cache.get("frames", "a") == "x" * 600
+
+
+def test_put_replaces_the_disk_copy(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put("frames", "a", "old" * 200)
+    cache.put("frames", "b", "y" * 600)
+    cache.put("frames", "c", "z" * 600)  # Spills 'a'
+    cache.put("frames", "a", "new" * 200)  # Evicts and spills 'b'
+    cache.put("frames", "d", "w" * 600)  # Evicts and spills 'c'
+    cache.put("frames", "e", "v" * 600)  # Evicts the new 'a', which must replace the old file
+    assert cache.stats()["namespaces"]["frames"]["memory_entries"] == 2
+    assert cache.get("frames", "a") == "new" * 200
+
+
+def test_get_or_compute_computes_once(tmp_path):
+    cache = _cache(tmp_path, budget=10 ** 6)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return 42
+
+    threads = [threading.Thread(target=lambda: cache.get_or_compute("suggestions", "k", compute))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calls == [1]
+    assert cache.get("suggestions", "k") == 42
+
+
+def test_invalidate(tmp_path):
+    cache = _cache(tmp_path)
+    for key in "abc":
+        cache.put("frames", key, key * 600)
+    cache.invalidate("frames")
+    assert cache.get("frames", "a") is None
+    assert cache.stats()["disk_bytes"] == 0
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+from modules.streaming_cleaner import StreamingCleaner
+from utils.streaming_stats import DedupeIndex, FrequencyCounter, QuantileSketch, RowSample, row_hashes
+
+
+def test_row_hashes_ignore_int_float_differences():
+    ints = pd.DataFrame({'a': [1, 2], 'b': ['x', 'y']})
+    floats = pd.DataFrame({'a': [1.0, 2.0], 'b': ['x', 'y']})
+    assert np.array_equal(row_hashes(ints), row_hashes(floats))
+    assert row_hashes(ints)[0] != row_hashes(ints)[1]
+
+
+def test_quantile_sketch_is_bounded_and_exact_on_extremes():
+    sketch = QuantileSketch(capacity=1000)
+    assert np.isnan(sketch.quantile(0.5))
+    for start in range(0, 100000, 10000):
+        sketch.update(np.append(np.arange(start, start + 10000, dtype=float), np.nan))
+    assert sketch.count == 100000
+    assert (sketch.min, sketch.max) == (0, 99999)
+    assert len(sketch.sample()) == 1000
+    assert abs(sketch.quantile(0.5) - 50000) < 5000
+
+
+def test_frequency_counter_keeps_the_mode_when_trimmed():
+    counter = FrequencyCounter(max_items=2)
+    counter.update(pd.Series(['a'] * 5 + ['b', 'c', 'd', None]))
+    counter.update(pd.Series(['a', 'e', 'f', 'g']))
+    assert counter.mode() == 'a'
+    assert counter.missing == 1
+    assert counter.most_common(1).iloc[0] == 6
+    assert FrequencyCounter().mode() is None
+
+
+def test_dedupe_index_spans_batches_and_spills(tmp_path):
+    with DedupeIndex(memory_limit=2, spill_dir=str(tmp_path)) as index:
+        assert index.add_new(np.array([1, 2, 2, 3], dtype=np.uint64)).tolist() == [True, True, False, True]
+        assert index._connection is not None
+        assert index.add_new(np.array([3, 4, 1], dtype=np.uint64)).tolist() == [False, True, False]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_row_sample_is_bounded_and_spans_chunks():
+    sample = RowSample(capacity=100)
+    assert sample.sample() is None
+    for start in range(0, 10000, 1000):
+        sample.update(pd.DataFrame({'n': np.arange(start, start + 1000)}))
+    rows = sample.sample()
+    assert sample.rows == 10000
+    assert len(rows) == 100
+    assert rows['n'].is_unique
+    assert rows['n'].max() >= 5000
+
+
+def test_dedupe_index_matches_a_set_across_spills(tmp_path):
+    rng = np.random.default_rng(0)
+    pool = rng.integers(0, 2 ** 64, size=500, dtype=np.uint64)
+    seen = set()
+    with DedupeIndex(memory_limit=100, spill_dir=str(tmp_path)) as index:
+        for _ in range(10):
+            batch = rng.choice(pool, size=200)
+            expected = []
+            for value in batch.tolist():
+                expected.append(value not in seen)
+                seen.add(value)
+            assert index.add_new(batch).tolist() == expected
+
+
+def test_clean_file_removes_duplicates_across_chunks(tmp_path):
+    source = tmp_path / 'input.csv'
+    pd.DataFrame({
+        'id': [1, 2, 3, 1, 2, 4],
+        'value': [10.0, None, 30.0, 10.0, None, 40.0]
+    }).to_csv(source, index=False)
+
+    output = tmp_path / 'output.csv'
+    report = StreamingCleaner({'remove_duplicates': True, 'handle_missing': True},
+                              chunksize=2).clean_file(str(source), str(output))
+    cleaned = pd.read_csv(output)
+    assert report['rows_in'] == 6
+    assert report['duplicates_removed'] == 2
+    assert cleaned['id'].tolist() == [1, 2, 3, 4]
+    assert cleaned['value'].notna().all()
+
+
+def test_clean_file_fits_types_and_modes_across_chunks(tmp_path):
+    # Both columns are empty in the first chunk
+    source = tmp_path / 'input.csv'
+    pd.DataFrame({
+        'active': [None, None, 'yes', 'no', 'Y', 'n'],
+        'code': [None, None, 'b', 'a', 'B', None],
+        'value': [1, 2, 3, 4, 5, 6]
+    }).to_csv(source, index=False)
+
+    output = tmp_path / 'output.csv'
+    StreamingCleaner({'convert_types': True, 'standardize_text': True, 'handle_missing': True},
+                     chunksize=2).clean_file(str(source), str(output))
+    cleaned = pd.read_csv(output)
+    assert cleaned['active'].tolist()[2:] == [True, False, True, False]
+    assert cleaned['code'].tolist() == ['b', 'b', 'b', 'a', 'b', 'b']
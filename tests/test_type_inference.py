@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+from modules.data_cleaning import DataCleaner
+from modules.type_inference import TypeInferencer
+
+
+def _infer(values):
+    return TypeInferencer().infer_column(pd.Series(values, dtype=object))
+
+
+@pytest.mark.parametrize('values, expected', [
+    (['1', '2', '3', '40'], 'integer'),
+    (['1,234', '12,345.5', '7'], 'float'),
+    (['$1,200', '€35', '£4'], 'integer'),
+    (['yes', 'no', 'Y', 'n'], 'boolean'),
+    (['2024-01-05', '2024-02-06', '2024-03-07'], 'datetime'),
+])
+def test_infers_types(values, expected):
+    assert _infer(values)['inferred_type'] == expected
+
+
+@pytest.mark.parametrize('values', [
+    ['1,5', '2,25', '3,75'],          # Decimal commas are not thousands separators
+    ['02134', '00501', '10001'],      # Zero-padded codes keep their leading zeros
+    ['5%', '12.5%', '100%'],          # Percentages stay text
+])
+def test_value_changing_conversions_are_not_inferred(values):
+    inference = _infer(values * 10)
+    assert inference['inferred_type'] not in ('integer', 'float')
+
+    data = pd.DataFrame({'col': pd.Series(values * 10, dtype=object)})
+    cleaned, _ = DataCleaner()._convert_types(data.copy())
+    assert cleaned['col'].astype(str).tolist() == data['col'].tolist()
+
+
+def test_failed_values_are_reported_and_missing_after_convert():
+    inferencer = TypeInferencer()
+    series = pd.Series(['1', '2', '3', '4', '5', 'n/a', None], dtype=object)
+    inference = inferencer.infer_column(series)
+    assert inference['inferred_type'] == 'integer'
+    assert inference['failed_values'] == ['n/a']
+    converted = inferencer.convert(series, inference)
+    assert str(converted.dtype) == 'Int64'
+    assert converted.isna().sum() == 2
+
+
+@pytest.mark.parametrize('inferred_type', ['integer', 'datetime'])
+def test_convert_handles_all_missing_series(inferred_type):
+    series = pd.Series([None, None], dtype=object, index=[5, 6])
+    converted = TypeInferencer().convert(series, {'inferred_type': inferred_type, 'format': None})
+    assert converted.isna().all()
+    assert converted.index.tolist() == [5, 6]
+
+
+def test_convert_keeps_missing_booleans_missing():
+    series = pd.Series(['yes', None, 'no'], dtype=object)
+    converted = TypeInferencer().convert(series, {'inferred_type': 'boolean', 'format': None})
+    assert str(converted.dtype) == 'boolean'
+    assert converted.isna().tolist() == [False, True, False]
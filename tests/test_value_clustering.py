@@ -0,0 +1,40 @@
+import pandas as pd
+
+from modules.value_clustering import ValueClusterer
+
+
+def test_merges_spelling_variants():
+    series = pd.Series(['New York'] * 5 + ['new-york'] * 2 + ['New Yrok', 'Boston', 'Boston'])
+    clusters = ValueClusterer().cluster_column(series)
+    assert len(clusters) == 1
+    assert clusters[0]['canonical'] == 'New York'
+    assert set(clusters[0]['values']) == {'New York', 'new-york', 'New Yrok'}
+    assert clusters[0]['rows_affected'] == 3
+
+
+def test_different_digits_are_different_values():
+    series = pd.Series(['10001', '10002', '10003', '20001'] * 10)
+    assert ValueClusterer().cluster_column(series) == []
+    series = pd.Series(['Room 12'] * 5 + ['Rom 12', 'Room 13'])
+    clusters = ValueClusterer().cluster_column(series)
+    assert clusters[0]['values'] == ['Room 12', 'Rom 12']
+
+
+def test_id_columns_are_not_clustered():
+    series = pd.Series([f'ID{number:04d}' for number in range(2000)])
+    assert ValueClusterer().cluster_column(series) == []
+
+
+def test_members_are_not_chained():
+    # 'abcdefghij' -> 'abcdefghiX' -> 'abcdefghXX': the last is two edits from the centre
+    series = pd.Series(['abcdefghij'] * 5 + ['abcdefghik'] * 3 + ['abcdefghkk'] * 2)
+    clusters = ValueClusterer(max_edit_ratio=0.1).cluster_column(series)
+    members = {value for cluster in clusters for value in cluster['values']}
+    assert 'abcdefghkk' not in members
+    assert clusters[0]['canonical'] == 'abcdefghij'
+
+
+def test_build_mapping_points_to_canonical():
+    clusterer = ValueClusterer()
+    clusters = clusterer.cluster_column(pd.Series(['Alpha'] * 3 + ['alpha', 'ALPHA ']))
+    assert clusterer.build_mapping(clusters) == {'alpha': 'Alpha', 'ALPHA ': 'Alpha'}
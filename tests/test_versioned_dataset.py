@@ -0,0 +1,57 @@
+import pandas as pd
+import pytest
+
+from modules.versioned_dataset import VersionedDataset
+
+
+def _base():
+    return pd.DataFrame({'a': [1, 2, 3, 4], 'b': ['w', 'x', 'y', 'z']}, index=[10, 20, 30, 40])
+
+
+def test_steps_store_only_changed_columns():
+    dataset = VersionedDataset(_base())
+    current = dataset.frame()
+    dataset.apply(current.assign(a=current['a'] * 10), 'scale a')
+    current = dataset.frame()
+    dataset.apply(current[current['a'] > 10].assign(c=1), 'filter rows')
+
+    history = dataset.history()
+    assert [entry['columns_changed'] for entry in history] == [[], ['a'], ['c']]
+    assert history[2]['rows_removed'] == 1
+    assert dataset.frame().index.tolist() == [20, 30, 40]
+    assert dataset.frame(1)['a'].tolist() == [10, 20, 30, 40]
+    assert dataset.frame(0).equals(_base())
+
+
+def test_undo_redo_and_rematerialization():
+    dataset = VersionedDataset(_base())
+    dataset.apply(dataset.frame().assign(b='q'), 'overwrite b')
+    assert dataset.undo() == 0
+    assert dataset.frame().equals(_base())
+    assert dataset.redo() == 1
+    assert dataset.frame()['b'].tolist() == ['q'] * 4
+    with pytest.raises(ValueError):
+        dataset.redo()
+    dataset.undo()
+    dataset.apply(dataset.frame().assign(a=0), 'zero a')
+    # A new step clears the redo stack
+    assert not dataset.can_redo()
+    with pytest.raises(ValueError):
+        dataset.frame(5)
+
+
+def test_compare_counts_rows_and_cells():
+    dataset = VersionedDataset(_base())
+    current = dataset.frame()
+    dataset.apply(current.drop(index=10).assign(a=[2, 3, 0]), 'drop and edit', metadata={'by': 'test'})
+    comparison = dataset.compare(0)
+    assert comparison['rows_only_in_version'] == 1
+    assert comparison['cells_changed'] == {'a': 1}
+    assert dataset.metadata() == {'by': 'test'}
+    assert dataset.nbytes() > 0
+
+
+def test_rejects_reordered_results():
+    dataset = VersionedDataset(_base())
+    with pytest.raises(ValueError):
+        dataset.apply(dataset.frame().iloc[[1, 0]], 'reorder')
@@ -0,0 +1,33 @@
+import queue
+
+import pytest
+
+from modules.warm_worker import WarmWorker
+
+
+def test_stale_replies_are_discarded():
+    worker = WarmWorker(modules=(), load_whisper=False)
+    # A reply to an earlier request that timed out arrives first
+    worker._responses.put(("earlier", True, "old text"))
+    worker._responses.put(("current", True, "new text"))
+    assert worker._receive("current", timeout=5) == (True, "new text")
+
+
+def test_missing_reply_times_out():
+    worker = WarmWorker(modules=(), load_whisper=False)
+    worker._responses.put(("earlier", True, "old text"))
+    with pytest.raises(queue.Empty):
+        worker._receive("current", timeout=0.2)
+
+
+def test_worker_reports_ready():
+    worker = WarmWorker(modules=(), load_whisper=False).start()
+    try:
+        assert worker.wait_ready(timeout=30)
+    finally:
+        worker.stop()
+
+
+def test_worker_is_never_forked_from_the_server():
+    worker = WarmWorker(modules=(), load_whisper=False)
+    assert worker._context.get_start_method() in ('forkserver', 'spawn')
@@ -27,6 +27,8 @@ def get_data_quality_score(df):
     final_score = (missing_score * 0.6 + duplicate_score * 0.4) * 100
 
     return round(final_score, 2)
+import codecs
+
 import pandas as pd
 import numpy as np
 
@@ -50,14 +52,64 @@ def get_data_quality_score(data):
     quality_score = 100 - missing_penalty - duplicate_penalty
     return max(0, min(100, quality_score))
 
-def detect_file_encoding(file_path):
-    """Detect file encoding"""
+def read_file_samples(file_obj, sample_size=65536):
+    """
+    Read bounded byte samples from the head, middle and tail of a seekable
+    binary file object. The file position is restored afterwards.
+    """
+    position = file_obj.tell()
+    file_obj.seek(0, 2)
+    file_size = file_obj.tell()
+
+    samples = []
+    offsets = [0]
+    if file_size > sample_size:
+        offsets += [max(0, file_size // 2 - sample_size // 2), max(0, file_size - sample_size)]
+    for offset in offsets:
+        file_obj.seek(offset)
+        samples.append(file_obj.read(sample_size))
+
+    file_obj.seek(position)
+    return samples
+
+def _is_utf8_sample(sample):
+    """UTF-8 check that tolerates a multi-byte character cut at either end"""
+    start = 0
+    while start < min(3, len(sample)) and 0x80 <= sample[start] <= 0xBF:
+        start += 1
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        decoder.decode(sample[start:], final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+def detect_encoding_from_samples(samples):
+    """Detect the encoding of byte samples (BOM, then UTF-8, then chardet, then cp1252)"""
+    head = samples[0] if samples else b''
+    if head.startswith(b'\xef\xbb\xbf'):
+        return 'utf-8-sig'
+    if head.startswith((b'\xff\xfe', b'\xfe\xff')):
+        return 'utf-16'
+
+    if all(_is_utf8_sample(sample) for sample in samples):
+        return 'utf-8'
+
     try:
         import chardet
+        result = chardet.detect(b''.join(samples))
+        if result['encoding'] and result['confidence'] > 0.5:
+            return result['encoding']
+    except ImportError:
+        pass
+    return 'cp1252'
+
+def detect_file_encoding(file_path, sample_size=65536):
+    """Detect file encoding from bounded head/middle/tail samples"""
+    try:
         with open(file_path, 'rb') as f:
-            result = chardet.detect(f.read())
-        return result['encoding']
-    except:
+            return detect_encoding_from_samples(read_file_samples(f, sample_size))
+    except OSError:
         return 'utf-8'
 
 def safe_convert_numeric(series):
@@ -69,10 +121,13 @@ def safe_convert_numeric(series):
 
 def get_memory_usage(data):
     """Get detailed memory usage information"""
-    memory_usage = data.memory_usage(deep=True)
+    from utils.memory_accounting import memory_accountant
+
+    memory_usage = memory_accountant.summary(data)
     return {
-        'total_mb': memory_usage.sum() / 1024**2,
-        'by_column': memory_usage.to_dict()
+        'total_mb': memory_usage['total_bytes'] / 1024**2,
+        'error_mb': memory_usage['error_bytes'] / 1024**2,
+        'by_column': memory_usage['by_column']
     }
 
 def suggest_sample_size(data_shape, target_mb=100):
@@ -85,3 +140,19 @@ def suggest_sample_size(data_shape, target_mb=100):
     else:
         suggested_rows = int((target_mb * 1024**2) / (total_cols * 8))
         return min(suggested_rows, total_rows)
+
+def downsample_for_plot(series, max_points=5000):
+    """
+    Downsample a numeric series for scatter/line charts.
+    Keeps the min and max of each bucket so spikes and outliers stay visible.
+    """
+    values = series.dropna()
+    if len(values) <= max_points:
+        return values
+
+    bucket_count = max_points // 2
+    buckets = np.arange(len(values)) * bucket_count // len(values)
+    # The series has a positional index, so idxmin/idxmax give row positions
+    grouped = pd.Series(values.to_numpy()).groupby(buckets)
+    keep = np.union1d(grouped.idxmin().to_numpy(), grouped.idxmax().to_numpy())
+    return values.iloc[keep]
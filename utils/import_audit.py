@@ -0,0 +1,106 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules imported on the first page render, plus the heavy optional ones
+DEFAULT_MODULES = (
+    "main",
+    "modules.data_profiling",
+    "modules.ai_suggestions",
+    "modules.data_cleaning",
+    "modules.report_generator",
+    "modules.instruction_parser",
+    "modules.voice_service",
+    "plotly.express",
+    "scipy.stats",
+    "openai",
+    "faster_whisper",
+)
+
+
+def measure_import(module, repeat=3, python=sys.executable):
+    """
+    Import `module` in fresh interpreters. Returns {'module', 'seconds',
+    'slowest', 'error'} where seconds is the best wall time over `repeat`
+    runs minus a bare interpreter start, and slowest lists the
+    (package, cumulative seconds) pairs reported by -X importtime.
+    """
+    baseline = min(_run(python, "pass")[0] for _ in range(repeat))
+    best, stderr, returncode = None, "", 0
+    for _ in range(repeat):
+        elapsed, stderr, returncode = _run(python, f"import {module}", importtime=True)
+        if returncode != 0:
+            break
+        best = elapsed if best is None else min(best, elapsed)
+
+    if returncode != 0:
+        error = [line for line in stderr.splitlines() if not line.startswith("import time:")]
+        return {"module": module, "seconds": None, "slowest": [], "error": error[-1] if error else "failed"}
+    return {
+        "module": module,
+        "seconds": max(best - baseline, 0.0),
+        "slowest": _parse_importtime(stderr, module),
+        "error": None
+    }
+
+
+def _run(python, code, importtime=False):
+    command = [python] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    start = time.perf_counter()
+    completed = subprocess.run(command, cwd=PROJECT_ROOT, capture_output=True, text=True)
+    return time.perf_counter() - start, completed.stderr, completed.returncode
+
+
+def _parse_importtime(stderr, module):
+    """
+    Packages pulled in by `module`, by their largest cumulative import time
+    (seconds), slowest first. The module itself and its parent packages are
+    left out so the list shows where its import time goes.
+    """
+    parts = module.split(".")
+    own_names = {".".join(parts[:end]) for end in range(1, len(parts) + 1)}
+    packages = {}
+    for line in stderr.splitlines():
+        fields = line[len("import time:"):].split("|")
+        if not line.startswith("import time:") or len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        name = fields[2].strip()
+        if name in own_names:
+            continue
+        root = name.split(".")[0]
+        packages[root] = max(packages.get(root, 0.0), int(fields[1]) / 1e6)
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit and benchmark import time of the app's modules")
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_MODULES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=5, help="Slowest packages listed per module")
+    parser.add_argument("--budget", type=float, default=None,
+                        help="Fail when importing 'main' takes longer than this many seconds")
+    args = parser.parse_args()
+
+    over_budget = False
+    for module in args.modules:
+        result = measure_import(module, repeat=args.repeat)
+        if result["error"]:
+            print(f"{module:<32} not importable: {result['error']}")
+            continue
+        print(f"{module:<32} {result['seconds']:7.3f}s")
+        for package, seconds in result["slowest"][:args.top]:
+            print(f"    {package:<28} {seconds:7.3f}s")
+        if module == "main" and args.budget is not None and result["seconds"] > args.budget:
+            over_budget = True
+
+    if over_budget:
+        print(f"Importing main exceeds the {args.budget:.2f}s budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
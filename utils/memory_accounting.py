@@ -0,0 +1,146 @@
+import sys
+import weakref
+
+import numpy as np
+import pandas as pd
+
+
+class MemoryAccountant:
+    """
+    Memory accounting for DataFrames without repeated deep scans.
+
+    Only object columns (and python-backed string columns) are expensive to
+    size, since every Python string has to be visited. Their sizes are
+    cached per frame and reused until the frame is invalidated. Large object
+    columns can be estimated from a random sample, in which case an
+    approximate 95% error bound is reported.
+    """
+
+    POINTER_BYTES = np.dtype(object).itemsize
+
+    def __init__(self, sample_size=2000, exact_row_limit=200000, random_state=42):
+        self.sample_size = sample_size
+        self.exact_row_limit = exact_row_limit  # Above this, 'auto' mode samples object columns
+        self.random_state = random_state
+        self._cache = {}  # id(frame) -> {'signature': ..., 'columns': {col: entry}}
+
+    def summary(self, data, exact=None):
+        """
+        Memory usage of a frame.
+
+        exact: True for exact deep sizes, False for sampled estimates,
+               None to pick based on row count.
+        """
+        entries = self._column_entries(data, exact)
+        by_column = {col: entry['bytes'] for col, entry in entries.items()}
+        return {
+            'total_bytes': int(sum(by_column.values())),
+            'error_bytes': int(sum(entry['error'] for entry in entries.values())),
+            'exact': all(entry['exact'] for entry in entries.values()),
+            'by_column': by_column
+        }
+
+    def total_bytes(self, data, exact=None):
+        return self.summary(data, exact)['total_bytes']
+
+    def invalidate(self, data, columns=None):
+        """Drop cached sizes after an in-place change (all columns by default)"""
+        cached = self._cache.get(id(data))
+        if cached is None:
+            return
+        if columns is None:
+            cached['columns'].clear()
+        else:
+            for col in columns:
+                cached['columns'].pop(col, None)
+
+    def derive(self, source, target, changed_columns=()):
+        """
+        Seed the cache of `target` from `source` when only some columns changed.
+
+        Cached object-column sizes are carried over for unchanged columns as
+        long as the row count is the same; everything else is resized lazily.
+        """
+        source_cache = self._cache.get(id(source))
+        if source_cache is None or len(source) != len(target):
+            return
+        changed_columns = set(changed_columns)
+        target_cache = self._get_cache(target)
+        for col, entry in source_cache['columns'].items():
+            if col in target.columns and col not in changed_columns:
+                target_cache['columns'].setdefault(col, entry)
+
+    def _get_cache(self, data):
+        key = id(data)
+        signature = (data.shape, tuple(data.columns))
+        cached = self._cache.get(key)
+        if cached is None or cached['signature'] != signature:
+            if cached is None:
+                # Drop the entry when the frame is garbage collected
+                weakref.finalize(data, self._cache.pop, key, None)
+            cached = {'signature': signature, 'columns': {}}
+            self._cache[key] = cached
+        return cached
+
+    def _column_entries(self, data, exact):
+        if exact is None:
+            exact = len(data) <= self.exact_row_limit
+
+        # Shallow usage is O(columns) and exact for every non-object dtype
+        shallow = data.memory_usage(index=True, deep=False)
+        cached = self._get_cache(data)['columns']
+        entries = {}
+        for col, shallow_bytes in shallow.items():
+            if col == 'Index':
+                entries[col] = self._entry(data.index.memory_usage(deep=True))
+                continue
+            series = data[col]
+            if not self._needs_deep_scan(series.dtype):
+                if isinstance(series.dtype, pd.CategoricalDtype) or not isinstance(series.dtype, np.dtype):
+                    # Extension dtypes size their own buffers cheaply
+                    entries[col] = self._entry(series.memory_usage(index=False, deep=True))
+                else:
+                    entries[col] = self._entry(shallow_bytes)
+                continue
+
+            entry = cached.get(col)
+            if entry is None or (exact and not entry['exact']):
+                if exact:
+                    entry = self._entry(series.memory_usage(index=False, deep=True))
+                else:
+                    entry = self._estimate_object_column(series)
+                cached[col] = entry
+            entries[col] = entry
+        return entries
+
+    def _needs_deep_scan(self, dtype):
+        """Columns whose deep size requires visiting every Python object"""
+        if pd.api.types.is_object_dtype(dtype):
+            return True
+        return isinstance(dtype, pd.StringDtype) and dtype.storage == 'python'
+
+    def _entry(self, nbytes, error=0, exact=True):
+        return {'bytes': int(nbytes), 'error': int(error), 'exact': exact}
+
+    def _estimate_object_column(self, series):
+        """Estimate deep size of an object column from a random sample"""
+        row_count = len(series)
+        if row_count <= self.sample_size:
+            return self._entry(series.memory_usage(index=False, deep=True))
+
+        rng = np.random.default_rng(self.random_state)
+        positions = rng.choice(row_count, size=self.sample_size, replace=False)
+        values = series.iloc[positions].to_numpy()
+        sizes = np.fromiter((sys.getsizeof(value) for value in values),
+                            dtype=np.float64, count=len(values))
+
+        mean_size = sizes.mean()
+        # 1.96 standard errors of the mean, scaled to the whole column
+        standard_error = sizes.std(ddof=1) / np.sqrt(len(sizes))
+        estimate = row_count * (self.POINTER_BYTES + mean_size)
+        error = 1.96 * standard_error * row_count
+        return self._entry(estimate, error, exact=False)
+
+
+# Process-wide accountant shared by the profiler, cleaner, report and UI
+memory_accountant = MemoryAccountant()
@@ -0,0 +1,113 @@
+import numpy as np
+
+
+class RowSet:
+    """
+    Compact set of row positions stored as a packed bitmap.
+
+    One bit per row of the source frame, so 10M rows cost 1.25 MB no matter
+    how many rows are flagged. Set algebra runs on the packed bytes; index
+    labels are only materialized when tolist() is called for display.
+    """
+
+    __slots__ = ('bits', 'size', 'index', '_count')
+
+    def __init__(self, bits, size, index=None):
+        self.bits = bits  # Packed uint8 bitmap (np.packbits layout)
+        self.size = int(size)  # Number of rows the bitmap covers
+        self.index = index  # Optional row labels of the source frame
+        self._count = None
+
+    @classmethod
+    def from_mask(cls, mask, index=None):
+        """Build a set from a boolean mask aligned with the source rows"""
+        mask = np.asarray(mask, dtype=bool)
+        return cls(np.packbits(mask), len(mask), index)
+
+    @classmethod
+    def from_positions(cls, positions, size, index=None):
+        """Build a set from integer row positions"""
+        mask = np.zeros(size, dtype=bool)
+        mask[np.asarray(positions, dtype=np.int64)] = True
+        return cls.from_mask(mask, index)
+
+    @classmethod
+    def empty(cls, size, index=None):
+        return cls(np.zeros((size + 7) // 8, dtype=np.uint8), size, index)
+
+    @classmethod
+    def union_all(cls, row_sets, size=None, index=None):
+        """Union of many sets, e.g. rows that are outliers in any column"""
+        row_sets = list(row_sets)
+        if not row_sets:
+            return cls.empty(size or 0, index)
+        bits = np.bitwise_or.reduce([row_set.bits for row_set in row_sets])
+        first = row_sets[0]
+        return cls(bits, first.size, index if index is not None else first.index)
+
+    @classmethod
+    def intersection_all(cls, row_sets):
+        """Intersection of many sets"""
+        row_sets = list(row_sets)
+        bits = np.bitwise_and.reduce([row_set.bits for row_set in row_sets])
+        return cls(bits, row_sets[0].size, row_sets[0].index)
+
+    def _check_compatible(self, other):
+        if self.size != other.size:
+            raise ValueError(
+                f"Row sets cover different row counts: {self.size} vs {other.size}"
+            )
+
+    def __or__(self, other):
+        self._check_compatible(other)
+        return RowSet(self.bits | other.bits, self.size, self.index)
+
+    def __and__(self, other):
+        self._check_compatible(other)
+        return RowSet(self.bits & other.bits, self.size, self.index)
+
+    def __sub__(self, other):
+        self._check_compatible(other)
+        return RowSet(self.bits & ~other.bits, self.size, self.index)
+
+    def __len__(self):
+        if self._count is None:
+            self._count = int(np.unpackbits(self.bits, count=self.size).sum())
+        return self._count
+
+    def __bool__(self):
+        return bool(self.bits.any())
+
+    def __eq__(self, other):
+        if not isinstance(other, RowSet):
+            return NotImplemented
+        return self.size == other.size and np.array_equal(self.bits, other.bits)
+
+    def __repr__(self):
+        return f"RowSet({len(self)} of {self.size} rows)"
+
+    def to_mask(self):
+        """Boolean mask aligned with the source rows"""
+        return np.unpackbits(self.bits, count=self.size).astype(bool)
+
+    def positions(self):
+        """Integer row positions as a NumPy array"""
+        return np.flatnonzero(self.to_mask())
+
+    def labels(self):
+        """Index labels of the rows (positions when no index is attached)"""
+        positions = self.positions()
+        if self.index is None:
+            return positions
+        return self.index[positions]
+
+    def tolist(self, limit=None):
+        """Materialize row labels as a Python list, optionally only the first `limit`"""
+        labels = self.labels()
+        if limit is not None:
+            labels = labels[:limit]
+        return list(labels.tolist())
+
+    @property
+    def nbytes(self):
+        return self.bits.nbytes
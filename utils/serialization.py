@@ -0,0 +1,220 @@
+import base64
+import datetime
+import json
+import math
+
+import numpy as np
+import pandas as pd
+
+from utils.row_sets import RowSet
+
+# Bump when the encoding of a type changes; older payloads stay readable
+SCHEMA_VERSION = 2
+FORMAT_NAME = "data-cleaning-system"
+
+# Key marking an encoded non-JSON value
+TYPE_KEY = "__type__"
+
+
+def to_json(obj, kind, indent=None):
+    """
+    Serialize a profile, report or other result dict as schema-versioned,
+    typed JSON. NumPy arrays are stored as base64 raw buffers, RowSets as
+    their packed bitmap, and tuples, timestamps, non-finite floats and
+    non-string keys are tagged so they come back with the same type. Row
+    indexes shared by several RowSets are written once per payload.
+    """
+    payload = _envelope(kind, obj, binary=False)
+    return json.dumps(payload, indent=indent, allow_nan=False)
+
+
+def from_json(text, kind=None):
+    """Inverse of to_json; checks the schema version (and kind, when given)"""
+    return _decode(*_open_envelope(json.loads(text), kind))
+
+
+def to_msgpack(obj, kind):
+    """
+    Compact binary form of to_json: same typed tree packed with msgpack,
+    with array buffers stored as raw bytes instead of base64. Requires the
+    optional msgpack package.
+    """
+    import msgpack
+
+    return msgpack.packb(_envelope(kind, obj, binary=True), use_bin_type=True)
+
+
+def from_msgpack(data, kind=None):
+    import msgpack
+
+    payload = msgpack.unpackb(data, raw=False, strict_map_key=False)
+    return _decode(*_open_envelope(payload, kind))
+
+
+def _envelope(kind, obj, binary):
+    indexes = []  # Row indexes referenced by RowSets, each stored once
+    data = _encode(obj, binary, indexes)
+    return {
+        "format": FORMAT_NAME,
+        "kind": kind,
+        "schema_version": SCHEMA_VERSION,
+        "indexes": [_encode(index, binary, indexes) for index in indexes],
+        "data": data
+    }
+
+
+def _open_envelope(payload, kind):
+    if not isinstance(payload, dict) or payload.get("format") != FORMAT_NAME:
+        raise ValueError("Not a serialized data cleaning result")
+    version = payload.get("schema_version")
+    if not isinstance(version, int) or version > SCHEMA_VERSION:
+        raise ValueError(f"Unsupported schema version: {version}")
+    if kind is not None and payload.get("kind") != kind:
+        raise ValueError(f"Expected a serialized {kind}, got {payload.get('kind')}")
+    # Version 1 payloads store every RowSet index inline and have no table
+    indexes = [_decode(index, []) for index in payload.get("indexes", [])]
+    return payload["data"], indexes
+
+
+def _encode(value, binary, indexes):
+    """Convert a value into JSON/msgpack-safe primitives, tagging what would lose its type"""
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        if math.isfinite(value):
+            return value
+        return {TYPE_KEY: "float", "value": repr(value)}
+
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value) and TYPE_KEY not in value:
+            return {key: _encode(item, binary, indexes) for key, item in value.items()}
+        return {TYPE_KEY: "dict", "items": [
+            [_encode(key, binary, indexes), _encode(item, binary, indexes)] for key, item in value.items()
+        ]}
+    if isinstance(value, list):
+        return [_encode(item, binary, indexes) for item in value]
+    if isinstance(value, tuple):
+        return {TYPE_KEY: "tuple", "items": [_encode(item, binary, indexes) for item in value]}
+    if isinstance(value, (set, frozenset)):
+        return {TYPE_KEY: "set", "items": [_encode(item, binary, indexes) for item in value]}
+
+    if isinstance(value, RowSet):
+        index = None
+        if value.index is not None:
+            index = {TYPE_KEY: "index_ref", "position": _index_position(value.index, indexes)}
+        return {
+            TYPE_KEY: "rowset",
+            "size": value.size,
+            "bits": _encode_buffer(value.bits, binary),
+            "index": index
+        }
+    if isinstance(value, np.ndarray):
+        return _encode_array(value, binary, indexes)
+    if isinstance(value, pd.RangeIndex):
+        return {TYPE_KEY: "range_index", "start": value.start, "stop": value.stop,
+                "step": value.step, "name": _encode(value.name, binary, indexes)}
+    if isinstance(value, pd.Index):
+        return {TYPE_KEY: "index", "values": _encode_array(value.to_numpy(), binary, indexes),
+                "name": _encode(value.name, binary, indexes)}
+
+    if value is pd.NaT:
+        return {TYPE_KEY: "nat"}
+    if value is pd.NA:
+        return {TYPE_KEY: "na"}
+    if isinstance(value, (datetime.datetime, np.datetime64)):
+        value = pd.Timestamp(value)
+        return {TYPE_KEY: "timestamp", "value": value.isoformat(),
+                "tz": None if value.tz is None else str(value.tz)}
+    if isinstance(value, datetime.date):
+        return {TYPE_KEY: "date", "value": value.isoformat()}
+    if isinstance(value, (datetime.timedelta, np.timedelta64)):
+        return {TYPE_KEY: "timedelta", "value": int(pd.Timedelta(value).value)}
+
+    raise TypeError(f"Cannot serialize value of type {type(value).__name__}")
+
+
+def _encode_array(array, binary, indexes):
+    if array.dtype.hasobject:
+        return {TYPE_KEY: "ndarray", "dtype": "object", "shape": list(array.shape),
+                "items": [_encode(item, binary, indexes) for item in array.ravel().tolist()]}
+    return {TYPE_KEY: "ndarray", "dtype": array.dtype.str, "shape": list(array.shape),
+            "buffer": _encode_buffer(array, binary)}
+
+
+def _index_position(index, indexes):
+    """Position of `index` in the payload's index table, adding it when new"""
+    for position, known in enumerate(indexes):
+        if known is index or (len(known) == len(index) and known.equals(index)):
+            return position
+    indexes.append(index)
+    return len(indexes) - 1
+
+
+def _encode_buffer(array, binary):
+    raw = np.ascontiguousarray(array).tobytes()
+    return raw if binary else base64.b64encode(raw).decode("ascii")
+
+
+def _decode(value, indexes):
+    if isinstance(value, list):
+        return [_decode(item, indexes) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if TYPE_KEY not in value:
+        return {key: _decode(item, indexes) for key, item in value.items()}
+
+    tag = value[TYPE_KEY]
+    if tag == "float":
+        return float(value["value"])
+    if tag == "dict":
+        return {_decode(key, indexes): _decode(item, indexes) for key, item in value["items"]}
+    if tag == "tuple":
+        return tuple(_decode(item, indexes) for item in value["items"])
+    if tag == "set":
+        return {_decode(item, indexes) for item in value["items"]}
+    if tag == "rowset":
+        bits = _decode_buffer(value["bits"], np.dtype(np.uint8))
+        index = None if value["index"] is None else _decode(value["index"], indexes)
+        return RowSet(bits, value["size"], index)
+    if tag == "index_ref":
+        return indexes[value["position"]]
+    if tag == "ndarray":
+        return _decode_array(value, indexes)
+    if tag == "range_index":
+        return pd.RangeIndex(value["start"], value["stop"], value["step"],
+                             name=_decode(value["name"], indexes))
+    if tag == "index":
+        return pd.Index(_decode_array(value["values"], indexes), name=_decode(value["name"], indexes))
+    if tag == "nat":
+        return pd.NaT
+    if tag == "na":
+        return pd.NA
+    if tag == "timestamp":
+        timestamp = pd.Timestamp(value["value"])
+        return timestamp.tz_convert(value["tz"]) if value["tz"] else timestamp
+    if tag == "date":
+        return datetime.date.fromisoformat(value["value"])
+    if tag == "timedelta":
+        return pd.Timedelta(value["value"])
+    raise ValueError(f"Unknown serialized type: {tag}")
+
+
+def _decode_array(value, indexes):
+    shape = tuple(value["shape"])
+    if value["dtype"] == "object":
+        array = np.empty(len(value["items"]), dtype=object)
+        array[:] = [_decode(item, indexes) for item in value["items"]]
+        return array.reshape(shape)
+    return _decode_buffer(value["buffer"], np.dtype(value["dtype"])).reshape(shape)
+
+
+def _decode_buffer(buffer, dtype):
+    raw = base64.b64decode(buffer) if isinstance(buffer, str) else buffer
+    # frombuffer views immutable bytes; copy so the result is writable
+    return np.frombuffer(raw, dtype=dtype).copy()
+
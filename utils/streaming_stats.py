@@ -0,0 +1,227 @@
+import os
+import sqlite3
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+
+def row_hashes(data):
+    """
+    64-bit hash per row. Numeric columns are hashed as float64 so a column
+    read as int in one chunk and float in another still hashes the same.
+    """
+    normalized = {}
+    for col in data.columns:
+        series = data[col]
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            series = series.astype(np.float64)
+        normalized[col] = series
+    frame = pd.DataFrame(normalized, index=data.index)
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+class QuantileSketch:
+    """
+    Bounded uniform sample of a numeric stream for approximate quantiles.
+
+    Every value gets a random priority and the `capacity` lowest priorities
+    are kept (bottom-k sampling), so the sample stays uniform over the whole
+    stream at a fixed memory cost. Count, min and max are tracked exactly.
+    """
+
+    def __init__(self, capacity=100000, random_state=42):
+        self.capacity = capacity
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._rng = np.random.default_rng(random_state)
+        self._values = np.empty(0, dtype=np.float64)
+        self._priorities = np.empty(0, dtype=np.float64)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        self._values = np.concatenate([self._values, values])
+        self._priorities = np.concatenate([self._priorities, self._rng.random(len(values))])
+        if len(self._values) > self.capacity:
+            keep = np.argpartition(self._priorities, self.capacity)[:self.capacity]
+            self._values = self._values[keep]
+            self._priorities = self._priorities[keep]
+
+    def quantile(self, q):
+        if self.count == 0:
+            return np.nan
+        return float(np.quantile(self._values, q))
+
+    def sample(self):
+        """The retained uniform sample"""
+        return self._values
+
+
+class RowSample:
+    """
+    Bounded uniform sample of the rows of a chunked stream.
+
+    The bottom-k scheme of QuantileSketch applied to whole rows: every row
+    gets a random priority and the `capacity` lowest are kept, so the
+    sample covers every chunk seen rather than only the first one. Chunks
+    whose dtypes differ (e.g. a column that is all-null in one chunk and
+    text in the next) are combined with pandas' usual upcasting.
+    """
+
+    def __init__(self, capacity=100000, random_state=42):
+        self.capacity = capacity
+        self.rows = 0
+        self._rng = np.random.default_rng(random_state)
+        self._sample = None
+        self._priorities = np.empty(0, dtype=np.float64)
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+        priorities = self._rng.random(len(chunk))
+        if len(self._priorities) >= self.capacity:
+            # Rows above the current k-th priority can never enter the sample
+            candidates = priorities < self._priorities.max()
+            chunk, priorities = chunk[candidates], priorities[candidates]
+        if self._sample is None:
+            sample = chunk.reset_index(drop=True)
+        else:
+            sample = pd.concat([self._sample, chunk], ignore_index=True)
+        priorities = np.concatenate([self._priorities, priorities])
+        if len(sample) > self.capacity:
+            keep = np.sort(np.argpartition(priorities, self.capacity)[:self.capacity])
+            sample = sample.iloc[keep].reset_index(drop=True)
+            priorities = priorities[keep]
+        self._sample = sample
+        self._priorities = priorities
+
+    def sample(self):
+        """The retained uniform sample (None before the first update)"""
+        return self._sample
+
+
+class FrequencyCounter:
+    """
+    Approximate value counts of a stream.
+
+    Chunk value_counts are merged into a running table; when the table
+    grows past twice max_items only the max_items most frequent values are
+    kept, which preserves the heavy hitters (and therefore the mode).
+    """
+
+    def __init__(self, max_items=100000):
+        self.max_items = max_items
+        self.missing = 0
+        self._counts = pd.Series(dtype=np.int64)
+
+    def update(self, series):
+        self.missing += int(series.isna().sum())
+        counts = series.value_counts(dropna=True)
+        if len(counts) == 0:
+            return
+        counts.index = counts.index.astype(object)
+        self._counts = self._counts.add(counts, fill_value=0) if len(self._counts) else counts
+        if len(self._counts) > 2 * self.max_items:
+            self._counts = self._counts.nlargest(self.max_items)
+
+    def mode(self):
+        if len(self._counts) == 0:
+            return None
+        return self._counts.idxmax()
+
+    def most_common(self, n=10):
+        return self._counts.nlargest(n)
+
+
+class DedupeIndex:
+    """
+    Set of row hashes that spills to SQLite once it outgrows memory.
+
+    Hashes are buffered in a sorted NumPy array, so a batch is checked with
+    one vectorized binary search; past memory_limit entries they are
+    flushed to an on-disk table with a primary-key index. Membership checks
+    look at both. Rows are compared by 64-bit hash, so a collision between
+    distinct rows is possible but vanishingly rare.
+    """
+
+    def __init__(self, memory_limit=1000000, spill_dir=None):
+        self.memory_limit = memory_limit
+        self.spill_dir = spill_dir
+        self._memory = np.empty(0, dtype=np.int64)  # Sorted in-memory hashes
+        self._connection = None
+        self._path = None
+
+    def add_new(self, hashes):
+        """
+        Register a batch of hashes. Returns a mask that is True for hashes
+        seen for the first time (only the first of repeats within the batch).
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64).view(np.int64)
+        # Work on the batch in sorted order: the binary search stays cache
+        # friendly, repeats are adjacent, and new hashes come out sorted
+        order = np.argsort(hashes, kind="stable")
+        ordered = hashes[order]
+        # The stable sort keeps the first occurrence of a repeat first in its run
+        is_new = np.ones(len(ordered), dtype=bool)
+        is_new[1:] = ordered[1:] != ordered[:-1]
+
+        positions = np.searchsorted(self._memory, ordered)
+        in_memory = positions < len(self._memory)
+        in_memory[in_memory] = self._memory[positions[in_memory]] == ordered[in_memory]
+        is_new &= ~in_memory
+        if self._connection is not None and is_new.any():
+            is_new[is_new] = ~self._on_disk(ordered[is_new])
+
+        if is_new.any():
+            # Two sorted runs; the stable sort (timsort) merges them in linear time
+            self._memory = np.sort(np.concatenate([self._memory, ordered[is_new]]), kind="stable")
+        if len(self._memory) > self.memory_limit:
+            self._spill()
+
+        mask = np.empty(len(hashes), dtype=bool)
+        mask[order] = is_new
+        return mask
+
+    def _on_disk(self, hashes):
+        cursor = self._connection.cursor()
+        cursor.execute("DELETE FROM batch")
+        cursor.executemany("INSERT INTO batch (h) VALUES (?)", ((h,) for h in hashes.tolist()))
+        found = np.array(
+            [row[0] for row in cursor.execute("SELECT h FROM batch JOIN seen USING (h)")], dtype=np.int64
+        )
+        return np.isin(hashes, found)
+
+    def _spill(self):
+        if self._connection is None:
+            fd, self._path = tempfile.mkstemp(dir=self.spill_dir, suffix=".sqlite")
+            os.close(fd)
+            self._connection = sqlite3.connect(self._path)
+            self._connection.execute("CREATE TABLE seen (h INTEGER PRIMARY KEY)")
+            self._connection.execute("CREATE TEMP TABLE batch (h INTEGER)")
+        self._connection.executemany(
+            "INSERT OR IGNORE INTO seen (h) VALUES (?)", ((h,) for h in self._memory.tolist())
+        )
+        self._connection.commit()
+        self._memory = np.empty(0, dtype=np.int64)
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        if self._path and os.path.exists(self._path):
+            os.remove(self._path)
+        self._path = None
+        self._memory = np.empty(0, dtype=np.int64)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()